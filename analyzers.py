@@ -7,9 +7,19 @@ Verantwoordelijk voor sentiment analyse:
 - Keyword-based fallback
 """
 
-import re
 import json
-from typing import Dict, List, Any, Optional
+import time
+import bisect
+import functools
+import threading
+import concurrent.futures
+from collections import Counter
+from typing import Dict, List, Any, Optional, Tuple, Set
+
+from matchers import AhoCorasick
+
+from sentiment_cache import SentimentCache, sentiment_cache_key
+from headline_dedup import HeadlineIndex, dedup_headlines, normalize_headline
 
 try:
     from qwen_agent.agents import Assistant
@@ -17,10 +27,104 @@ try:
 except ImportError:
     QWEN_AVAILABLE = False
 
+LLM_MODEL = 'qwen-plus'
+LLM_PROMPT_VERSION = 1  # Verhogen bij wijziging van de prompt (invalideert de cache)
+LLM_MAX_HEADLINES = 7
+LLM_CHUNK_TOKENS = 1500    # Geschatte input tokens per LLM request
+LLM_WORKERS = 4            # Gelijktijdige LLM requests
+LLM_RETRIES = 2
+LLM_BACKOFF_SECONDS = 2.0
+
+LLM_PROMPT_TEMPLATE = """Je bent een financiële sentiment analist. Analyseer het nieuws voor deze aandelen:
+
+{input_text}
+
+Geef je antwoord ALS ALLEEN EEN JSON OBJECT in dit formaat:
+{{
+    "TICKER1": {{"score": <getal -1.0 tot 1.0>, "summary": "<1 zin>", "catalyst": "<catalyst of 'Geen'>"}},
+    "TICKER2": {{"score": <getal -1.0 tot 1.0>, "summary": "<1 zin>", "catalyst": "<catalyst of 'Geen'>"}},
+    ...
+}}
+
+Score richtlijnen:
+- Zeer negatief (-1.0 tot -0.6): slechte cijfers, ontslagen, schandalen
+- Negatief (-0.6 tot -0.3): tegenvallers, waarschuwingen
+- Neutraal (-0.3 tot 0.3): gemengd, geen duidelijke trend
+- Positief (0.3 tot 0.6): goede cijfers, groei, partnerships
+- Zeer positief (0.6 tot 1.0): records, doorbraken, upgrades
+
+Geef ALLEEN de JSON terug, geen uitleg."""
+
+
+class KeywordScorer:
+    """
+    Keyword counter compiled once from a {'positive': [...], 'negative': [...]}
+    config into a single Aho-Corasick automaton.
+    
+    Counts follow the original semantics: every keyword counts once per text
+    when present (a keyword listed twice counts twice). Phrase keywords such
+    as 'rate hike' work as-is. With whole_words=True keywords only match as
+    whole words, so 'hoog' no longer fires inside 'hoogte'.
+    """
+    
+    def __init__(self, keywords: Dict[str, List[str]], whole_words: bool = False):
+        self._positive = Counter(k.lower() for k in keywords.get('positive', []))
+        self._negative = Counter(k.lower() for k in keywords.get('negative', []))
+        patterns = [(k, k) for k in set(self._positive) | set(self._negative)]
+        self._automaton = AhoCorasick(patterns, ignore_case=True, whole_words=whole_words)
+    
+    def counts(self, text: str) -> Tuple[int, int]:
+        """(positive_count, negative_count) for one text"""
+        return self._tally({key for _, _, key in self._automaton.find(text)})
+    
+    def score_batch(self, texts: List[str]) -> List[Tuple[int, int]]:
+        """
+        Count keywords for many texts in one automaton pass.
+        
+        Returns:
+            List of (positive_count, negative_count) per text
+        """
+        if not texts:
+            return []
+        
+        # Eerst lowercasen: lower() kan de lengte wijzigen ('İ' -> 'i̇'),
+        # dus de offsets moeten op de verlaagde teksten gebaseerd zijn
+        lowered = [text.lower() for text in texts]
+        
+        # Eén scan over alle teksten; \0 voorkomt matches over tekstgrenzen
+        offsets = []
+        position = 0
+        for text in lowered:
+            offsets.append(position)
+            position += len(text) + 1
+        
+        found = [set() for _ in texts]
+        for start, _, key in self._automaton.find("\0".join(lowered)):
+            found[bisect.bisect_right(offsets, start) - 1].add(key)
+        return [self._tally(keys) for keys in found]
+    
+    def _tally(self, keys: Set[str]) -> Tuple[int, int]:
+        positive = sum(self._positive[k] for k in keys)
+        negative = sum(self._negative[k] for k in keys)
+        return positive, negative
+
+
+def get_keyword_scorer(
+    keywords: Dict[str, List[str]],
+    whole_words: bool = False
+) -> KeywordScorer:
+    """Compiled KeywordScorer, built once per keyword config"""
+    return _cached_scorer(
+        tuple(keywords.get('positive', [])),
+        tuple(keywords.get('negative', [])),
+        whole_words
+    )
+
 
 def analyze_sentiment_batch(
     ticker_headlines: Dict[str, List[str]],
-    keywords: Dict[str, List[str]]
+    keywords: Dict[str, List[str]],
+    cache: Optional[SentimentCache] = None
 ) -> Dict[str, Dict[str, Any]]:
     """
     Analyze sentiment for multiple tickers using LLM with keyword fallback.
@@ -28,6 +132,8 @@ def analyze_sentiment_batch(
     Args:
         ticker_headlines: Dict of {ticker: [headlines]}
         keywords: Sentiment keywords for fallback
+        cache: Optional LLM result cache; only tickers whose headline set
+            is not cached are sent to the LLM
     
     Returns:
         Dict of sentiment results per ticker
@@ -35,17 +141,57 @@ def analyze_sentiment_batch(
     if not ticker_headlines:
         return {}
     
+    # Identieke en bijna-identieke headlines één keer scoren
+    index = dedup_headlines(ticker_headlines)
+    print(f"  ✓ Dedup: {index.total_headlines} headlines → {len(index.clusters)} unieke clusters")
+    
     # Try LLM first
     if QWEN_AVAILABLE:
+        canonical = {t: index.unique_headlines(t, LLM_MAX_HEADLINES) for t in ticker_headlines}
+        cached = {}
+        keys = {}
+        if cache is not None:
+            # Sleutel op de eigen headlines: clusters hangen van de andere tickers af
+            for ticker, headlines in ticker_headlines.items():
+                own = [normalize_headline(h, ticker) for h in headlines if h]
+                keys[ticker] = sentiment_cache_key(LLM_MODEL, LLM_PROMPT_VERSION, ticker, own)
+                hit = cache.get(keys[ticker])
+                if hit is not None:
+                    cached[ticker] = hit
+        
+        # Tickers met exact dezelfde nieuws-clusters delen één LLM analyse
+        groups: Dict[Tuple[int, ...], List[str]] = {}
+        for ticker in ticker_headlines:
+            if ticker not in cached:
+                groups.setdefault(index.signature(ticker, LLM_MAX_HEADLINES), []).append(ticker)
+        pending = {members[0]: canonical[members[0]] for members in groups.values()}
+        if cache is not None:
+            print(f"  ✓ LLM cache: {len(cached)} hits, {len(pending)} naar LLM")
+        
+        if not pending:
+            return cached
+        
         try:
-            llm_result = _get_llm_batch_sentiment(ticker_headlines)
-            if llm_result:
-                return llm_result
+            llm_result = _get_llm_batch_sentiment(pending)
         except Exception as e:
             print(f"  ⚠️ LLM failed, using keyword fallback: {e}")
+            llm_result = {}
+        
+        shared = {}
+        for members in groups.values():
+            if members[0] in llm_result:
+                for ticker in members:
+                    shared[ticker] = dict(llm_result[members[0]])
+                    if cache is not None:
+                        cache.put(keys[ticker], shared[ticker])
+        
+        # Keyword fallback alleen voor tickers uit mislukte chunks
+        missing = [t for t in ticker_headlines if t not in cached and t not in shared]
+        fallback = _get_keyword_batch_sentiment(missing, keywords, index) if missing else {}
+        return _in_order(ticker_headlines, cached, shared, fallback)
     
     # Fallback to keyword-based
-    return _get_keyword_batch_sentiment(ticker_headlines, keywords)
+    return _get_keyword_batch_sentiment(list(ticker_headlines), keywords, index)
 
 
 def analyze_regional_sentiment(
@@ -63,6 +209,7 @@ def analyze_regional_sentiment(
         Dict of regional sentiment results
     """
     regional_sentiment = {}
+    scorer = get_keyword_scorer(macro_keywords)
     
     for region, articles in regional_news.items():
         if not articles:
@@ -73,13 +220,10 @@ def analyze_regional_sentiment(
             }
             continue
         
-        positive_count = 0
-        negative_count = 0
-        
-        for article in articles:
-            text = (article['title'] + ' ' + article.get('summary', '')).lower()
-            positive_count += sum(1 for kw in macro_keywords['positive'] if kw in text)
-            negative_count += sum(1 for kw in macro_keywords['negative'] if kw in text)
+        texts = [article['title'] + ' ' + article.get('summary', '') for article in articles]
+        counts = scorer.score_batch(texts)
+        positive_count = sum(p for p, _ in counts)
+        negative_count = sum(n for _, n in counts)
         
         total = positive_count + negative_count
         score = (positive_count - negative_count) / total if total > 0 else 0.0
@@ -126,15 +270,211 @@ def get_keyword_sentiment(
     if not valid_headlines:
         return {"score": 0.0, "summary": "Geen nieuws", "catalyst": "Geen"}
     
-    scores = []
-    for headline in valid_headlines:
-        text_lower = headline.lower()
-        positive_count = sum(1 for k in keywords['positive'] if k in text_lower)
-        negative_count = sum(1 for k in keywords['negative'] if k in text_lower)
-        total = positive_count + negative_count
-        score = (positive_count - negative_count) / total if total > 0 else 0.0
-        scores.append(score)
+    scorer = get_keyword_scorer(keywords)
+    scores = [_headline_score(counts) for counts in scorer.score_batch(valid_headlines)]
+    return _keyword_result(scores, valid_headlines)
+
+
+# =============================================================================
+# PRIVATE HELPER FUNCTIONS
+# =============================================================================
+
+@functools.lru_cache(maxsize=16)
+def _cached_scorer(
+    positive: Tuple[str, ...],
+    negative: Tuple[str, ...],
+    whole_words: bool
+) -> KeywordScorer:
+    """Build (and memoize) a scorer for a keyword config"""
+    return KeywordScorer({'positive': list(positive), 'negative': list(negative)}, whole_words)
+
+
+def _in_order(
+    ticker_headlines: Dict[str, List[str]],
+    *parts: Dict[str, Dict[str, Any]]
+) -> Dict[str, Dict[str, Any]]:
+    """Merge partial results in the original ticker order"""
+    merged = {}
+    for part in parts:
+        merged.update(part)
+    return {t: merged[t] for t in ticker_headlines if t in merged}
+
+
+def _get_llm_batch_sentiment(
+    ticker_headlines: Dict[str, List[str]],
+    chunk_tokens: int = LLM_CHUNK_TOKENS,
+    workers: int = LLM_WORKERS,
+    retries: int = LLM_RETRIES
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Get batch sentiment from LLM in concurrent, token-budgeted chunks.
+    
+    Every chunk is parsed on its own; tickers from failed chunks or with
+    malformed entries are simply missing from the result.
     
+    Returns:
+        Dict of {ticker: sentiment} for successfully analyzed tickers
+    """
+    if not ticker_headlines or not QWEN_AVAILABLE:
+        return {}
+    
+    chunks = _chunk_ticker_blocks(ticker_headlines, chunk_tokens)
+    if not chunks:
+        return {}
+    
+    sentiments = {}
+    failed = 0
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(workers, len(chunks)))) as executor:
+        futures = {
+            executor.submit(_run_llm_chunk, chunk, retries): chunk
+            for chunk in chunks
+        }
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                sentiments.update(future.result())
+            except Exception as e:
+                failed += 1
+                print(f"  ⚠️ LLM chunk ({len(futures[future])} tickers) mislukt: {e}")
+    
+    print(f"  ✓ LLM: {len(chunks) - failed}/{len(chunks)} chunks, {len(sentiments)} tickers")
+    return sentiments
+
+
+_assistants = threading.local()
+
+
+def _get_assistant() -> 'Assistant':
+    """
+    The LLM assistant of the calling thread.
+    
+    qwen-agent Assistants keep per-run state (messages, LLM client), so
+    the chunk workers each build their own instead of sharing one.
+    """
+    bot = getattr(_assistants, 'bot', None)
+    if bot is None:
+        bot = _assistants.bot = Assistant(llm={'model': LLM_MODEL})
+    return bot
+
+
+def _chunk_ticker_blocks(
+    ticker_headlines: Dict[str, List[str]],
+    chunk_tokens: int
+) -> List[Dict[str, str]]:
+    """
+    Split tickers into chunks of {ticker: prompt block} within a token budget.
+    
+    Tokens are estimated at ~4 characters each; a ticker larger than the
+    budget gets a chunk of its own.
+    """
+    chunks = []
+    current: Dict[str, str] = {}
+    used = 0
+    for ticker, headlines in ticker_headlines.items():
+        headlines = [h for h in headlines[:LLM_MAX_HEADLINES] if h]
+        if not headlines:
+            continue
+        headlines_text = "\n".join(f"  - {h}" for h in headlines)
+        block = f"\n{ticker}:\n{headlines_text}\n"
+        tokens = len(block) // 4 + 1
+        if current and used + tokens > chunk_tokens:
+            chunks.append(current)
+            current, used = {}, 0
+        current[ticker] = block
+        used += tokens
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _run_llm_chunk(chunk: Dict[str, str], retries: int) -> Dict[str, Dict[str, Any]]:
+    """Send one chunk with retry and exponential backoff"""
+    bot = _get_assistant()
+    prompt = LLM_PROMPT_TEMPLATE.format(input_text="".join(chunk.values()))
+    messages = [{'role': 'user', 'content': prompt}]
+    
+    for attempt in range(retries + 1):
+        try:
+            response = bot.run(messages=messages)
+            response_text = response if isinstance(response, str) else str(response)
+            return _parse_llm_response(response_text, list(chunk))
+        except Exception as e:
+            if attempt == retries:
+                raise Exception(f"LLM error: {e}")
+            time.sleep(LLM_BACKOFF_SECONDS * 2 ** attempt)
+    return {}
+
+
+def _parse_llm_response(response_text: str, tickers: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Parse the first JSON object in a response.
+    
+    Malformed ticker entries are skipped instead of failing the chunk.
+    Raises ValueError if no JSON object can be decoded at all.
+    """
+    start = response_text.find('{')
+    if start < 0:
+        raise ValueError("geen JSON in antwoord")
+    result, _ = json.JSONDecoder().raw_decode(response_text[start:])
+    if not isinstance(result, dict):
+        raise ValueError("JSON is geen object")
+    
+    sentiments = {}
+    for ticker in tickers:
+        entry = result.get(ticker)
+        if not isinstance(entry, dict):
+            continue
+        try:
+            score = float(entry.get("score", 0.0))
+        except (TypeError, ValueError):
+            continue
+        sentiments[ticker] = {
+            "score": round(max(-1.0, min(1.0, score)), 2),
+            "summary": entry.get("summary", "Gemengd nieuws"),
+            "catalyst": entry.get("catalyst", "Geen")
+        }
+    return sentiments
+
+
+def _get_keyword_batch_sentiment(
+    tickers: List[str],
+    keywords: Dict[str, List[str]],
+    index: HeadlineIndex
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Get batch sentiment using keyword fallback.
+    
+    Every headline cluster is scored once; tickers get the scores of the
+    clusters of their first 5 headlines (same as get_keyword_sentiment).
+    """
+    ticker_ids = {t: index.ticker_clusters.get(t, [])[:5] for t in tickers}
+    needed = sorted({i for ids in ticker_ids.values() for i in ids})
+    scorer = get_keyword_scorer(keywords)
+    cluster_scores = dict(zip(
+        needed,
+        (_headline_score(c) for c in scorer.score_batch([index.clusters[i] for i in needed]))
+    ))
+    
+    sentiments = {}
+    for ticker, ids in ticker_ids.items():
+        if not ids:
+            sentiments[ticker] = {"score": 0.0, "summary": "Geen nieuws", "catalyst": "Geen"}
+            continue
+        sentiments[ticker] = _keyword_result(
+            [cluster_scores[i] for i in ids],
+            [index.clusters[i] for i in ids]
+        )
+    return sentiments
+
+
+def _headline_score(counts: Tuple[int, int]) -> float:
+    """Keyword score of one headline from (positive, negative) counts"""
+    positive_count, negative_count = counts
+    total = positive_count + negative_count
+    return (positive_count - negative_count) / total if total > 0 else 0.0
+
+
+def _keyword_result(scores: List[float], headlines: List[str]) -> Dict[str, Any]:
+    """Sentiment dict from per-headline scores"""
     avg_score = sum(scores) / len(scores) if scores else 0.0
     
     # Summary
@@ -146,7 +486,7 @@ def get_keyword_sentiment(
         summary = "Gemengd nieuws, geen duidelijke trend"
     
     # Catalyst detection
-    all_text = " ".join(valid_headlines).lower()
+    all_text = " ".join(headlines).lower()
     catalyst = "Geen specifieke catalyst"
     
     catalyst_keywords = {
@@ -166,90 +506,3 @@ def get_keyword_sentiment(
         "summary": summary,
         "catalyst": catalyst
     }
-
-
-# =============================================================================
-# PRIVATE HELPER FUNCTIONS
-# =============================================================================
-
-def _get_llm_batch_sentiment(ticker_headlines: Dict[str, List[str]]) -> Optional[Dict]:
-    """Get batch sentiment from LLM"""
-    if not ticker_headlines or not QWEN_AVAILABLE:
-        return None
-    
-    # Prepare input
-    input_text = ""
-    tickers = list(ticker_headlines.keys())
-    
-    for ticker in tickers:
-        headlines = ticker_headlines[ticker][:7]  # Max 7 headlines
-        if headlines:
-            headlines_text = "\n".join(f"  - {h}" for h in headlines if h)
-            input_text += f"\n{ticker}:\n{headlines_text}\n"
-    
-    if not input_text.strip():
-        return None
-    
-    # Prompt
-    prompt = f"""Je bent een financiële sentiment analist. Analyseer het nieuws voor deze aandelen:
-
-{input_text}
-
-Geef je antwoord ALS ALLEEN EEN JSON OBJECT in dit formaat:
-{{
-    "TICKER1": {{"score": <getal -1.0 tot 1.0>, "summary": "<1 zin>", "catalyst": "<catalyst of 'Geen'>"}},
-    "TICKER2": {{"score": <getal -1.0 tot 1.0>, "summary": "<1 zin>", "catalyst": "<catalyst of 'Geen'>"}},
-    ...
-}}
-
-Score richtlijnen:
-- Zeer negatief (-1.0 tot -0.6): slechte cijfers, ontslagen, schandalen
-- Negatief (-0.6 tot -0.3): tegenvallers, waarschuwingen
-- Neutraal (-0.3 tot 0.3): gemengd, geen duidelijke trend
-- Positief (0.3 tot 0.6): goede cijfers, groei, partnerships
-- Zeer positief (0.6 tot 1.0): records, doorbraken, upgrades
-
-Geef ALLEEN de JSON terug, geen uitleg."""
-    
-    try:
-        llm_config = {'model': 'qwen-plus'}
-        bot = Assistant(llm=llm_config)
-        
-        messages = [{'role': 'user', 'content': prompt}]
-        response = bot.run(messages=messages)
-        
-        response_text = response if isinstance(response, str) else str(response)
-        
-        # Extract JSON
-        json_match = re.search(r'\{[\s\S]*\}', response_text)
-        if json_match:
-            result = json.loads(json_match.group())
-            
-            sentiments = {}
-            for ticker in tickers:
-                if ticker in result:
-                    sentiments[ticker] = {
-                        "score": round(float(result[ticker].get("score", 0.0)), 2),
-                        "summary": result[ticker].get("summary", "Gemengd nieuws"),
-                        "catalyst": result[ticker].get("catalyst", "Geen")
-                    }
-                else:
-                    sentiments[ticker] = {"score": 0.0, "summary": "Geen analyse", "catalyst": "Geen"}
-            
-            return sentiments
-    
-    except Exception as e:
-        raise Exception(f"LLM error: {e}")
-    
-    return None
-
-
-def _get_keyword_batch_sentiment(
-    ticker_headlines: Dict[str, List[str]],
-    keywords: Dict[str, List[str]]
-) -> Dict[str, Dict[str, Any]]:
-    """Get batch sentiment using keyword fallback"""
-    sentiments = {}
-    for ticker, headlines in ticker_headlines.items():
-        sentiments[ticker] = get_keyword_sentiment(ticker, headlines, keywords)
-    return sentiments
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Backtest
+
+Offline replay van de scoring over de lokale OHLCV cache:
+- Eén panel (datums × tickers) uit een PriceCache directory, geen netwerk
+- Indicatoren, setup score, upside en signaal voor alle dagen en tickers
+  tegelijk, met dezelfde regels als calculate_setup_score/get_signal
+- Forward returns, hit rate en drawdown per signaalklasse
+
+Sentiment en StockTwits zitten niet in de historie; de replay scoort
+alleen de technische setup (sentiment = 0).
+
+De dagelijkse cache (data_snapshots/prices) bevat maximaal 400 bars
+(eerste vulling 1y), dus daarop is alleen een replay van ~1,5 jaar
+mogelijk. Voor een lange replay vult ``--fetch --period 10y`` een aparte
+store (SETTINGS['backtest_cache_dir'], max SETTINGS['backtest_max_bars']
+bars); backtest en sweep lezen die standaard zodra hij gevuld is.
+"""
+
+import os
+import glob
+import time
+import argparse
+from typing import Dict, List, Any, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from config import TECHNICAL_PARAMS, SCORING_WEIGHTS, SETTINGS, TICKERS
+from price_cache import PriceCache
+from extractors import fetch_price_history
+from transformers import (
+    SIGNAL_CLASSES, calculate_indicator_history, calculate_panel_setup_score,
+    calculate_panel_upside, get_panel_signal
+)
+
+
+BACKTEST_HORIZONS = (1, 5, 20)
+
+
+def load_price_history(
+    cache_dir: str,
+    tickers: Optional[List[str]] = None
+) -> Dict[str, pd.DataFrame]:
+    """
+    Read cached OHLCV bars (no network).
+
+    Args:
+        cache_dir: PriceCache directory
+        tickers: Subset to load (default: every cached ticker)
+
+    Returns:
+        Dict of {ticker: OHLCV DataFrame}
+    """
+    if tickers is None:
+        tickers = _cached_tickers(cache_dir)
+    cache = PriceCache(cache_dir)
+    histories = {}
+    for ticker in tickers:
+        hist = cache.load(ticker)
+        if hist is not None:
+            histories[ticker] = hist
+    return histories
+
+
+def fetch_long_history(
+    cache_dir: str,
+    period: str = '10y',
+    max_bars: int = 2600,
+    tickers: Optional[List[str]] = None
+) -> Dict[str, pd.DataFrame]:
+    """
+    Fill or extend a long-history PriceCache for the backtest.
+
+    Kept apart from the daily cache so that cache stays small (400 bars).
+    Later runs only download the bars since the last stored date.
+
+    Args:
+        cache_dir: Long-history PriceCache directory
+        period: History of tickers not cached yet (yfinance notation)
+        max_bars: Bars kept per ticker
+        tickers: Tickers to fetch (default: TICKERS plus every cached ticker)
+
+    Returns:
+        Dict of {ticker: OHLCV DataFrame} covering ``period``
+    """
+    if tickers is None:
+        tickers = sorted(set(TICKERS) | set(_cached_tickers(cache_dir)))
+    return fetch_price_history(
+        tickers,
+        period=period,
+        batch_size=SETTINGS['price_batch_size'],
+        cache_dir=cache_dir,
+        max_bars=max_bars
+    )
+
+
+def default_cache_dir() -> str:
+    """The long-history store once it has data, otherwise the daily price cache"""
+    long_dir = SETTINGS['backtest_cache_dir']
+    if long_dir and _cached_tickers(long_dir):
+        return long_dir
+    return SETTINGS['price_cache_dir']
+
+
+def build_date_panel(histories: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    """
+    Align histories on calendar dates (dates × tickers per field).
+
+    Unlike build_price_panel (right-aligned on bars), a backtest needs one
+    date axis. Days on which a ticker did not trade while others did
+    (holidays on another exchange) carry the previous bar forward with
+    zero volume; before the first and after the last bar stay NaN.
+    """
+    panel = {}
+    for field in ('Close', 'High', 'Low', 'Volume'):
+        frame = pd.concat({t: h[field] for t, h in histories.items()}, axis=1, sort=True)
+        listed = frame.ffill().notna() & frame.bfill().notna()
+        if field == 'Volume':
+            panel[field] = frame.fillna(0).where(listed)
+        else:
+            panel[field] = frame.ffill().where(listed)
+    return panel
+
+
+def run_backtest(
+    panel: Dict[str, pd.DataFrame],
+    params: Optional[Dict[str, int]] = None,
+    weights: Optional[Dict[str, float]] = None,
+    horizons: Sequence[int] = BACKTEST_HORIZONS,
+    start: Optional[str] = None,
+    indicators: Optional[Dict[str, np.ndarray]] = None
+) -> Dict[str, Any]:
+    """
+    Score every ticker on every day and evaluate the signals.
+
+    Args:
+        panel: Output of build_date_panel
+        params: Technical parameters (default: TECHNICAL_PARAMS)
+        weights: Scoring weights (default: SCORING_WEIGHTS)
+        horizons: Forward return horizons in bars
+        start: First signal date (YYYY-MM-DD); earlier bars only warm up
+            the indicators
+        indicators: Precomputed calculate_indicator_history output for
+            ``params`` (skips the indicator step)
+
+    Returns:
+        Dict with:
+            'stats': DataFrame per signal class (plus 'universe') with
+                observations, mean forward return and hit rate per
+                horizon (%), and total return / max drawdown (%) of an
+                equal-weight, daily rebalanced portfolio of that class
+            'equity': DataFrame (dates × class) of those portfolios
+            'signals': int8 ndarray (dates × tickers) of SIGNAL_CLASSES
+                indexes, -1 where a ticker is not scored
+    """
+    params = params or TECHNICAL_PARAMS
+    weights = weights or SCORING_WEIGHTS
+    close = panel['Close']
+    price = close.to_numpy()
+
+    if indicators is None:
+        indicators = calculate_indicator_history(panel, params)
+    score = calculate_panel_setup_score(indicators, price, weights)
+    upside = calculate_panel_upside(indicators, price)
+    signals = get_panel_signal(score, upside)
+
+    # Alleen scoren na de warm-up van de langste indicator
+    warmup = max(params['sma_medium'], params['macd_slow'], params['rsi_window'], params['atr_period'])
+    bars = close.notna().cumsum().to_numpy()
+    signals[(bars < warmup) | np.isnan(price)] = -1
+    if start is not None:
+        signals[close.index < pd.Timestamp(start)] = -1
+
+    forward = forward_returns(close, horizons)
+    # Portefeuilles altijd op 1-bar returns: langere horizons overlappen per dag
+    daily = daily_returns(close)
+    return {
+        'stats': evaluate_signals(signals, forward, daily),
+        'equity': signal_equity(signals, daily, close.index),
+        'signals': signals,
+    }
+
+
+def forward_returns(close: pd.DataFrame, horizons: Sequence[int]) -> Dict[int, np.ndarray]:
+    """Return from the close of each day to the close ``h`` bars later"""
+    price = close.to_numpy()
+    return {h: close.shift(-h).to_numpy() / price - 1 for h in horizons}
+
+
+def daily_returns(close: pd.DataFrame) -> np.ndarray:
+    """1-bar forward returns, the only ones that can be compounded day by day"""
+    return forward_returns(close, (1,))[1]
+
+
+def evaluate_signals(
+    signals: np.ndarray,
+    forward: Dict[int, np.ndarray],
+    daily: np.ndarray
+) -> pd.DataFrame:
+    """Per-class forward return, hit rate and drawdown table"""
+    rows = {}
+    for code, name in enumerate(SIGNAL_CLASSES + ('universe',)):
+        members = signals >= 0 if name == 'universe' else signals == code
+        rows[name] = summarize_members(members, forward, daily)
+    return pd.DataFrame.from_dict(rows, orient='index')
+
+
+def summarize_members(
+    members: np.ndarray,
+    forward: Dict[int, np.ndarray],
+    daily: np.ndarray
+) -> Dict[str, float]:
+    """
+    Stats for the (date, ticker) cells selected by a boolean mask.
+
+    ``daily`` (daily_returns) drives the equity curve, independent of the
+    horizons in ``forward``.
+
+    Returns:
+        Dict with observations, mean_<h>d and hit_<h>d per horizon (%),
+        and total_return / max_drawdown (%) of the equal-weight portfolio
+    """
+    row: Dict[str, float] = {'observations': int(members.sum())}
+    for h, returns in forward.items():
+        values = returns[members & ~np.isnan(returns)]
+        row[f'mean_{h}d'] = values.mean() * 100 if len(values) else np.nan
+        row[f'hit_{h}d'] = (values > 0).mean() * 100 if len(values) else np.nan
+    curve = member_equity(members, daily)
+    row['total_return'] = (curve[-1] - 1) * 100 if len(curve) else np.nan
+    row['max_drawdown'] = _max_drawdown(curve) * 100
+    return row
+
+
+def signal_equity(signals: np.ndarray, returns: np.ndarray, dates: pd.Index) -> pd.DataFrame:
+    """Equity curves (dates × class) of member_equity per signal class"""
+    curves = {}
+    for code, name in enumerate(SIGNAL_CLASSES + ('universe',)):
+        members = signals >= 0 if name == 'universe' else signals == code
+        curves[name] = member_equity(members, returns)
+    return pd.DataFrame(curves, index=dates)
+
+
+def member_equity(members: np.ndarray, returns: np.ndarray) -> np.ndarray:
+    """
+    Equity curve of an equal-weight portfolio of the selected cells.
+
+    Entry at the close of the signal day, held for one step of
+    ``returns``; days without members earn nothing.
+    """
+    members = members & ~np.isnan(returns)
+    counts = members.sum(axis=1)
+    totals = np.where(members, returns, 0.0).sum(axis=1)
+    daily = np.divide(totals, counts, out=np.zeros(len(counts)), where=counts > 0)
+    return np.cumprod(1 + daily)
+
+
+def format_report(result: Dict[str, Any]) -> str:
+    """Plain-text stats table"""
+    stats = result['stats']
+    return stats.to_string(float_format=lambda v: f"{v:,.2f}")
+
+
+def main():
+    """CLI: python backtest.py [--fetch [--period 10y]] [--cache-dir DIR] [--start YYYY-MM-DD]"""
+    parser = argparse.ArgumentParser(description="Beurs Cowboy backtest op gecachte koersen")
+    parser.add_argument(
+        '--cache-dir',
+        help="PriceCache directory (standaard: backtest_cache_dir als die gevuld is, anders price_cache_dir)"
+    )
+    parser.add_argument(
+        '--fetch', action='store_true',
+        help="Vul/ververs eerst de lange historie (standaard in backtest_cache_dir)"
+    )
+    parser.add_argument('--period', default=SETTINGS['backtest_period'], help="Historie voor --fetch (yfinance notatie)")
+    parser.add_argument(
+        '--max-bars', type=int, default=SETTINGS['backtest_max_bars'],
+        help="Bars per ticker in de store bij --fetch"
+    )
+    parser.add_argument('--start', help="Eerste signaaldag (YYYY-MM-DD); eerdere bars zijn warm-up")
+    parser.add_argument(
+        '--horizons', type=int, nargs='+', default=list(BACKTEST_HORIZONS),
+        help="Forward return horizons in bars"
+    )
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    cache_dir = args.cache_dir or (SETTINGS['backtest_cache_dir'] if args.fetch else default_cache_dir())
+    if args.fetch:
+        fetch_long_history(cache_dir, period=args.period, max_bars=args.max_bars)
+    histories = load_price_history(cache_dir)
+    if not histories:
+        raise SystemExit(f"Geen gecachte koersen in {cache_dir} (gebruik --fetch)")
+    panel = build_date_panel(histories)
+    result = run_backtest(panel, horizons=args.horizons, start=args.start)
+
+    dates = panel['Close'].index
+    print(f"📈 Backtest: {len(histories)} tickers, {len(dates)} dagen "
+          f"({dates[0].date()} - {dates[-1].date()}) in {time.perf_counter() - started:.1f}s")
+    print(format_report(result))
+
+
+# =============================================================================
+# HELPER FUNCTIONS
+# =============================================================================
+
+def _cached_tickers(cache_dir: str) -> List[str]:
+    """Tickers with a CSV in a PriceCache directory"""
+    return sorted(
+        os.path.splitext(os.path.basename(path))[0]
+        for path in glob.glob(os.path.join(cache_dir, '*.csv'))
+    )
+
+
+def _max_drawdown(curve: np.ndarray) -> float:
+    """Largest peak-to-trough decline of an equity curve (negative fraction)"""
+    if not len(curve):
+        return np.nan
+    peaks = np.maximum.accumulate(np.concatenate([[1.0], curve]))[1:]
+    return float((curve / peaks - 1).min())
+
+
+if __name__ == "__main__":
+    main()
@@ -240,6 +240,7 @@ DISCOVER_SETTINGS = {
     'min_volume': 100000,  # Minimale dagelijkse volume
     'min_price': 1.0,  # Minimale prijs
     'max_tickers': 200,  # Maximum aantal tickers totaal
+    'validation_ttl_hours': 24,  # Validatie resultaten hergebruiken
 }
 
 # =============================================================================
@@ -376,4 +377,33 @@ SETTINGS = {
     'max_trending_display': 5,
     'max_regional_display': 8,
     'parallel_workers': 10,
+    'batch_download': True,  # Prijshistorie in gegroepeerde requests
+    'price_batch_size': 50,
+    'price_cache_dir': 'data_snapshots/prices',  # Incrementele OHLCV cache (None = uit)
+    'backtest_cache_dir': 'data_snapshots/prices_long',  # Lange historie voor backtest/sweep (python backtest.py --fetch)
+    'backtest_period': '10y',
+    'backtest_max_bars': 2600,  # ~10 jaar handelsdagen; de dagelijkse cache houdt er 400
+    'validation_cache': 'data_snapshots/ticker_validation.json',
+    'rss_timeout': 10,  # Harde deadline per feed (seconden)
+    'rss_max_connections': 20,
+    'rss_cache_dir': '.cache/rss',  # ETag/Last-Modified cache
+    'feed_health_path': 'data_snapshots/feed_health.json',  # Succesrate/latency per feed
+    'llm_cache_path': '.cache/llm_sentiment.json',  # LLM sentiment per headline set
+    'llm_cache_ttl_hours': 72,
+    'llm_cache_max_entries': 5000,
+    'indicator_cache_path': '.cache/indicators.json',  # Indicatoren per (ticker, bars, params); None = alleen in-process
+    'indicator_cache_max_entries': 5000,
+    'indicator_state_path': '.cache/indicator_states.json',  # Streaming indicator state (continuous mode); None = alleen in-process
+    'transform_workers': None,  # Processen voor de per-ticker transform (None = aantal CPU's)
+    'transform_parallel_min': 500,  # Minder tickers: in-process (pool start-up kost meer)
+    'render_workers': None,  # Processen voor ticker pagina's (None = aantal CPU's)
+    'render_parallel_min': 500,  # Kleinere batches renderen in-process (pool start-up kost meer)
+    'output_manifest': '.cache/output_manifest.json',  # Content hashes van docs/ en snapshots
+    'market_table_initial_rows': 50,  # Server-side rijen in index.html; de rest via market-data.json
+    'snapshot_store_dir': 'data_snapshots/history',  # Kolomgewijze historie per dag (None = uit)
+    'snapshot_json': True,  # snap_YYYY-MM-DD.json export naast de store
+    # Continuous mode (python stock_analyzer.py --continuous), in seconden
+    'live_price_interval': 300,
+    'live_news_interval': 900,
+    'live_social_interval': 600,
 }
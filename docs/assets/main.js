@@ -1,6 +1,6 @@
 /**
  * Beurs Cowboy - Main JavaScript
- * Handles theme toggle, search, mobile menu, and filtering
+ * Handles theme toggle, search, mobile menu, filtering and the virtualized market table
  */
 
 // ============================================
@@ -133,6 +133,10 @@ class SearchManager {
     }
 
     handleSearch(query) {
+        if (window.marketTable) {
+            window.marketTable.search(query);
+            return;
+        }
         if (!query.trim()) {
             this.resetFilters();
             return;
@@ -155,6 +159,10 @@ class SearchManager {
     }
 
     resetFilters() {
+        if (window.marketTable) {
+            window.marketTable.search('');
+            return;
+        }
         const rows = document.querySelectorAll('.stock-row');
         rows.forEach(row => {
             row.style.display = '';
@@ -165,6 +173,12 @@ class SearchManager {
 // ============================================
 // Filter Management
 // ============================================
+const SIGNAL_FILTERS = {
+    buy: ['buy', 'buy-strong'],
+    neutral: ['neutral'],
+    sell: ['sell', 'sell-strong', 'watch']
+};
+
 class FilterManager {
     constructor() {
         this.filterButtons = document.querySelectorAll('.filter-btn');
@@ -183,22 +197,17 @@ class FilterManager {
         button.classList.add('active');
 
         const filter = button.dataset.filter;
-        const rows = document.querySelectorAll('.stock-row');
+        if (window.marketTable) {
+            window.marketTable.setFilter(filter);
+            return;
+        }
 
+        // Statische rijen (market-data.json nog niet of niet geladen)
+        const allowed = SIGNAL_FILTERS[filter];
+        const rows = document.querySelectorAll('.stock-row');
         rows.forEach(row => {
             const signal = row.dataset.signal || '';
-            
-            if (filter === 'all') {
-                row.style.display = '';
-            } else if (filter === 'buy' && (signal === 'buy' || signal === 'buy-strong')) {
-                row.style.display = '';
-            } else if (filter === 'sell' && (signal === 'sell' || signal === 'sell-strong')) {
-                row.style.display = '';
-            } else if (filter === 'neutral' && signal === 'neutral') {
-                row.style.display = '';
-            } else {
-                row.style.display = 'none';
-            }
+            row.style.display = !allowed || allowed.includes(signal) ? '' : 'none';
         });
     }
 }
@@ -219,19 +228,24 @@ class TableSortManager {
                 header.style.cursor = 'pointer';
                 header.setAttribute('role', 'button');
                 header.setAttribute('tabindex', '0');
-                header.addEventListener('click', () => this.sortTable(index));
+                header.addEventListener('click', () => this.sortTable(header, index));
                 header.addEventListener('keydown', (e) => {
                     if (e.key === 'Enter' || e.key === ' ') {
                         e.preventDefault();
-                        this.sortTable(index);
+                        this.sortTable(header, index);
                     }
                 });
             }
         });
     }
 
-    sortTable(columnIndex) {
-        const table = document.querySelector('.market-table');
+    sortTable(header, columnIndex) {
+        if (window.marketTable && header.dataset.key) {
+            window.marketTable.sortBy(header.dataset.key);
+            return;
+        }
+
+        const table = header.closest('.market-table');
         const tbody = table.querySelector('tbody');
         const rows = Array.from(tbody.querySelectorAll('tr'));
         
@@ -240,7 +254,7 @@ class TableSortManager {
         table.dataset.sortAsc = isAscending;
 
         // Update header indicators
-        this.headers.forEach((h, i) => {
+        table.querySelectorAll('th').forEach((h, i) => {
             h.textContent = h.textContent.replace(' ▲', '').replace(' ▼', '');
             if (i === columnIndex) {
                 h.textContent += isAscending ? ' ▲' : ' ▼';
@@ -275,6 +289,192 @@ class TableSortManager {
     }
 }
 
+// ============================================
+// Market Table (virtualized, fed by market-data.json)
+// ============================================
+// Neemt filteren, zoeken en sorteren pas over als de data gedecodeerd is;
+// tot dan (of bij een mislukte fetch) werken de managers op de statische rijen.
+
+class MarketTable {
+    constructor(table) {
+        this.table = table;
+        this.tbody = table.querySelector('tbody');
+        this.container = table.closest('.table-container');
+        this.headers = table.querySelectorAll('th[data-key]');
+        this.rows = [];
+        this.view = [];
+        this.filter = 'all';
+        this.query = '';
+        this.sortKey = null;
+        this.sortAsc = true;
+        this.rowHeight = 0;
+        this.overscan = 8;
+        this.frame = null;
+        this.init();
+    }
+
+    init() {
+        fetch(this.table.dataset.src)
+            .then(response => {
+                if (!response.ok) throw new Error(`HTTP ${response.status}`);
+                return response.json();
+            })
+            .then(payload => this.activate(MarketTable.decode(payload)))
+            .catch(err => console.warn('market-data.json niet geladen, statische tabel blijft staan', err));
+    }
+
+    // Overnemen van de statische tabel, met de filter en zoekterm van dat moment
+    activate(rows) {
+        this.rows = rows;
+        const active = document.querySelector('.table-filters .filter-btn.active');
+        this.filter = active ? active.dataset.filter : 'all';
+        this.query = (document.getElementById('searchInput')?.value || '').trim().toLowerCase();
+        this.table.querySelectorAll('th').forEach(h => {
+            h.textContent = h.textContent.replace(' ▲', '').replace(' ▼', '');
+        });
+        this.container.classList.add('virtual');
+        this.container.addEventListener('scroll', () => this.scheduleRender(), { passive: true });
+        window.addEventListener('resize', () => this.scheduleRender());
+        window.marketTable = this;
+        this.update();
+    }
+
+    // Columnar payload -> array of row objects
+    static decode(payload) {
+        const { columns, dicts, count } = payload;
+        const fields = Object.keys(columns);
+        const rows = new Array(count);
+        for (let i = 0; i < count; i++) {
+            const row = { rank: i + 1 };
+            for (const field of fields) {
+                const value = columns[field][i];
+                row[field] = dicts[field] ? dicts[field][value] : value;
+            }
+            rows[i] = row;
+        }
+        return rows;
+    }
+
+    search(query) {
+        this.query = query.trim().toLowerCase();
+        this.update();
+    }
+
+    setFilter(filter) {
+        this.filter = filter;
+        this.update();
+    }
+
+    sortBy(key) {
+        this.sortAsc = this.sortKey === key ? !this.sortAsc : true;
+        this.sortKey = key;
+        this.headers.forEach(h => {
+            h.textContent = h.textContent.replace(' ▲', '').replace(' ▼', '');
+            if (h.dataset.key === key) {
+                h.textContent += this.sortAsc ? ' ▲' : ' ▼';
+            }
+        });
+        this.update();
+    }
+
+    update() {
+        const allowed = SIGNAL_FILTERS[this.filter];
+        const query = this.query;
+        let view = this.rows.filter(row =>
+            (!allowed || allowed.includes(row.signal_class)) &&
+            (!query ||
+                row.ticker.toLowerCase().includes(query) ||
+                row.name.toLowerCase().includes(query) ||
+                row.sector.toLowerCase().includes(query) ||
+                row.signal.toLowerCase().includes(query))
+        );
+
+        if (this.sortKey) {
+            const key = this.sortKey;
+            const direction = this.sortAsc ? 1 : -1;
+            view = view.slice().sort((a, b) => {
+                const x = a[key], y = b[key];
+                if (x === y) return 0;
+                if (x === null || x === undefined) return 1;
+                if (y === null || y === undefined) return -1;
+                return (typeof x === 'number' ? x - y : String(x).localeCompare(String(y))) * direction;
+            });
+        }
+
+        this.view = view;
+        this.container.scrollTop = 0;
+        this.render();
+    }
+
+    scheduleRender() {
+        if (this.frame) return;
+        this.frame = requestAnimationFrame(() => {
+            this.frame = null;
+            this.render();
+        });
+    }
+
+    // Render only the rows in (and just around) the visible window
+    render() {
+        const total = this.view.length;
+        if (!total) {
+            this.tbody.innerHTML = '<tr><td colspan="10" class="no-results">Geen aandelen gevonden</td></tr>';
+            return;
+        }
+
+        const rowHeight = this.rowHeight || 60;
+        const viewport = this.container.clientHeight || 600;
+        const first = Math.max(0, Math.floor(this.container.scrollTop / rowHeight) - this.overscan);
+        const last = Math.min(total, Math.ceil((this.container.scrollTop + viewport) / rowHeight) + this.overscan);
+
+        const html = [];
+        if (first > 0) {
+            html.push(`<tr class="spacer" style="height:${first * rowHeight}px"></tr>`);
+        }
+        for (let i = first; i < last; i++) {
+            html.push(MarketTable.rowHtml(this.view[i]));
+        }
+        if (last < total) {
+            html.push(`<tr class="spacer" style="height:${(total - last) * rowHeight}px"></tr>`);
+        }
+        this.tbody.innerHTML = html.join('');
+
+        if (!this.rowHeight) {
+            const sample = this.tbody.querySelector('.stock-row');
+            if (sample && sample.offsetHeight) {
+                this.rowHeight = sample.offsetHeight;
+                this.render();
+            }
+        }
+    }
+
+    // Same markup and number formats as MARKET_ROW in page_templates.py
+    static rowHtml(r) {
+        const up = r.change_pct >= 0;
+        const fixed = (value, digits) => value === null || value === undefined ? '–' : value.toFixed(digits);
+        return `<tr class="stock-row" data-signal="${r.signal_class}">` +
+            `<td class="rank">${r.rank}</td>` +
+            `<td class="ticker"><a href="ticker/${escapeHtml(r.ticker)}.html" class="ticker-link">` +
+            `<strong>${escapeHtml(r.ticker)}</strong>${r.is_trending ? '🔥' : ''}</a>` +
+            `<br><small>${escapeHtml(r.name)}</small></td>` +
+            `<td class="sector">${escapeHtml(r.sector)}</td>` +
+            `<td class="price">€${fixed(r.price, 2)}</td>` +
+            `<td class="change ${up ? 'positive' : 'negative'}">${up ? '+' : ''}${fixed(r.change_pct, 2)}%</td>` +
+            `<td class="volume">${(r.volume || 0).toLocaleString('en-US')}</td>` +
+            `<td class="rsi">${fixed(r.rsi, 1)}</td>` +
+            `<td class="signal ${r.signal_class}">${escapeHtml(r.signal)}</td>` +
+            `<td class="score">${fixed(r.setup_score, 1)}</td>` +
+            `<td class="upside">+${fixed(r.potential_upside, 1)}%</td>` +
+            `</tr>`;
+    }
+}
+
+function escapeHtml(text) {
+    return String(text ?? '').replace(/[&<>"']/g, c => ({
+        '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'
+    })[c]);
+}
+
 // ============================================
 // Smooth Scroll for Anchor Links
 // ============================================
@@ -328,6 +528,11 @@ document.addEventListener('DOMContentLoaded', () => {
     new SearchManager();
     new FilterManager();
     new TableSortManager();
+    // Zet window.marketTable zelf zodra market-data.json gedecodeerd is
+    const marketTable = document.querySelector('.market-table[data-src]');
+    if (marketTable) {
+        new MarketTable(marketTable);
+    }
     initSmoothScroll();
     initTouchEnhancements();
 
@@ -7,58 +7,147 @@ Verantwoordelijk voor het ophalen van ruwe data:
 - Social media (StockTwits)
 """
 
+import os
+import time
 import datetime
 import concurrent.futures
 import feedparser
 import yfinance as yf
 import urllib.request
 import json
-from typing import Dict, List, Tuple, Any, Optional
+import pandas as pd
+from typing import Dict, List, Tuple, Any, Optional, Callable
 
 from config import RSS_FEEDS, REGIONAL_FEEDS, TICKERS, TICKER_DISCOVER, DISCOVER_SETTINGS
+from price_cache import PriceCache
+from rss_fetcher import fetch_feed_bodies, AIOHTTP_AVAILABLE
+from feed_health import FeedHealthTracker
+from matchers import get_ticker_matcher
 
 
-def get_all_tickers() -> List[str]:
+def get_all_tickers(
+    histories: Optional[Dict[str, pd.DataFrame]] = None,
+    workers: int = 10,
+    cache_path: Optional[str] = None
+) -> List[str]:
     """
     Get complete list of tickers.
     Currently uses static configuration + TICKER_DISCOVER.
     Auto-discovery disabled due to API limitations.
     
+    Args:
+        histories: Optional {ticker: hist} from the main price fetch, used
+            to validate discovery tickers without extra requests
+        workers: Number of parallel validation workers
+        cache_path: Optional JSON file with cached validation results
+    
     Returns:
         Combined list of all tickers
     """
-    all_tickers = set(TICKERS)
+    base = list(dict.fromkeys(TICKERS))
     
     if not DISCOVER_SETTINGS.get('enabled', True):
-        return list(all_tickers)
+        return base
     
-    # Add from discovery categories (static)
-    added = 0
-    for category, tickers in TICKER_DISCOVER.items():
-        for ticker in tickers:
-            if _validate_ticker(ticker):
-                all_tickers.add(ticker)
-                added += 1
+    candidates = get_discovery_candidates()
+    valid = validate_tickers(candidates, histories, workers, cache_path)
+    discovered = [t for t in candidates if valid.get(t)]
     
-    result = list(all_tickers)[:DISCOVER_SETTINGS.get('max_tickers', 200)]
-    print(f"  ✓ Loaded {len(result)} tickers ({added} from discovery)")
+    result = (base + discovered)[:DISCOVER_SETTINGS.get('max_tickers', 200)]
+    print(f"  ✓ Loaded {len(result)} tickers ({len(discovered)} from discovery)")
     
     return result
 
 
-def _validate_ticker(ticker: str) -> bool:
+def get_discovery_candidates() -> List[str]:
+    """
+    Unique TICKER_DISCOVER symbols that are not already in TICKERS.
+    
+    Returns:
+        De-duplicated list of candidate tickers (config order)
+    """
+    base = set(TICKERS)
+    candidates = []
+    for category, tickers in TICKER_DISCOVER.items():
+        candidates.extend(t for t in tickers if t not in base)
+    return list(dict.fromkeys(candidates))
+
+
+def validate_tickers(
+    tickers: List[str],
+    histories: Optional[Dict[str, pd.DataFrame]] = None,
+    workers: int = 10,
+    cache_path: Optional[str] = None
+) -> Dict[str, bool]:
+    """
+    Validate tickers concurrently with a TTL-based result cache.
+    
+    Tickers with bars in histories are checked locally; cached results
+    younger than DISCOVER_SETTINGS['validation_ttl_hours'] are reused; the
+    rest are validated in parallel with one request each.
+    
+    Args:
+        tickers: Ticker symbols to validate
+        histories: Optional {ticker: hist} from the main price fetch
+        workers: Number of parallel workers
+        cache_path: Optional JSON file with cached validation results
+    
+    Returns:
+        Dict of {ticker: is_valid}
+    """
+    histories = histories or {}
+    cache = _load_validation_cache(cache_path)
+    ttl = datetime.timedelta(hours=DISCOVER_SETTINGS.get('validation_ttl_hours', 24))
+    now = datetime.datetime.now(datetime.timezone.utc)
+    
+    results = {}
+    to_fetch = []
+    for ticker in dict.fromkeys(tickers):
+        hist = histories.get(ticker)
+        if hist is not None:
+            results[ticker] = _validate_ticker(ticker, hist)
+            continue
+        
+        entry = cache.get(ticker)
+        if entry:
+            try:
+                checked = datetime.datetime.fromisoformat(entry['checked'])
+                if now - checked < ttl:
+                    results[ticker] = bool(entry['valid'])
+                    continue
+            except (KeyError, TypeError, ValueError):
+                pass
+        to_fetch.append(ticker)
+    
+    if to_fetch:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            for ticker, valid in zip(to_fetch, executor.map(_validate_ticker, to_fetch)):
+                results[ticker] = valid
+    
+    if cache_path:
+        for ticker, valid in results.items():
+            if ticker in histories or ticker in to_fetch:
+                cache[ticker] = {'valid': valid, 'checked': now.isoformat()}
+        _save_validation_cache(cache_path, cache)
+    
+    return results
+
+
+def _validate_ticker(ticker: str, hist: Optional[pd.DataFrame] = None) -> bool:
     """
     Quick validation if ticker exists and is tradeable.
     
     Args:
         ticker: Ticker symbol to validate
+        hist: Optional price history; fetched from Yahoo when omitted
     
     Returns:
         True if valid, False otherwise
     """
     try:
-        t = yf.Ticker(ticker)
-        hist = t.history(period='1d')
+        if hist is None:
+            t = yf.Ticker(ticker)
+            hist = t.history(period='1d')
         
         if hist.empty:
             return False
@@ -70,32 +159,76 @@ def _validate_ticker(ticker: str) -> bool:
         min_price = DISCOVER_SETTINGS.get('min_price', 1.0)
         min_volume = DISCOVER_SETTINGS.get('min_volume', 100000)
         
-        return price >= min_price and volume >= min_volume
+        return bool(price >= min_price and volume >= min_volume)
         
     except Exception:
         return False
 
 
+def _load_validation_cache(cache_path: Optional[str]) -> Dict[str, Dict]:
+    """Load cached validation results"""
+    if not cache_path or not os.path.exists(cache_path):
+        return {}
+    try:
+        with open(cache_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_validation_cache(cache_path: str, cache: Dict[str, Dict]) -> None:
+    """Persist validation results"""
+    directory = os.path.dirname(cache_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(cache_path, 'w') as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+
+
 def fetch_rss_news(
     max_age_hours: int = 24,
     feed_limit: int = 25,
-    workers: int = 10
+    workers: int = 10,
+    timeout: float = 10.0,
+    max_connections: int = 20,
+    cache_dir: Optional[str] = None,
+    feeds: Optional[Dict[str, str]] = None,
+    health: Optional[FeedHealthTracker] = None
 ) -> Tuple[List[Dict], Dict[str, List[Dict]]]:
     """
     Fetch RSS news from multiple sources in parallel.
     
+    When aiohttp is available the raw feeds are downloaded with the async
+    fetcher (shared pool, per-feed deadline, conditional GET) and only
+    parsed by feedparser; otherwise feedparser fetches each URL itself.
+    
     Args:
         max_age_hours: Maximum age of articles in hours
         feed_limit: Max articles per feed
         workers: Number of parallel workers
+        timeout: Per-feed deadline in seconds (async fetcher)
+        max_connections: Connection pool size (async fetcher)
+        cache_dir: Optional directory for conditional GET cache
+        feeds: Optional {source: url} override (defaults to RSS_FEEDS)
+        health: Optional tracker; skips circuit-broken feeds, tightens
+            deadlines for slow feeds and records every outcome
     
     Returns:
         Tuple of (all_news, regional_news)
     """
+    feed_urls = feeds if feeds is not None else RSS_FEEDS
+    timeouts = {}
+    circuit_open = []
+    if health:
+        selected = health.select_feeds(feed_urls)
+        circuit_open = [s for s in feed_urls if s not in selected]
+        feed_urls = selected
+        timeouts = {source: health.deadline(source, timeout) for source in feed_urls}
     all_news = []
     regional_news = {region: [] for region in REGIONAL_FEEDS.keys()}
     successful_feeds = 0
     failed_feeds = []
+    stale_feeds = []
     skipped_old = 0
 
     now_utc = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
@@ -103,21 +236,53 @@ def fetch_rss_news(
 
     # Reverse mapping: feed -> region
     feed_to_region = {}
-    for region, feeds in REGIONAL_FEEDS.items():
-        for feed in feeds:
+    for region, region_feeds in REGIONAL_FEEDS.items():
+        for feed in region_feeds:
             feed_to_region[feed] = region
 
-    def fetch_single_feed(source_url: Tuple[str, str]) -> Tuple[str, List[Dict], Optional[str]]:
-        """Fetch a single RSS feed"""
-        nonlocal skipped_old
+    # Ruwe feeds asynchroon ophalen; feedparser parseert alleen de bytes
+    bodies = None
+    if AIOHTTP_AVAILABLE:
+        try:
+            bodies = fetch_feed_bodies(
+                feed_urls,
+                timeout=timeout,
+                max_connections=max_connections,
+                cache_dir=cache_dir,
+                timeouts=timeouts
+            )
+            not_modified = sum(1 for b in bodies.values() if b['not_modified'])
+            print(f"  ✓ Async fetch klaar ({not_modified} feeds ongewijzigd, 304)")
+        except Exception as e:
+            print(f"  ⚠️ Async fetch mislukt, fallback naar feedparser: {e}")
+
+    def fetch_single_feed(source_url: Tuple[str, str]) -> Dict[str, Any]:
+        """
+        Fetch a single RSS feed.
+        
+        Pure worker: touches no shared state and returns its own partial
+        result, which is merged after all workers are done.
+        """
         source, url = source_url
+        result = {'source': source, 'articles': [], 'error': None, 'elapsed': None, 'skipped_old': 0}
+        started = time.monotonic()
         
         try:
-            feed = feedparser.parse(url)
+            if bodies is not None:
+                fetched = bodies.get(source, {})
+                result['elapsed'] = fetched.get('elapsed')
+                if not fetched.get('body'):
+                    result['error'] = fetched.get('error') or "Geen inhoud"
+                    return result
+                feed = feedparser.parse(fetched['body'])
+            else:
+                feed = feedparser.parse(url)
+                result['elapsed'] = time.monotonic() - started
             if not feed.entries:
-                return source, [], "No entries"
+                result['error'] = "No entries"
+                return result
             
-            articles = []
+            articles = result['articles']
             for entry in feed.entries[:feed_limit]:
                 published_date = _parse_date(entry.get('published', ''))
                 
@@ -138,41 +303,40 @@ def fetch_rss_news(
                         'age_hours': age_hours
                     }
                     articles.append(article)
-                    
-                    # Add to regional list
-                    region = feed_to_region.get(source, 'Overig')
-                    if region:
-                        regional_news[region].append(article)
                 else:
-                    skipped_old += 1
+                    result['skipped_old'] += 1
             
-            return source, articles, None
+            return result
             
         except Exception as e:
-            return source, [], str(e)
+            result['articles'] = []
+            result['error'] = str(e)
+            result['elapsed'] = time.monotonic() - started
+            return result
 
-    # Fetch feeds in parallel
-    feed_results = []
+    # Fetch feeds in parallel; map() levert resultaten in config volgorde
     with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
-        future_to_source = {
-            executor.submit(fetch_single_feed, (source, url)): source
-            for source, url in RSS_FEEDS.items()
-        }
-        for future in concurrent.futures.as_completed(future_to_source):
-            source = future_to_source[future]
-            try:
-                result = future.result()
-                feed_results.append(result)
-            except Exception as e:
-                feed_results.append((source, [], str(e)))
+        feed_results = list(executor.map(fetch_single_feed, feed_urls.items()))
     
-    # Process results
-    for source, articles, error in feed_results:
+    # Reduce: partiële resultaten één keer samenvoegen (deterministische volgorde)
+    for result in feed_results:
+        source = result['source']
+        articles = result['articles']
+        skipped_old += result['skipped_old']
+        # Bereikbaar, maar alle artikelen te oud (of leeg)
+        stale = not articles and result['error'] is None
         if articles:
             all_news.extend(articles)
             successful_feeds += 1
+            region = feed_to_region.get(source)
+            if region:
+                regional_news[region].extend(articles)
+        elif stale:
+            stale_feeds.append(source)
         else:
             failed_feeds.append(source)
+        if health:
+            health.record(source, bool(articles), result['elapsed'], stale=stale)
 
     # Log statistics
     recent_count = sum(1 for n in all_news if n.get('is_recent', False))
@@ -180,6 +344,10 @@ def fetch_rss_news(
     
     print(f"  Wereldwijd: {len(all_news)} artikelen ({recent_count} recent, {skipped_old} te oud)")
     print(f"  ✓ {successful_feeds} feeds succes, {len(failed_feeds)} overgeslagen")
+    if stale_feeds:
+        print(f"  💤 {len(stale_feeds)} feeds zonder recente artikelen")
+    if circuit_open:
+        print(f"  ⏸️  {len(circuit_open)} feeds tijdelijk uitgeschakeld (circuit open)")
     print(f"  ⏱️  Gemiddelde leeftijd: {avg_age:.1f} uur")
     
     return all_news, regional_news
@@ -188,34 +356,181 @@ def fetch_rss_news(
 def fetch_ticker_data(
     tickers: List[str],
     max_headlines: int = 10,
-    market_news: List[Dict] = None
+    market_news: List[Dict] = None,
+    batch: bool = True,
+    batch_size: int = 50,
+    workers: int = 10,
+    price_source: Optional[Callable[..., pd.DataFrame]] = None,
+    news_source: Optional[Callable[[str], List[Dict]]] = None,
+    cache_dir: Optional[str] = None
 ) -> Tuple[Dict[str, Any], Dict[str, List[str]]]:
     """
     Fetch ticker data and headlines from Yahoo Finance.
     Uses RSS news as fallback for tickers with limited headlines.
     
+    In batch mode the price history for the whole universe is downloaded in
+    grouped requests while the per-ticker news is fetched concurrently.
+    
     Args:
         tickers: List of ticker symbols
         max_headlines: Max headlines per ticker
         market_news: Optional pre-fetched market news for fallback
+        batch: Download price history in grouped requests
+        batch_size: Tickers per grouped price request
+        workers: Number of parallel news workers
+        price_source: Optional stand-in for yf.download (offline testing)
+        news_source: Optional stand-in for Ticker.news (offline testing)
+        cache_dir: Optional directory for the incremental OHLCV cache
     
     Returns:
         Tuple of (ticker_data, ticker_headlines)
     """
+    if not batch:
+        return _fetch_ticker_data_serial(tickers, max_headlines, market_news)
+    
     ticker_data = {}
     ticker_headlines = {}
+    ticker_news_fallback = _match_market_news(tickers, market_news)
+    news_source = news_source or _fetch_yahoo_news
+    
+    # Nieuws loopt parallel aan de prijs download
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        news_futures = {
+            ticker: executor.submit(news_source, ticker)
+            for ticker in tickers
+        }
+        histories = fetch_price_history(
+            tickers,
+            period="1y",
+            batch_size=batch_size,
+            price_source=price_source,
+            cache_dir=cache_dir
+        )
+        
+        for ticker in tickers:
+            hist = histories.get(ticker)
+            if hist is None or hist.empty:
+                print(f"  {ticker}... ❌")
+                continue
+            
+            try:
+                news = news_futures[ticker].result()
+            except Exception:
+                news = []
+            
+            headlines = _build_headlines(
+                ticker, news, max_headlines, ticker_news_fallback, market_news
+            )
+            ticker_headlines[ticker] = headlines
+            
+            ticker_data[ticker] = {
+                'hist': hist,
+                'current_price': hist['Close'].iloc[-1],
+                'avg_price': hist['Close'].mean(),
+                'news': news,
+                'ticker_obj': yf.Ticker(ticker)
+            }
+            print(f"  {ticker}... ✓ {len(headlines)} headlines")
+    
+    return ticker_data, ticker_headlines
+
+
+def fetch_price_history(
+    tickers: List[str],
+    period: str = "1y",
+    batch_size: int = 50,
+    price_source: Optional[Callable[..., pd.DataFrame]] = None,
+    cache_dir: Optional[str] = None,
+    max_bars: int = 400
+) -> Dict[str, pd.DataFrame]:
+    """
+    Download price history for many tickers in grouped requests.
+    
+    With a cache_dir the bars are kept on disk and only the bars since the
+    last stored date are downloaded.
+    
+    Args:
+        tickers: List of ticker symbols
+        period: History period (yfinance notation)
+        batch_size: Tickers per grouped request
+        price_source: Callable with the yf.download signature, returning
+            a frame with (ticker, field) columns; defaults to yfinance
+        cache_dir: Optional directory for the incremental OHLCV cache
+        max_bars: Bars kept per ticker in the cache
+    
+    Returns:
+        Dict of {ticker: OHLCV DataFrame}
+    """
+    def fetch(group: List[str], **kwargs) -> Dict[str, pd.DataFrame]:
+        return _download_grouped(group, batch_size, price_source, **kwargs)
+    
+    if cache_dir:
+        return PriceCache(cache_dir, max_bars=max_bars).refresh(tickers, fetch, period=period)
+    
+    return fetch(tickers, period=period)
+
+
+def fetch_ticker_news(
+    tickers: List[str],
+    workers: int = 10,
+    news_source: Optional[Callable[[str], List[Dict]]] = None
+) -> Dict[str, List[Dict]]:
+    """
+    Fetch Yahoo Finance news for many tickers concurrently.
+    
+    Args:
+        tickers: List of ticker symbols
+        workers: Number of parallel news workers
+        news_source: Optional stand-in for Ticker.news (offline testing)
+    
+    Returns:
+        Dict of {ticker: Yahoo news items} (empty list on failure)
+    """
+    news_source = news_source or _fetch_yahoo_news
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {ticker: executor.submit(news_source, ticker) for ticker in tickers}
+    
+    ticker_news = {}
+    for ticker, future in futures.items():
+        try:
+            ticker_news[ticker] = future.result()
+        except Exception:
+            ticker_news[ticker] = []
+    return ticker_news
+
+
+def build_ticker_headlines(
+    ticker_news: Dict[str, List[Dict]],
+    max_headlines: int = 10,
+    market_news: List[Dict] = None
+) -> Dict[str, List[str]]:
+    """
+    Build headlines for tickers whose Yahoo news is already fetched.
     
-    # Create ticker-specific news from market news if available
-    ticker_news_fallback = {}
-    if market_news:
-        for article in market_news[:50]:  # Use top 50 market articles
-            title = article['title']
-            # Try to match tickers in title
-            for ticker in tickers:
-                if ticker in title or ticker.lower() in title.lower():
-                    if ticker not in ticker_news_fallback:
-                        ticker_news_fallback[ticker] = []
-                    ticker_news_fallback[ticker].append(title)
+    Args:
+        ticker_news: Dict of {ticker: Yahoo news items}
+        max_headlines: Max headlines per ticker
+        market_news: Optional market news for fallback
+    
+    Returns:
+        Dict of {ticker: [headlines]}
+    """
+    ticker_news_fallback = _match_market_news(list(ticker_news), market_news)
+    return {
+        ticker: _build_headlines(ticker, news, max_headlines, ticker_news_fallback, market_news)
+        for ticker, news in ticker_news.items()
+    }
+
+
+def _fetch_ticker_data_serial(
+    tickers: List[str],
+    max_headlines: int = 10,
+    market_news: List[Dict] = None
+) -> Tuple[Dict[str, Any], Dict[str, List[str]]]:
+    """Fetch ticker data one yf.Ticker at a time (legacy path)"""
+    ticker_data = {}
+    ticker_headlines = {}
+    ticker_news_fallback = _match_market_news(tickers, market_news)
     
     for ticker in tickers:
         try:
@@ -228,31 +543,10 @@ def fetch_ticker_data(
 
             # Get headlines from Yahoo Finance news
             news = t.news
-            headlines = []
-            
-            for n in news:
-                title = n.get('title')
-                if title:
-                    headlines.append(title)
-            
-            # Supplement with market news if Yahoo has few headlines
-            if len(headlines) < max_headlines and ticker in ticker_news_fallback:
-                for fb_title in ticker_news_fallback[ticker]:
-                    if fb_title not in headlines:
-                        headlines.append(f"{ticker}: {fb_title}")
-                    if len(headlines) >= max_headlines:
-                        break
-            
-            # Final fallback: general market news
-            if len(headlines) < 3 and market_news:
-                for article in market_news[:max_headlines - len(headlines)]:
-                    headlines.append(f"{ticker} - {article['title']}")
-            
-            # Last resort fallback
-            if not headlines:
-                headlines = [f"{ticker} - Markt update vandaag"]
-            
-            ticker_headlines[ticker] = headlines[:max_headlines]
+            headlines = _build_headlines(
+                ticker, news, max_headlines, ticker_news_fallback, market_news
+            )
+            ticker_headlines[ticker] = headlines
 
             ticker_data[ticker] = {
                 'hist': hist,
@@ -269,6 +563,122 @@ def fetch_ticker_data(
     return ticker_data, ticker_headlines
 
 
+def _match_market_news(
+    tickers: List[str],
+    market_news: Optional[List[Dict]]
+) -> Dict[str, List[str]]:
+    """Create ticker-specific news from market news (title + summary, all articles)"""
+    if not market_news:
+        return {}
+    matcher = get_ticker_matcher(tuple(tickers))
+    return matcher.match_articles(market_news)
+
+
+def _build_headlines(
+    ticker: str,
+    news: List[Dict],
+    max_headlines: int,
+    ticker_news_fallback: Dict[str, List[str]],
+    market_news: Optional[List[Dict]]
+) -> List[str]:
+    """Combine Yahoo news with market news fallbacks into headlines"""
+    headlines = []
+    
+    for n in news:
+        title = n.get('title')
+        if title:
+            headlines.append(title)
+    
+    # Supplement with market news if Yahoo has few headlines
+    if len(headlines) < max_headlines and ticker in ticker_news_fallback:
+        for fb_title in ticker_news_fallback[ticker]:
+            if fb_title not in headlines:
+                headlines.append(f"{ticker}: {fb_title}")
+            if len(headlines) >= max_headlines:
+                break
+    
+    # Final fallback: general market news
+    if len(headlines) < 3 and market_news:
+        for article in market_news[:max_headlines - len(headlines)]:
+            headlines.append(f"{ticker} - {article['title']}")
+    
+    # Last resort fallback
+    if not headlines:
+        headlines = [f"{ticker} - Markt update vandaag"]
+    
+    return headlines[:max_headlines]
+
+
+def _fetch_yahoo_news(ticker: str) -> List[Dict]:
+    """Fetch news items for a single ticker from Yahoo Finance"""
+    try:
+        return yf.Ticker(ticker).news or []
+    except Exception:
+        return []
+
+
+def _download_grouped(
+    tickers: List[str],
+    batch_size: int,
+    price_source: Optional[Callable[..., pd.DataFrame]],
+    **kwargs
+) -> Dict[str, pd.DataFrame]:
+    """Run price_source over tickers in groups of batch_size"""
+    price_source = price_source or _download_prices
+    histories = {}
+    
+    for i in range(0, len(tickers), batch_size):
+        group = tickers[i:i + batch_size]
+        try:
+            frame = price_source(group, **kwargs)
+        except Exception as e:
+            print(f"  ⚠️ Batch download mislukt ({len(group)} tickers): {e}")
+            continue
+        histories.update(_split_price_frame(frame, group))
+    
+    return histories
+
+
+def _download_prices(tickers: List[str], **kwargs) -> pd.DataFrame:
+    """Grouped price download via yfinance"""
+    return yf.download(
+        tickers,
+        group_by='ticker',
+        auto_adjust=True,
+        threads=True,
+        progress=False,
+        **kwargs
+    )
+
+
+def _split_price_frame(
+    frame: pd.DataFrame,
+    tickers: List[str]
+) -> Dict[str, pd.DataFrame]:
+    """Split a grouped download into per-ticker OHLCV frames"""
+    histories = {}
+    if frame is None or frame.empty:
+        return histories
+    
+    if not isinstance(frame.columns, pd.MultiIndex):
+        # Enkele ticker zonder ticker-niveau in de kolommen
+        frame = pd.concat({tickers[0]: frame}, axis=1) if len(tickers) == 1 else frame
+        if not isinstance(frame.columns, pd.MultiIndex):
+            return histories
+    
+    available = set(frame.columns.get_level_values(0))
+    for ticker in tickers:
+        if ticker not in available:
+            continue
+        hist = frame[ticker].dropna(how='all')
+        if 'Close' in hist.columns:
+            hist = hist[hist['Close'].notna()]
+        if not hist.empty:
+            histories[ticker] = hist
+    
+    return histories
+
+
 def fetch_stocktwits_trending(limit: int = 10) -> Dict[str, int]:
     """
     Fetch trending symbols from StockTwits.
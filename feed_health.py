@@ -0,0 +1,199 @@
+"""
+Feed Health Tracker
+
+Houdt per RSS feed bij hoe betrouwbaar en snel hij is:
+- Succesrate, latency percentielen en laatste succesvolle fetch
+- Feeds die antwoorden maar alleen te oude artikelen hebben tellen als
+  stale: geen succes, maar ook geen circuit breaker
+- Circuit breaker met exponentiële backoff voor feeds die blijven falen
+- Strakkere deadlines voor trage feeds
+- Succesrate per regio (zelfde vorm als de tabel in TODO.md)
+"""
+
+import os
+import json
+import datetime
+from typing import Dict, List, Any, Optional
+
+
+class FeedHealthTracker:
+    """
+    Persisted per-feed health records with adaptive scheduling.
+
+    A feed that fails ``failure_threshold`` times in a row is circuit-broken
+    for ``base_backoff_hours * 2 ** (extra failures)`` hours (capped at
+    ``max_backoff_hours``). After the backoff it is tried once again
+    (half-open); one success closes the circuit.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        failure_threshold: int = 3,
+        base_backoff_hours: float = 6.0,
+        max_backoff_hours: float = 168.0,
+        max_samples: int = 20,
+        min_timeout: float = 3.0
+    ):
+        self.path = path
+        self.failure_threshold = failure_threshold
+        self.base_backoff_hours = base_backoff_hours
+        self.max_backoff_hours = max_backoff_hours
+        self.max_samples = max_samples
+        self.min_timeout = min_timeout
+        self.records: Dict[str, Dict[str, Any]] = self._load()
+
+    def record(
+        self,
+        source: str,
+        success: bool,
+        latency: Optional[float] = None,
+        now: Optional[datetime.datetime] = None,
+        stale: bool = False
+    ) -> None:
+        """
+        Record the outcome of one fetch.
+
+        A stale fetch (feed reachable, but no article within the age limit)
+        lowers the success rate without counting towards the backoff.
+        """
+        now = now or _utcnow()
+        rec = self.records.setdefault(source, {
+            'attempts': 0,
+            'successes': 0,
+            'stale': 0,
+            'consecutive_failures': 0,
+            'latencies': [],
+            'last_good': None,
+            'last_attempt': None,
+            'open_until': None,
+        })
+        rec['attempts'] += 1
+        rec['last_attempt'] = now.isoformat()
+
+        if stale and not success:
+            rec['stale'] = rec.get('stale', 0) + 1
+            rec['consecutive_failures'] = 0
+            rec['open_until'] = None
+            if latency is not None:
+                rec['latencies'] = (rec['latencies'] + [round(latency, 3)])[-self.max_samples:]
+        elif success:
+            rec['successes'] += 1
+            rec['consecutive_failures'] = 0
+            rec['last_good'] = now.isoformat()
+            rec['open_until'] = None
+            if latency is not None:
+                rec['latencies'] = (rec['latencies'] + [round(latency, 3)])[-self.max_samples:]
+        else:
+            rec['consecutive_failures'] += 1
+            extra = rec['consecutive_failures'] - self.failure_threshold
+            if extra >= 0:
+                hours = min(self.base_backoff_hours * 2 ** extra, self.max_backoff_hours)
+                rec['open_until'] = (now + datetime.timedelta(hours=hours)).isoformat()
+
+    def is_open(self, source: str, now: Optional[datetime.datetime] = None) -> bool:
+        """True if the circuit for a feed is open (feed should be skipped)"""
+        rec = self.records.get(source)
+        if not rec or not rec.get('open_until'):
+            return False
+        now = now or _utcnow()
+        return now < datetime.datetime.fromisoformat(rec['open_until'])
+
+    def select_feeds(
+        self,
+        feeds: Dict[str, str],
+        now: Optional[datetime.datetime] = None
+    ) -> Dict[str, str]:
+        """Filter out circuit-broken feeds"""
+        return {source: url for source, url in feeds.items() if not self.is_open(source, now)}
+
+    def deadline(self, source: str, default: float) -> float:
+        """
+        Per-feed deadline: 2x the feed's p95 latency, between min_timeout
+        and default. Feeds without enough samples get the default.
+        """
+        percentiles = self.latency_percentiles(source)
+        if not percentiles:
+            return default
+        return max(self.min_timeout, min(default, percentiles['p95'] * 2))
+
+    def success_rate(self, source: str) -> Optional[float]:
+        """Fraction of successful attempts, or None without history"""
+        rec = self.records.get(source)
+        if not rec or not rec['attempts']:
+            return None
+        return rec['successes'] / rec['attempts']
+
+    def latency_percentiles(self, source: str) -> Dict[str, float]:
+        """p50/p95 latency in seconds (empty with fewer than 3 samples)"""
+        rec = self.records.get(source)
+        samples = sorted(rec['latencies']) if rec else []
+        if len(samples) < 3:
+            return {}
+        return {
+            'p50': _percentile(samples, 50),
+            'p95': _percentile(samples, 95),
+        }
+
+    def regional_summary(self, regional_feeds: Dict[str, List[str]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Success rate per region.
+
+        Returns:
+            Dict of {region: {'sources': n, 'success_rate': pct or None}}
+        """
+        summary = {}
+        for region, sources in regional_feeds.items():
+            attempts = sum(self.records.get(s, {}).get('attempts', 0) for s in sources)
+            successes = sum(self.records.get(s, {}).get('successes', 0) for s in sources)
+            summary[region] = {
+                'sources': len(sources),
+                'success_rate': round(successes / attempts * 100) if attempts else None,
+            }
+        return summary
+
+    def format_regional_table(self, regional_feeds: Dict[str, List[str]]) -> str:
+        """Markdown table in the layout of TODO.md"""
+        lines = [
+            "| Regio | Aantal Bronnen | Succesrate |",
+            "|-------|---------------|------------|",
+        ]
+        for region, data in self.regional_summary(regional_feeds).items():
+            rate = f"~{data['success_rate']}%" if data['success_rate'] is not None else "-"
+            lines.append(f"| {region} | {data['sources']} | {rate} |")
+        return "\n".join(lines)
+
+    def save(self) -> None:
+        """Persist health records"""
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump(self.records, f, indent=2, sort_keys=True)
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+
+# =============================================================================
+# HELPER FUNCTIONS
+# =============================================================================
+
+def _utcnow() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    """Linear-interpolated percentile of sorted samples"""
+    position = (len(samples) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(samples) - 1)
+    return samples[lower] + (samples[upper] - samples[lower]) * (position - lower)
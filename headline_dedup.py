@@ -0,0 +1,193 @@
+"""
+Headline Deduplication
+
+Ontdubbelt headlines vóór sentiment analyse:
+- Normalisatie (ticker prefixen zoals "AAPL - " / "AAPL: ", hoofdletters,
+  leestekens en witruimte)
+- Near-duplicate clustering met MinHash signatures en LSH banding, zodat
+  hetzelfde persbericht via meerdere bronnen één cluster wordt
+- Elk uniek cluster wordt één keer gescoord en terug verdeeld over tickers
+"""
+
+import re
+import zlib
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_NON_WORD = re.compile(r'[^\w\s]+')
+_SPACES = re.compile(r'\s+')
+# Bronvermelding achteraan, zoals "... - Reuters" of "... | Yahoo Finance"
+_SOURCE_SUFFIX = re.compile(r'\s+[-–—|]\s+(?:[A-Z][\w.&\']*\s?){1,3}$')
+
+
+def normalize_headline(headline: str, ticker: str = '') -> str:
+    """
+    Canonical form of a headline.
+
+    Strips a leading "{ticker} - " or "{ticker}: " (added when market news
+    is attached to a ticker) and a trailing source such as " - Reuters"
+    (only after at least four words), then lower-cases and drops
+    punctuation.
+    """
+    text = _strip_ticker_prefix(headline or '', ticker)
+    stripped = _SOURCE_SUFFIX.sub('', text)
+    if len(stripped.split()) >= 4:
+        text = stripped
+    text = _NON_WORD.sub(' ', text.lower())
+    return _SPACES.sub(' ', text).strip()
+
+
+class MinHasher:
+    """
+    MinHash signatures over character shingles.
+
+    Two texts whose signatures agree in a fraction f of positions have an
+    estimated Jaccard similarity of f over their shingle sets.
+    """
+
+    def __init__(self, num_perm: int = 64, shingle_size: int = 5, seed: int = 1):
+        rng = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self._a = rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+    def shingles(self, text: str) -> np.ndarray:
+        """Stable 32-bit hashes of all character shingles"""
+        size = self.shingle_size
+        if len(text) <= size:
+            grams = {text}
+        else:
+            grams = {text[i:i + size] for i in range(len(text) - size + 1)}
+        return np.fromiter(
+            (zlib.crc32(g.encode('utf-8')) for g in grams),
+            dtype=np.uint64,
+            count=len(grams)
+        )
+
+    def signature(self, text: str) -> np.ndarray:
+        """(a * h + b) mod p per permutation, minimized over all shingles"""
+        hashes = self.shingles(text)
+        products = hashes[:, None] * self._a[None, :] + self._b[None, :]
+        return (products % _MERSENNE_PRIME).min(axis=0)
+
+
+class HeadlineIndex:
+    """
+    Clusters of (near-)duplicate headlines across tickers.
+
+    Attributes:
+        clusters: Representative headline per cluster (first occurrence)
+        ticker_clusters: Dict of {ticker: [cluster id per headline]}
+    """
+
+    def __init__(self, clusters: List[str], ticker_clusters: Dict[str, List[int]]):
+        self.clusters = clusters
+        self.ticker_clusters = ticker_clusters
+
+    @property
+    def total_headlines(self) -> int:
+        return sum(len(ids) for ids in self.ticker_clusters.values())
+
+    def unique_headlines(self, ticker: str, limit: int = None) -> List[str]:
+        """A ticker's representative headlines, duplicates removed, in order"""
+        ids = list(dict.fromkeys(self.ticker_clusters.get(ticker, [])))
+        return [self.clusters[i] for i in ids[:limit]]
+
+    def signature(self, ticker: str, limit: int = None) -> Tuple[int, ...]:
+        """Cluster ids of a ticker's unique headlines (equal => same news)"""
+        return tuple(list(dict.fromkeys(self.ticker_clusters.get(ticker, [])))[:limit])
+
+
+def dedup_headlines(
+    ticker_headlines: Dict[str, List[str]],
+    threshold: float = 0.7,
+    num_perm: int = 64,
+    bands: int = 16
+) -> HeadlineIndex:
+    """
+    Cluster headlines that are identical after normalization or whose
+    estimated Jaccard similarity is at least ``threshold``.
+
+    Args:
+        ticker_headlines: Dict of {ticker: [headlines]}
+        threshold: Minimum estimated shingle Jaccard for near-duplicates
+        num_perm: MinHash signature length
+        bands: LSH bands (num_perm must be divisible by bands)
+
+    Returns:
+        HeadlineIndex
+    """
+    # Exacte duplicaten (na normalisatie) eerst, zonder hashing
+    texts: List[str] = []
+    originals: List[str] = []
+    text_ids: Dict[str, int] = {}
+    ticker_texts: Dict[str, List[int]] = {}
+    for ticker, headlines in ticker_headlines.items():
+        ids = []
+        for headline in headlines:
+            if not headline:
+                continue
+            text = normalize_headline(headline, ticker)
+            if text not in text_ids:
+                text_ids[text] = len(texts)
+                texts.append(text)
+                originals.append(_strip_ticker_prefix(headline, ticker))
+            ids.append(text_ids[text])
+        ticker_texts[ticker] = ids
+
+    parent = list(range(len(texts)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    # Near-duplicates: kandidaten via LSH buckets, bevestigd op signature
+    if len(texts) > 1:
+        hasher = MinHasher(num_perm=num_perm)
+        signatures = np.stack([hasher.signature(t) for t in texts])
+        rows = num_perm // bands
+        for band in range(bands):
+            buckets: Dict[bytes, int] = {}
+            band_sigs = signatures[:, band * rows:(band + 1) * rows]
+            for i in range(len(texts)):
+                key = band_sigs[i].tobytes()
+                first = buckets.setdefault(key, i)
+                if first == i:
+                    continue
+                root_i, root_first = find(i), find(first)
+                if root_i == root_first:
+                    continue
+                if np.mean(signatures[i] == signatures[first]) >= threshold:
+                    parent[max(root_i, root_first)] = min(root_i, root_first)
+
+    cluster_ids: Dict[int, int] = {}
+    clusters: List[str] = []
+    text_cluster = []
+    for i in range(len(texts)):
+        root = find(i)
+        if root not in cluster_ids:
+            cluster_ids[root] = len(clusters)
+            clusters.append(originals[root])
+        text_cluster.append(cluster_ids[root])
+
+    return HeadlineIndex(
+        clusters,
+        {ticker: [text_cluster[i] for i in ids] for ticker, ids in ticker_texts.items()}
+    )
+
+
+# =============================================================================
+# HELPER FUNCTIONS
+# =============================================================================
+
+def _strip_ticker_prefix(headline: str, ticker: str) -> str:
+    """'AAPL - Title' / 'AAPL: Title' -> 'Title'"""
+    if not ticker:
+        return headline
+    return re.sub(rf'^\s*{re.escape(ticker)}\s*[-:]\s*', '', headline)
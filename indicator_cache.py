@@ -0,0 +1,95 @@
+"""
+Indicator Cache
+
+Memoization van technische indicatoren per ticker:
+- Sleutel = hash van (ticker, laatste bar, hash van de OHLCV data,
+  TECHNICAL_PARAMS), dus elke wijziging in koersen of parameters is
+  automatisch een nieuwe entry
+- In-process LRU plus optioneel een bestand op disk voor reruns op
+  dezelfde dag
+- Scoring wijzigingen (SCORING_WEIGHTS) draaien daardoor op gecachte
+  indicatoren
+"""
+
+import os
+import json
+import hashlib
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+import numpy as np
+import pandas as pd
+
+
+HASHED_COLUMNS = ['Close', 'High', 'Low', 'Volume']
+
+
+def indicator_cache_key(ticker: str, hist: pd.DataFrame, params: Dict[str, int]) -> str:
+    """
+    Stable key for a ticker's indicators.
+
+    A new bar changes the last bar timestamp and length; the data hash
+    also catches revised bars anywhere in the window.
+    """
+    data = np.ascontiguousarray(hist[HASHED_COLUMNS].to_numpy(dtype=np.float64))
+    last_bar = hist.index[-1].isoformat() if len(hist) else ''
+    payload = json.dumps([
+        ticker, last_bar, len(hist),
+        hashlib.sha256(data.tobytes()).hexdigest(),
+        sorted(params.items()),
+    ])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class IndicatorCache:
+    """
+    {key: indicators} store with LRU eviction and an optional disk tier.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 5000):
+        self.path = path
+        self.max_entries = max_entries
+        self.entries: 'OrderedDict[str, Dict[str, Any]]' = self._load()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached indicators for a key, or None"""
+        indicators = self.entries.get(key)
+        if indicators is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return dict(indicators)
+
+    def put(self, key: str, indicators: Dict[str, Any]) -> None:
+        """Store indicators (numpy scalars are converted to Python numbers)"""
+        self.entries[key] = {
+            name: value.item() if isinstance(value, np.generic) else value
+            for name, value in indicators.items()
+        }
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def save(self) -> None:
+        """Persist in LRU order (oldest first)"""
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.entries, f)
+        os.replace(tmp_path, self.path)
+
+    def _load(self) -> 'OrderedDict[str, Dict[str, Any]]':
+        if not self.path or not os.path.exists(self.path):
+            return OrderedDict()
+        try:
+            with open(self.path) as f:
+                return OrderedDict(json.load(f))
+        except (OSError, ValueError):
+            return OrderedDict()
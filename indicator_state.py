@@ -0,0 +1,313 @@
+"""
+Streaming Indicator State
+
+Incrementele technische indicatoren per ticker:
+- RSI, MACD/signal/hist, SMA20/50 en ATR in O(1) per nieuwe bar
+- Een herziene laatste bar (zelfde datum, nieuwe koers) vervangt de
+  vorige in plaats van dubbel te tellen
+- Persisteerbaar als JSON tussen runs (SETTINGS['indicator_state_path'])
+- Resultaten gelijk aan de batch functies in transformers.py
+"""
+
+import os
+import json
+import math
+from collections import deque
+from typing import Dict, Any, Optional
+
+import pandas as pd
+
+
+class _RollingMean:
+    """Fixed-size rolling mean with a running sum"""
+
+    __slots__ = ('window', 'values', 'total')
+
+    def __init__(self, window: int, values=None):
+        self.window = window
+        self.values = deque(values or [], maxlen=window)
+        self.total = math.fsum(self.values)
+
+    def push(self, value: float) -> None:
+        if len(self.values) == self.window:
+            self.total -= self.values[0]
+        self.values.append(value)
+        self.total += value
+
+    def replace_last(self, value: float) -> None:
+        """Overwrite the most recently pushed value"""
+        self.total += value - self.values[-1]
+        self.values[-1] = value
+
+    @property
+    def mean(self) -> Optional[float]:
+        if len(self.values) < self.window:
+            return None
+        return self.total / self.window
+
+
+class IndicatorState:
+    """
+    Incremental indicator state for a single ticker.
+
+    Holds the EMA values, rolling windows and the last close so that one
+    new bar updates all indicators in constant time. The close and EMAs
+    from before the last bar are kept as well, so a revised last bar
+    (intraday updates) is replaced in constant time too. Volatility rank
+    and the 52-week range need the full history and are not part of the
+    state.
+    """
+
+    def __init__(self, params: Dict[str, int]):
+        self.params = dict(params)
+        self.bars = 0
+        self.last_close: Optional[float] = None
+        self.last_volume: Optional[float] = None
+        self.last_date: Optional[str] = None
+        self.ema_fast: Optional[float] = None
+        self.ema_slow: Optional[float] = None
+        self.ema_signal: Optional[float] = None
+        # Stand van vóór de laatste bar, voor replace_last_bar
+        self.prev_close: Optional[float] = None
+        self.prev_ema_fast: Optional[float] = None
+        self.prev_ema_slow: Optional[float] = None
+        self.prev_ema_signal: Optional[float] = None
+        self.gains = _RollingMean(params['rsi_window'])
+        self.losses = _RollingMean(params['rsi_window'])
+        self.true_ranges = _RollingMean(params['atr_period'])
+        self.sma_short = _RollingMean(params['sma_short'])
+        self.sma_medium = _RollingMean(params['sma_medium'])
+
+    @classmethod
+    def from_history(cls, hist: pd.DataFrame, params: Dict[str, int]) -> 'IndicatorState':
+        """Seed a state by replaying a price history"""
+        state = cls(params)
+        state.catch_up(hist)
+        return state
+
+    def catch_up(self, hist: pd.DataFrame) -> int:
+        """
+        Apply all bars in hist that are newer than the last seen bar.
+
+        A bar on the last seen date replaces that bar (the day was still
+        trading when it was applied); older bars are skipped.
+
+        Returns:
+            Number of bars applied (a replaced last bar counts)
+        """
+        applied = 0
+        for date, row in zip(hist.index, hist[['Close', 'High', 'Low', 'Volume']].itertuples(index=False)):
+            date_str = pd.Timestamp(date).date().isoformat()
+            if self.last_date is not None and date_str < self.last_date:
+                continue
+            if date_str == self.last_date:
+                self.replace_last_bar(row.Close, row.High, row.Low, row.Volume, date_str)
+            else:
+                self.update(row.Close, row.High, row.Low, row.Volume, date_str)
+            applied += 1
+        return applied
+
+    def update(
+        self,
+        close: float,
+        high: float,
+        low: float,
+        volume: float = 0.0,
+        date: Optional[str] = None
+    ) -> None:
+        """Apply one new bar"""
+        self.prev_close = self.last_close
+        self.prev_ema_fast = self.ema_fast
+        self.prev_ema_slow = self.ema_slow
+        self.prev_ema_signal = self.ema_signal
+        self._apply(close, high, low, volume, date, replace=False)
+        self.bars += 1
+
+    def replace_last_bar(
+        self,
+        close: float,
+        high: float,
+        low: float,
+        volume: float = 0.0,
+        date: Optional[str] = None
+    ) -> None:
+        """Replace the most recent bar with a revised one"""
+        if self.bars == 0:
+            self.update(close, high, low, volume, date)
+            return
+        self._apply(close, high, low, volume, date, replace=True)
+
+    def _apply(
+        self,
+        close: float,
+        high: float,
+        low: float,
+        volume: float,
+        date: Optional[str],
+        replace: bool
+    ) -> None:
+        """Compute the last bar from the pre-last-bar state"""
+        close = float(close)
+        prev_close = self.prev_close
+
+        # RSI: eerste bar telt als 0 winst/verlies (zoals delta.where in batch)
+        delta = close - prev_close if prev_close is not None else 0.0
+        self._push(self.gains, delta if delta > 0 else 0.0, replace)
+        self._push(self.losses, -delta if delta < 0 else 0.0, replace)
+
+        # MACD (EWM met adjust=False)
+        self.ema_fast = _ema(self.prev_ema_fast, close, self.params['macd_fast'])
+        self.ema_slow = _ema(self.prev_ema_slow, close, self.params['macd_slow'])
+        self.ema_signal = _ema(self.prev_ema_signal, self.ema_fast - self.ema_slow, self.params['macd_signal'])
+
+        # ATR
+        true_range = float(high) - float(low)
+        if prev_close is not None:
+            true_range = max(true_range, abs(float(high) - prev_close), abs(float(low) - prev_close))
+        self._push(self.true_ranges, true_range, replace)
+
+        # SMAs
+        self._push(self.sma_short, close, replace)
+        self._push(self.sma_medium, close, replace)
+
+        self.last_close = close
+        self.last_volume = float(volume)
+        if date is not None:
+            self.last_date = date
+
+    @staticmethod
+    def _push(window: _RollingMean, value: float, replace: bool) -> None:
+        if replace:
+            window.replace_last(value)
+        else:
+            window.push(value)
+
+    def indicators(self) -> Dict[str, Optional[float]]:
+        """
+        Current indicator values.
+
+        Returns:
+            Dict with rsi, macd, macd_signal, macd_hist, sma_20, sma_50,
+            atr, atr_pct and volume (None/NaN where not yet defined)
+        """
+        if self.bars == 0:
+            return {}
+
+        gain = self.gains.mean
+        loss = self.losses.mean
+        if gain is None or loss is None:
+            rsi = float('nan')
+        elif loss == 0:
+            rsi = 100.0 if gain > 0 else float('nan')
+        else:
+            rsi = 100 - (100 / (1 + gain / loss))
+
+        macd = self.ema_fast - self.ema_slow
+        atr = self.true_ranges.mean
+        atr = float('nan') if atr is None else atr
+        sma_20 = self.sma_short.mean
+
+        return {
+            'rsi': rsi,
+            'macd': macd,
+            'macd_signal': self.ema_signal,
+            'macd_hist': macd - self.ema_signal,
+            'sma_20': float('nan') if sma_20 is None else sma_20,
+            'sma_50': self.sma_medium.mean,
+            'atr': atr,
+            'atr_pct': (atr / self.last_close) * 100,
+            'volume': self.last_volume,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize state for JSON storage"""
+        return {
+            'params': self.params,
+            'bars': self.bars,
+            'last_close': self.last_close,
+            'last_volume': self.last_volume,
+            'last_date': self.last_date,
+            'ema_fast': self.ema_fast,
+            'ema_slow': self.ema_slow,
+            'ema_signal': self.ema_signal,
+            'prev_close': self.prev_close,
+            'prev_ema_fast': self.prev_ema_fast,
+            'prev_ema_slow': self.prev_ema_slow,
+            'prev_ema_signal': self.prev_ema_signal,
+            'gains': list(self.gains.values),
+            'losses': list(self.losses.values),
+            'true_ranges': list(self.true_ranges.values),
+            'sma_short': list(self.sma_short.values),
+            'sma_medium': list(self.sma_medium.values),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'IndicatorState':
+        """Restore state from to_dict output"""
+        params = data['params']
+        state = cls(params)
+        state.bars = data['bars']
+        state.last_close = data['last_close']
+        state.last_volume = data['last_volume']
+        state.last_date = data['last_date']
+        state.ema_fast = data['ema_fast']
+        state.ema_slow = data['ema_slow']
+        state.ema_signal = data['ema_signal']
+        state.prev_close = data['prev_close']
+        state.prev_ema_fast = data['prev_ema_fast']
+        state.prev_ema_slow = data['prev_ema_slow']
+        state.prev_ema_signal = data['prev_ema_signal']
+        state.gains = _RollingMean(params['rsi_window'], data['gains'])
+        state.losses = _RollingMean(params['rsi_window'], data['losses'])
+        state.true_ranges = _RollingMean(params['atr_period'], data['true_ranges'])
+        state.sma_short = _RollingMean(params['sma_short'], data['sma_short'])
+        state.sma_medium = _RollingMean(params['sma_medium'], data['sma_medium'])
+        return state
+
+
+def load_indicator_states(path: str, params: Dict[str, int]) -> Dict[str, IndicatorState]:
+    """
+    Load persisted states; states built with other params are dropped.
+
+    Args:
+        path: JSON file written by save_indicator_states
+        params: Current technical analysis parameters
+
+    Returns:
+        Dict of {ticker: IndicatorState}
+    """
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path) as f:
+            raw = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return {
+        ticker: IndicatorState.from_dict(data)
+        for ticker, data in raw.items()
+        if data.get('params') == dict(params)
+    }
+
+
+def save_indicator_states(states: Dict[str, IndicatorState], path: str) -> None:
+    """Persist states as JSON"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({ticker: state.to_dict() for ticker, state in states.items()}, f)
+    os.replace(tmp_path, path)
+
+
+# =============================================================================
+# HELPER FUNCTIONS
+# =============================================================================
+
+def _ema(previous: Optional[float], value: float, span: int) -> float:
+    """One EWM step with adjust=False"""
+    if previous is None:
+        return value
+    alpha = 2 / (span + 1)
+    return previous + alpha * (value - previous)
@@ -0,0 +1,218 @@
+"""
+Text Matchers
+
+Multi-pattern tekst matching in lineaire tijd:
+- Aho-Corasick automaton met woordgrens regels
+- Ticker/bedrijfsnaam matcher voor nieuws-naar-ticker mapping
+"""
+
+import re
+import functools
+from collections import deque
+from typing import Dict, List, Tuple, Iterable, Optional
+
+from config import COMPANY_NAMES
+
+
+class AhoCorasick:
+    """
+    Aho-Corasick automaton over a fixed set of patterns.
+
+    Every pattern maps to a key (several patterns may share one key).
+    ``find`` scans a text once and returns all matches, restricted to
+    whole words unless ``whole_words`` is False.
+    """
+
+    def __init__(
+        self,
+        patterns: Iterable[Tuple[str, str]],
+        ignore_case: bool = False,
+        whole_words: bool = True
+    ):
+        self.ignore_case = ignore_case
+        self.whole_words = whole_words
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, str]]] = [[]]
+
+        for pattern, key in patterns:
+            if ignore_case:
+                pattern = pattern.lower()
+            if pattern:
+                self._add(pattern, key)
+        self._build_failure_links()
+
+    def find(self, text: str) -> List[Tuple[int, int, str]]:
+        """
+        Find all pattern occurrences.
+
+        Returns:
+            List of (start, end, key) tuples in text order
+        """
+        if self.ignore_case:
+            text = text.lower()
+
+        matches = []
+        state = 0
+        goto, fail, out = self._goto, self._fail, self._out
+        whole_words = self.whole_words
+        for i, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, key in out[state]:
+                start = i - length + 1
+                if not whole_words or _is_word_boundary(text, start, i + 1):
+                    matches.append((start, i + 1, key))
+        return matches
+
+    def _add(self, pattern: str, key: str) -> None:
+        state = 0
+        for char in pattern:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append((len(pattern), key))
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(char, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+
+# Tickers die ook gewone woorden/afkortingen zijn: alleen matchen met context
+# zoals $T, (T) of NYSE: T
+AMBIGUOUS_TICKERS = {
+    'ALL', 'AN', 'ARE', 'CAT', 'COST', 'DIS', 'HOOD', 'NET', 'NOW', 'ON',
+    'PATH', 'SNOW', 'TECH', 'LIN', 'SO', 'WELL',
+}
+
+CORPORATE_SUFFIXES = {
+    'inc', 'inc.', 'corp', 'corp.', 'corporation', 'co', 'co.', 'company',
+    'holdings', 'group', 'plc', 'sa', 'ag', 'se', 'ltd', 'ltd.', 'nv',
+    'n.v.', 'comm', 'pharma', 'global', 'platforms', 'technologies', 'motor',
+}
+
+_EXCHANGE_PREFIX = re.compile(r'(?:NYSE|NASDAQ|Nasdaq|AMEX|AMS|LSE|TSX)\s*:\s*$')
+
+
+class TickerMatcher:
+    """
+    Map free text to tickers via symbols and company names.
+
+    Rules:
+    - Symbols match case-sensitively as whole words. Symbols of one or two
+      letters and word-like symbols (AMBIGUOUS_TICKERS) need context: a
+      cashtag ($T), parentheses ((T)) or an exchange prefix (NYSE: T).
+    - Full company names match case-insensitively.
+    - Short names (corporate suffixes stripped, e.g. 'Apple') match
+      case-sensitively, so 'Target' matches but 'price target' does not.
+    """
+
+    def __init__(self, tickers: Iterable[str], company_names: Optional[Dict[str, str]] = None):
+        company_names = company_names if company_names is not None else COMPANY_NAMES
+        tickers = list(dict.fromkeys(tickers))
+
+        self._strict = {t for t in tickers if len(t) <= 2 or t in AMBIGUOUS_TICKERS}
+        symbol_patterns = [(t, t) for t in tickers]
+        name_patterns = []
+        alias_patterns = []
+        for ticker in tickers:
+            name = company_names.get(ticker)
+            if not name:
+                continue
+            name_patterns.append((name, ticker))
+            alias = _short_name(name)
+            if alias and alias != name and len(alias) >= 3:
+                alias_patterns.append((alias, ticker))
+                if alias.isupper():
+                    # 'NVIDIA' staat in koppen vaak als 'Nvidia'
+                    alias_patterns.append((alias.title(), ticker))
+
+        self._symbols = AhoCorasick(symbol_patterns)
+        self._names = AhoCorasick(name_patterns, ignore_case=True)
+        self._aliases = AhoCorasick(alias_patterns)
+
+    def match(self, text: str) -> List[str]:
+        """
+        Tickers mentioned in a text, in order of first mention.
+        """
+        if not text:
+            return []
+
+        hits = []
+        for start, end, ticker in self._symbols.find(text):
+            if ticker in self._strict and not _has_symbol_context(text, start, end):
+                continue
+            hits.append((start, ticker))
+        hits.extend((start, ticker) for start, _, ticker in self._names.find(text))
+        hits.extend((start, ticker) for start, _, ticker in self._aliases.find(text))
+
+        hits.sort()
+        return list(dict.fromkeys(ticker for _, ticker in hits))
+
+    def match_articles(self, articles: List[Dict]) -> Dict[str, List[str]]:
+        """
+        Scan each article once (title + summary).
+
+        Returns:
+            Dict of {ticker: [titles]} in article order
+        """
+        ticker_titles: Dict[str, List[str]] = {}
+        for article in articles:
+            title = article.get('title', '')
+            text = f"{title}\n{article.get('summary', '')}"
+            for ticker in self.match(text):
+                titles = ticker_titles.setdefault(ticker, [])
+                if title not in titles:
+                    titles.append(title)
+        return ticker_titles
+
+
+@functools.lru_cache(maxsize=8)
+def get_ticker_matcher(tickers: Tuple[str, ...]) -> TickerMatcher:
+    """Compiled TickerMatcher for a ticker universe (built once per universe)"""
+    return TickerMatcher(tickers)
+
+
+# =============================================================================
+# HELPER FUNCTIONS
+# =============================================================================
+
+def _is_word_boundary(text: str, start: int, end: int) -> bool:
+    """True if text[start:end] is not part of a larger word"""
+    before = text[start - 1] if start > 0 else ''
+    after = text[end] if end < len(text) else ''
+    return not (before.isalnum() or after.isalnum())
+
+
+def _has_symbol_context(text: str, start: int, end: int) -> bool:
+    """True if a symbol is written as $T, (T) or with an exchange prefix"""
+    before = text[start - 1] if start > 0 else ''
+    after = text[end] if end < len(text) else ''
+    if before == '$':
+        return True
+    if before == '(' and after == ')':
+        return True
+    return bool(_EXCHANGE_PREFIX.search(text[max(0, start - 12):start]))
+
+
+def _short_name(name: str) -> str:
+    """Strip trailing corporate suffixes: 'Apple Inc' -> 'Apple'"""
+    words = name.split()
+    while len(words) > 1 and words[-1].lower() in CORPORATE_SUFFIXES:
+        words.pop()
+    short = " ".join(words)
+    return short[:-4] if short.lower().endswith('.com') else short
@@ -0,0 +1,157 @@
+"""
+Output Writer
+
+Gedeelde writer voor gegenereerde bestanden (HTML/JSON):
+- Content hash (sha256) vergeleken met een manifest
+- Alleen schrijven als de inhoud veranderd is, atomisch via tmp + rename
+- Telt geschreven en overgeslagen bestanden
+"""
+
+import os
+import json
+import hashlib
+import threading
+from typing import Dict, Any, Iterable, Optional, Union
+
+from config import SETTINGS
+
+
+class OutputWriter:
+    """
+    Skip-unchanged file writer.
+
+    The manifest maps paths to {'sha256', 'size', 'mtime_ns'}. When the
+    file on disk still matches the recorded size and mtime, the hash in
+    the manifest is trusted; otherwise (fresh checkout, manual edit, no
+    manifest) the file on disk is hashed before deciding. Safe to use from
+    multiple threads.
+    """
+
+    def __init__(self, manifest_path: Optional[str] = None):
+        self.manifest_path = manifest_path
+        self.manifest: Dict[str, Dict[str, Any]] = self._load()
+        self.written = 0
+        self.skipped = 0
+        self._lock = threading.Lock()
+
+    def write(self, path: str, content: Union[str, bytes]) -> bool:
+        """
+        Write content to path if it differs from what is there.
+
+        Returns:
+            True if the file was written, False if skipped
+        """
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        digest = hashlib.sha256(data).hexdigest()
+
+        if self._current_digest(path) == digest:
+            with self._lock:
+                self.skipped += 1
+            return False
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        stat = os.stat(path)
+        with self._lock:
+            self.manifest[path] = {'sha256': digest, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+            self.written += 1
+        return True
+
+    def write_chunks(self, path: str, chunks: Iterable[str]) -> bool:
+        """
+        Stream rendered chunks into a tmp file while hashing, then keep it
+        only if the content changed. The document is never held in memory.
+
+        Returns:
+            True if the file was written, False if skipped
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        digest = hashlib.sha256()
+        try:
+            with open(tmp_path, 'wb') as f:
+                for chunk in chunks:
+                    data = chunk.encode('utf-8')
+                    digest.update(data)
+                    f.write(data)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+        if self._current_digest(path) == digest.hexdigest():
+            os.remove(tmp_path)
+            with self._lock:
+                self.skipped += 1
+            return False
+
+        os.replace(tmp_path, path)
+        stat = os.stat(path)
+        with self._lock:
+            self.manifest[path] = {'sha256': digest.hexdigest(), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+            self.written += 1
+        return True
+
+    def write_json(self, path: str, data: Any, **dump_kwargs) -> bool:
+        """Serialize data with json.dumps(**dump_kwargs) and write it"""
+        return self.write(path, json.dumps(data, **dump_kwargs))
+
+    def summary(self) -> str:
+        return f"{self.written} geschreven, {self.skipped} ongewijzigd"
+
+    def save(self) -> None:
+        """Persist the manifest"""
+        if not self.manifest_path:
+            return
+        directory = os.path.dirname(self.manifest_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.manifest_path + '.tmp'
+        with self._lock:
+            with open(tmp_path, 'w') as f:
+                json.dump(self.manifest, f, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _current_digest(self, path: str) -> Optional[str]:
+        """Hash of the file currently at path (None if missing)"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        entry = self.manifest.get(path)
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return entry['sha256']
+
+        with open(path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        with self._lock:
+            self.manifest[path] = {'sha256': digest, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+        return digest
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not self.manifest_path or not os.path.exists(self.manifest_path):
+            return {}
+        try:
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+
+_default_writer: Optional[OutputWriter] = None
+
+
+def get_output_writer() -> OutputWriter:
+    """Process-wide writer used when a loader is called without one"""
+    global _default_writer
+    if _default_writer is None:
+        _default_writer = OutputWriter(SETTINGS.get('output_manifest'))
+    return _default_writer
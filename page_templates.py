@@ -0,0 +1,473 @@
+"""
+Page Templates
+
+Alle HTML templates van de site, gecompileerd bij import (zie templating.py).
+Velden gebruiken str.format syntax; letterlijke accolades in CSS/JS zijn
+{{ en }}. Logica (klassen, tekens, emoji) staat in loaders.py en
+ticker_pages.py, de templates bevatten alleen opmaak.
+"""
+
+from templating import Template
+
+
+# =============================================================================
+# INDEX.HTML
+# =============================================================================
+
+INDEX_PAGE = Template("""<!DOCTYPE html>
+<html lang="nl">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Beurs Cowboy | Markt Analyse | {date_display}</title>
+    <link rel="stylesheet" href="assets/styles.css">
+    <link rel="stylesheet" href="{assets[market.css]}">
+</head>
+<body>
+    <!-- Header en navigatie -->
+    <header class="site-header">
+        <div class="header-container">
+            <div class="logo">
+                <a href="index.html" class="logo-link">
+                    <span class="logo-icon">🤠</span>
+                    <span class="logo-text">Beurs<span class="highlight">Cowboy</span></span>
+                </a>
+            </div>
+            <nav class="main-nav">
+                <a href="index.html" class="active">Markten</a>
+                <a href="analysis.html">Analyse</a>
+                <a href="watchlist.html">Watchlist</a>
+                <a href="archive.html">Archief</a>
+            </nav>
+        </div>
+    </header>
+
+    <!-- LICHTKRANT / TICKER TAPE -->
+    {ticker_tape}
+
+    <main class="main-content">
+        <section class="content-section">
+            <div class="section-header">
+                <h1>Markt Analyse</h1>
+                <p class="section-subtitle">{date_display} - {result_count} aandelen geanalyseerd</p>
+            </div>
+
+            <!-- Macro Sentiment -->
+            {macro_section}
+
+            <!-- Trending -->
+            {trending_section}
+
+            <!-- Top Picks -->
+            <div class="top-picks-section">
+                <h2 class="section-title">Top Analyses</h2>
+                <div class="analysis-grid">
+                    {analysis_cards}
+                </div>
+            </div>
+
+            <!-- Complete Market Table - ALLE AANDELEN -->
+            <div class="market-table-section">
+                <h2 class="section-title">Complete Markt ({result_count} aandelen)</h2>
+                <div class="table-filters">
+                    <button class="filter-btn active" data-filter="all">Alle</button>
+                    <button class="filter-btn" data-filter="buy">Koop</button>
+                    <button class="filter-btn" data-filter="neutral">Neutraal</button>
+                    <button class="filter-btn" data-filter="sell">Verkoop</button>
+                </div>
+                <div class="table-container">
+                    <table class="market-table" data-src="{market_data_src}">
+                        <thead>
+                            <tr>
+                                <th data-key="rank">#</th>
+                                <th data-key="ticker">Aandeel</th>
+                                <th data-key="sector">Sector</th>
+                                <th data-key="price">Prijs</th>
+                                <th data-key="change_pct">Verandering</th>
+                                <th data-key="volume">Volume</th>
+                                <th data-key="rsi">RSI</th>
+                                <th data-key="signal">Signal</th>
+                                <th data-key="setup_score">Setup Score</th>
+                                <th data-key="potential_upside">Potentieel</th>
+                            </tr>
+                        </thead>
+                        <tbody>
+                            {market_rows}
+                        </tbody>
+                    </table>
+                </div>
+            </div>
+        </section>
+    </main>
+
+    <footer class="site-footer">
+        <div class="footer-container">
+            <div class="footer-content">
+                <div class="footer-section">
+                    <h4>🤠 Beurs Cowboy</h4>
+                    <p>Dagelijkse beursanalyse met een westelijk tintje.</p>
+                </div>
+                <div class="footer-section">
+                    <h4>Disclaimer</h4>
+                    <p>Dit is geen financieel advies.</p>
+                </div>
+            </div>
+        </div>
+    </footer>
+
+    <script src="assets/main.js"></script>
+</body>
+</html>""", 'index_page', streams=('market_rows',))
+
+TICKER_TAPE = Template("""
+    <div class="ticker-tape-container">
+        <div class="ticker-tape">
+            {tape_items_doubled}
+        </div>
+    </div>""", 'ticker_tape')
+
+TAPE_ITEM = Template("""
+        <div class="ticker-tape-item {change_class}">
+            <span class="tape-ticker">{r[ticker]}</span>
+            <span class="tape-price">€{r[price]:.2f}</span>
+            <span class="tape-change {change_class}">{change_sign}{r[change_pct]:.1f}%</span>
+            <span class="tape-signal">{signal_emoji}</span>
+        </div>""", 'tape_item')
+
+MARKET_ROW = Template("""
+        <tr class="stock-row" data-signal="{signal_class}">
+            <td class="rank">{i}</td>
+            <td class="ticker">
+                <a href="ticker/{r[ticker]}.html" class="ticker-link">
+                    <strong>{r[ticker]}</strong>{trending_badge}
+                </a>
+                <br><small>{r[name]}</small>
+            </td>
+            <td class="sector">{r[sector]}</td>
+            <td class="price">€{r[price]:.2f}</td>
+            <td class="change {change_class}">{change_sign}{r[change_pct]:.2f}%</td>
+            <td class="volume">{r[volume]:,}</td>
+            <td class="rsi">{r[rsi]:.1f}</td>
+            <td class="signal {signal_class}">{r[signal]}</td>
+            <td class="score">{r[setup_score]:.1f}</td>
+            <td class="upside">+{r[potential_upside]:.1f}%</td>
+        </tr>""", 'market_row')
+
+ANALYSIS_CARD = Template("""
+        <article class="analysis-card {card_class}">
+            <header>
+                <span class="ticker-badge">{pick[ticker]}</span>
+                <span class="signal-badge {pick[signal_class]}">{pick[signal]}</span>
+            </header>
+            <h3>{pick[name]}</h3>
+            <div class="price-block">
+                <span class="price">€{pick[price]:.2f}</span>
+                <span class="upside">Potentieel: +{pick[potential_upside]:.1f}%</span>
+            </div>
+            <ul class="reasons">
+                {reasons}
+            </ul>
+            <a href="article/{date_str}.html#{pick[ticker]}" class="read-more">Lees analyse →</a>
+        </article>""", 'analysis_card')
+
+ANALYSIS_REASON = Template("""<li>✓ {reason}</li>""", 'analysis_reason')
+
+MACRO_SECTION = Template("""
+    <section class="macro-section">
+        <h2>🌍 Macro-economisch Sentiment</h2>
+        <p class="section-subtitle">Wereldwijd economisch sentiment per regio</p>
+        <div class="macro-grid">
+            {rows}
+        </div>
+    </section>""", 'macro_section')
+
+REGION_ITEM = Template("""
+        <div class="region-item">
+            <div class="region-header">
+                <span class="region-name">{emoji} {region}</span>
+                <span class="region-sentiment" style="color: {score_color}">
+                    {data[sentiment]} ({data[score]:+.2f})
+                </span>
+            </div>
+            <div class="region-stats">
+                <span class="stat">{data[articles_count]} artikelen</span>
+                <span class="stat">🟢 {positive}</span>
+                <span class="stat">🔴 {negative}</span>
+            </div>
+        </div>""", 'region_item')
+
+TRENDING_SECTION = Template("""
+    <section class="trending-section">
+        <h2>💬 Trending op Social Media</h2>
+        <p class="section-subtitle">Meest besproken aandelen vandaag</p>
+        <div class="trending-grid">
+            {rows}
+        </div>
+    </section>""", 'trending_section')
+
+TRENDING_ITEM = Template("""
+        <div class="trending-item">
+            <span class="trending-ticker">{t[ticker]}</span>
+            <span class="trending-social">💬 {wl_count:,} volgers</span>
+            <span class="trending-price">€{t[price]:.2f}</span>
+            <span class="trending-change {change_class}">
+                {change_sign}{t[change_pct]:.1f}%
+            </span>
+        </div>""", 'trending_item')
+
+# =============================================================================
+# TICKER PAGINA'S (TICKER/<TICKER>.HTML)
+# =============================================================================
+
+TICKER_PAGE = Template("""<!DOCTYPE html>
+<html lang="nl">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{ticker} - {name} | Beurs Cowboy</title>
+    <link rel="stylesheet" href="../assets/styles.css">
+    <link rel="stylesheet" href="{css_href}">
+</head>
+<body>
+    <!-- Header -->
+    <header class="site-header">
+        <div class="header-container">
+            <div class="logo">
+                <a href="../index.html" class="logo-link">
+                    <span class="logo-icon">🤠</span>
+                    <span class="logo-text">Beurs<span class="highlight">Cowboy</span></span>
+                </a>
+            </div>
+            <nav class="main-nav">
+                <a href="../index.html">Markten</a>
+                <a href="../analysis.html">Analyse</a>
+                <a href="../watchlist.html">Watchlist</a>
+                <a href="../archive.html">Archief</a>
+            </nav>
+        </div>
+    </header>
+
+    <main class="main-content">
+        <section class="content-section">
+            <!-- Back Link -->
+            <a href="../index.html#complete-markt" class="back-link">
+                ← Terug naar overzicht
+            </a>
+
+            <!-- Ticker Header -->
+            <div class="ticker-header">
+                <div class="ticker-title">
+                    <div>
+                        <h1 class="ticker-symbol">{ticker}</h1>
+                        <p class="ticker-name">{name}</p>
+                        <span class="ticker-sector">{sector}</span>
+                    </div>
+                    <div class="ticker-signal">
+                        <span class="signal-badge {r[signal_class]}">{r[signal]}</span>
+                    </div>
+                </div>
+                <div class="ticker-price-block">
+                    <div class="price-large">€{r[price]:.2f}</div>
+                    <div class="price-change {change_class}">
+                        {change_sign}{r[change_pct]:.2f}%
+                    </div>
+                </div>
+            </div>
+
+            <!-- Two Column Layout -->
+            <div class="ticker-grid">
+                <!-- Left Column: Chart & News -->
+                <div class="ticker-main">
+                    <!-- TradingView Chart -->
+                    <div class="card">
+                        <h3>📈 TradingView Chart</h3>
+                        <div id="tradingview_chart" style="height: 500px;"></div>
+                    </div>
+
+                    <!-- Recent News -->
+                    <div class="card">
+                        <h3>📰 Recent Nieuws</h3>
+                        <div class="news-list" id="news-container">
+                            <p class="loading">Nieuws laden...</p>
+                        </div>
+                    </div>
+                </div>
+
+                <!-- Right Column: Metrics & Analysis -->
+                <div class="ticker-sidebar">
+                    <!-- Key Metrics -->
+                    <div class="card">
+                        <h3>📊 Key Metrics</h3>
+                        <div class="metrics-grid">
+                            <div class="metric">
+                                <span class="metric-label">RSI (14)</span>
+                                <span class="metric-value {rsi_class}">{r[rsi]:.1f}</span>
+                            </div>
+                            <div class="metric">
+                                <span class="metric-label">MACD</span>
+                                <span class="metric-value {macd_class}">{r[macd]:.4f}</span>
+                            </div>
+                            <div class="metric">
+                                <span class="metric-label">MACD Hist</span>
+                                <span class="metric-value {macd_hist_class}">{r[macd_hist]:.4f}</span>
+                            </div>
+                            <div class="metric">
+                                <span class="metric-label">SMA 20</span>
+                                <span class="metric-value">€{r[sma_20]:.2f}</span>
+                            </div>
+                            <div class="metric">
+                                <span class="metric-label">SMA 50</span>
+                                <span class="metric-value">€{r[sma_50]:.2f}</span>
+                            </div>
+                            <div class="metric">
+                                <span class="metric-label">52W Hoog</span>
+                                <span class="metric-value">€{r[high_52w]:.2f}</span>
+                            </div>
+                            <div class="metric">
+                                <span class="metric-label">52W Laag</span>
+                                <span class="metric-value">€{r[low_52w]:.2f}</span>
+                            </div>
+                            <div class="metric">
+                                <span class="metric-label">Volume</span>
+                                <span class="metric-value">{r[volume]:,}</span>
+                            </div>
+                            <div class="metric">
+                                <span class="metric-label">ATR</span>
+                                <span class="metric-value">{r[atr_pct]:.1f}%</span>
+                            </div>
+                            <div class="metric">
+                                <span class="metric-label">Vol Rank</span>
+                                <span class="metric-value">{r[vol_rank]:.0f}</span>
+                            </div>
+                        </div>
+                    </div>
+
+                    <!-- Analysis -->
+                    <div class="card">
+                        <h3>🎯 Analyse</h3>
+                        <div class="analysis-section">
+                            <div class="analysis-row">
+                                <span class="analysis-label">Setup Type:</span>
+                                <span class="analysis-value">{r[setup_type]}</span>
+                            </div>
+                            <div class="analysis-row">
+                                <span class="analysis-label">Setup Score:</span>
+                                <span class="analysis-value score {score_class}">{r[setup_score]:.1f}</span>
+                            </div>
+                            <div class="analysis-row">
+                                <span class="analysis-label">Potentieel:</span>
+                                <span class="analysis-value upside">+{r[potential_upside]:.1f}%</span>
+                            </div>
+                            <div class="analysis-row">
+                                <span class="analysis-label">Sentiment:</span>
+                                <span class="analysis-value">{r[sentiment_summary]}</span>
+                            </div>
+                            <div class="analysis-row">
+                                <span class="analysis-label">Sentiment Score:</span>
+                                <span class="analysis-value {sentiment_class}">{r[sentiment_score]:.2f}</span>
+                            </div>
+                            {trending_row}
+                        </div>
+                    </div>
+
+                    <!-- Setup Reasons -->
+                    <div class="card">
+                        <h3>✓ Redenen</h3>
+                        <ul class="reasons-list">
+                            {reasons}
+                        </ul>
+                    </div>
+
+                    <!-- Quick Stats -->
+                    <div class="card">
+                        <h3>📈 Positie t.o.v. SMA's</h3>
+                        <div class="sma-position">
+                            {sma_20_position}
+                            {sma_50_position}
+                        </div>
+                    </div>
+                </div>
+            </div>
+        </section>
+    </main>
+
+    <!-- Footer -->
+    <footer class="site-footer">
+        <div class="footer-container">
+            <div class="footer-content">
+                <div class="footer-section">
+                    <h4>🤠 Beurs Cowboy</h4>
+                    <p>Dagelijkse beursanalyse met een westelijk tintje.</p>
+                </div>
+                <div class="footer-section">
+                    <h4>Disclaimer</h4>
+                    <p>Dit is geen financieel advies.</p>
+                </div>
+            </div>
+        </div>
+    </footer>
+
+    <!-- TradingView Widget -->
+    <script type="text/javascript" src="https://s3.tradingview.com/tv.js"></script>
+    <script type="text/javascript">
+        new TradingView.widget({{
+            "width": "100%",
+            "height": 500,
+            "symbol": "{ticker}",
+            "interval": "D",
+            "timezone": "Europe/Amsterdam",
+            "theme": "dark",
+            "style": "1",
+            "locale": "nl",
+            "toolbar_bg": "#f1f3f6",
+            "enable_publishing": false,
+            "allow_symbol_change": true,
+            "container_id": "tradingview_chart",
+            "hide_side_toolbar": false,
+            "studies": [
+                "RSI@tv-basicstudies",
+                "MACD@tv-basicstudies",
+                "Moving Average@tv-basicstudies"
+            ]
+        }});
+        
+        // Fetch news dynamically
+        fetch(`https://query1.finance.yahoo.com/v1/test/getnews?category=general&template=bullet&lang=en-US&region=US&symbol={ticker}`)
+            .then(response => response.json())
+            .then(data => {{
+                const container = document.getElementById('news-container');
+                if (data && data.items && data.items.length > 0) {{
+                    container.innerHTML = data.items.slice(0, 5).map(item => `
+                        <div class="news-item">
+                            <a href="${{item.link}}" target="_blank" class="news-title">${{item.title}}</a>
+                            <div class="news-meta">
+                                <span class="news-source">${{item.publisher}}</span>
+                                <span class="news-time">${{new Date(item.providerPublishTime * 1000).toLocaleDateString('nl-NL')}}</span>
+                            </div>
+                        </div>
+                    `).join('');
+                }} else {{
+                    container.innerHTML = '<p class="no-news">Geen recent nieuws gevonden</p>';
+                }}
+            }})
+            .catch(err => {{
+                document.getElementById('news-container').innerHTML = '<p class="error">Nieuws niet beschikbaar</p>';
+            }});
+    </script>
+
+    <script src="../assets/main.js"></script>
+</body>
+</html>""", 'ticker_page')
+
+TRENDING_ROW = Template("""
+                            <div class="analysis-row">
+                                <span class="analysis-label">🔥 Trending:</span>
+                                <span class="analysis-value">{watchlist:,} volgers</span>
+                            </div>
+                            """, 'trending_row')
+
+REASON_ITEM = Template("""<li>{reason}</li>""", 'reason_item')
+
+SMA_ABOVE = Template("""<div class="position-above">Boven {label} (+{pct:.1f}%)</div>""", 'sma_above')
+
+SMA_BELOW = Template("""<div class="position-below">Onder {label} ({pct:.1f}%)</div>""", 'sma_below')
@@ -0,0 +1,217 @@
+"""
+Price Cache
+
+Persistente, incrementele OHLCV opslag per ticker:
+- Eén CSV bestand per ticker (append-only, klein in git diffs)
+- Alleen ontbrekende bars worden opgehaald
+- Herhaalde runs op dezelfde dag raken het netwerk niet
+- Splits en dividenden (aangepaste historie) geven een volledige
+  herdownload in plaats van een merge
+"""
+
+import os
+import json
+import datetime
+import pandas as pd
+from typing import Dict, List, Callable, Optional
+
+
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+# Relatief verschil in Close op een al opgeslagen bar dat als aanpassing telt
+ADJUSTMENT_TOLERANCE = 1e-4
+
+
+class PriceCache:
+    """
+    On-disk OHLCV store with incremental updates.
+
+    Each ticker is stored as ``<cache_dir>/<ticker>.csv``. A small
+    ``_meta.json`` records the date each ticker was last refreshed so a
+    second run on the same day is served entirely from disk.
+    """
+
+    META_FILE = '_meta.json'
+
+    def __init__(self, cache_dir: str, max_bars: int = 400):
+        self.cache_dir = cache_dir
+        self.max_bars = max_bars
+        os.makedirs(cache_dir, exist_ok=True)
+        self._meta = self._load_meta()
+
+    def load(self, ticker: str) -> Optional[pd.DataFrame]:
+        """Load cached bars for a ticker, or None if not cached"""
+        path = self._path(ticker)
+        if not os.path.exists(path):
+            return None
+        try:
+            hist = pd.read_csv(path, index_col=0, parse_dates=True)
+        except Exception:
+            return None
+        return hist if not hist.empty else None
+
+    def save(self, ticker: str, hist: pd.DataFrame) -> None:
+        """Write bars for a ticker (trimmed to max_bars)"""
+        hist = hist.tail(self.max_bars)
+        tmp_path = self._path(ticker) + '.tmp'
+        hist.to_csv(tmp_path, index_label='Date', float_format='%.6f')
+        os.replace(tmp_path, self._path(ticker))
+
+    def refresh(
+        self,
+        tickers: List[str],
+        fetch: Callable[..., Dict[str, pd.DataFrame]],
+        period: str = "1y",
+        today: Optional[datetime.date] = None
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Bring the cache up to date and return per-ticker history.
+
+        Args:
+            tickers: List of ticker symbols
+            fetch: Callable(tickers, period=..., start=...) returning
+                {ticker: OHLCV DataFrame} for the requested range
+            period: History window returned per ticker (yfinance notation)
+            today: Reference date (defaults to today)
+
+        Returns:
+            Dict of {ticker: OHLCV DataFrame} covering ``period``
+        """
+        today = today or datetime.date.today()
+        today_str = today.isoformat()
+
+        cached = {ticker: self.load(ticker) for ticker in tickers}
+
+        # Groepeer tickers per startdatum zodat één request per groep volstaat
+        missing = []
+        by_start: Dict[str, List[str]] = {}
+        for ticker, hist in cached.items():
+            if hist is None:
+                missing.append(ticker)
+            elif self._meta.get(ticker) != today_str:
+                # Laatste bar opnieuw ophalen: kan een onvolledige dag zijn.
+                # De bar ervoor is afgesloten en dient als controle op
+                # aanpassingen (split/dividend) van de historie.
+                start = hist.index[-min(len(hist), 2)].date().isoformat()
+                by_start.setdefault(start, []).append(ticker)
+
+        updates: Dict[str, pd.DataFrame] = {}
+        if missing:
+            updates.update(fetch(missing, period=period))
+        for start, group in by_start.items():
+            updates.update(fetch(group, start=start))
+
+        # Aangepaste historie: niet mergen maar de hele periode opnieuw halen
+        adjusted = [
+            ticker for group in by_start.values() for ticker in group
+            if ticker in updates and _is_adjusted(cached[ticker], updates[ticker])
+        ]
+        if adjusted:
+            print(f"  ⚠️ Aangepaste historie (split/dividend): {', '.join(adjusted)}")
+            refetched = fetch(adjusted, period=period)
+            for ticker in adjusted:
+                updates.pop(ticker, None)
+                cached[ticker] = None
+            updates.update(refetched)
+
+        fetched = 0
+        for ticker, new_bars in updates.items():
+            if new_bars.empty:
+                continue
+            merged = merge_bars(cached.get(ticker), new_bars)
+            cached[ticker] = merged
+            self.save(ticker, merged)
+            fetched += 1
+
+        for ticker in set(missing) | {t for group in by_start.values() for t in group}:
+            if ticker in updates:
+                self._meta[ticker] = today_str
+        self._save_meta()
+
+        skipped = len(tickers) - len(missing) - sum(len(g) for g in by_start.values())
+        print(f"  ✓ Prijs cache: {fetched} bijgewerkt, {skipped} uit cache, {len(missing)} nieuw")
+
+        cutoff = pd.Timestamp(today) - _period_to_offset(period)
+        return {
+            ticker: hist[hist.index >= cutoff]
+            for ticker, hist in cached.items()
+            if hist is not None and not hist.empty
+        }
+
+    def _path(self, ticker: str) -> str:
+        return os.path.join(self.cache_dir, f"{ticker}.csv")
+
+    def _load_meta(self) -> Dict[str, str]:
+        path = os.path.join(self.cache_dir, self.META_FILE)
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_meta(self) -> None:
+        path = os.path.join(self.cache_dir, self.META_FILE)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self._meta, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+
+
+def merge_bars(old: Optional[pd.DataFrame], new: pd.DataFrame) -> pd.DataFrame:
+    """
+    Append new bars to old ones; overlapping dates take the new values.
+
+    Args:
+        old: Existing bars (or None)
+        new: Freshly fetched bars
+
+    Returns:
+        Combined OHLCV DataFrame on a tz-naive daily index
+    """
+    new = normalize_bars(new)
+    if old is None or old.empty or new.empty:
+        return new if not new.empty else old
+    old = normalize_bars(old)
+    return pd.concat([old[old.index < new.index[0]], new])
+
+
+def normalize_bars(hist: pd.DataFrame) -> pd.DataFrame:
+    """Keep OHLCV columns on a tz-naive daily index"""
+    hist = hist[[c for c in OHLCV_COLUMNS if c in hist.columns]]
+    index = pd.DatetimeIndex(hist.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    hist = hist.set_axis(index.normalize(), axis=0)
+    hist = hist[~hist.index.duplicated(keep='last')]
+    return hist.sort_index()
+
+
+# =============================================================================
+# HELPER FUNCTIONS
+# =============================================================================
+
+def _is_adjusted(old: pd.DataFrame, new: pd.DataFrame) -> bool:
+    """True when a re-fetched, already stored bar has a different Close"""
+    new = normalize_bars(new)
+    old = normalize_bars(old)
+    # Alleen afgesloten bars vergelijken: de laatste opgeslagen bar kan een onvolledige dag zijn
+    overlap = old.index[:-1].intersection(new.index)
+    if overlap.empty:
+        return False
+    stored = old.loc[overlap[0], 'Close']
+    fresh = new.loc[overlap[0], 'Close']
+    if pd.isna(stored) or pd.isna(fresh) or stored == 0:
+        return False
+    return abs(fresh / stored - 1) > ADJUSTMENT_TOLERANCE
+
+
+def _period_to_offset(period: str) -> pd.DateOffset:
+    """Convert a yfinance period string ('1y', '6mo', '30d') to an offset"""
+    if period.endswith('mo'):
+        return pd.DateOffset(months=int(period[:-2]))
+    if period.endswith('y'):
+        return pd.DateOffset(years=int(period[:-1]))
+    if period.endswith('d'):
+        return pd.DateOffset(days=int(period[:-1]))
+    return pd.DateOffset(years=1)
@@ -0,0 +1,174 @@
+"""
+Async RSS Fetcher
+
+Haalt alle RSS feeds gelijktijdig op via asyncio:
+- Eén gedeelde connection pool (aiohttp)
+- Harde deadline per feed
+- Conditional GET (ETag / Last-Modified) zodat ongewijzigde feeds
+  als goedkope 304 terugkomen en uit de lokale cache worden geserveerd
+"""
+
+import os
+import json
+import time
+import asyncio
+from typing import Dict, Any, Optional
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+
+def fetch_feed_bodies(
+    feeds: Dict[str, str],
+    timeout: float = 10.0,
+    max_connections: int = 20,
+    cache_dir: Optional[str] = None,
+    timeouts: Optional[Dict[str, float]] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch raw feed bodies concurrently.
+
+    Args:
+        feeds: Dict of {source: url}
+        timeout: Hard per-feed deadline in seconds
+        max_connections: Size of the shared connection pool
+        cache_dir: Optional directory for bodies and ETag/Last-Modified
+        timeouts: Optional per-source deadline overrides
+
+    Returns:
+        Dict of {source: {'body', 'status', 'error', 'elapsed', 'not_modified'}}
+    """
+    if not AIOHTTP_AVAILABLE:
+        raise RuntimeError("aiohttp niet geïnstalleerd")
+
+    cache = FeedCache(cache_dir) if cache_dir else None
+    results = asyncio.run(
+        _fetch_all(feeds, timeout, max_connections, cache, timeouts or {})
+    )
+    if cache:
+        cache.save_index()
+    return results
+
+
+class FeedCache:
+    """
+    On-disk store for feed bodies and their HTTP validators.
+    """
+
+    INDEX_FILE = '_index.json'
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self.index = self._load_index()
+
+    def validators(self, source: str, url: str) -> Dict[str, str]:
+        """Conditional request headers for a source"""
+        entry = self.index.get(source)
+        if not entry or entry.get('url') != url or not os.path.exists(self._path(source)):
+            return {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def load_body(self, source: str) -> Optional[bytes]:
+        try:
+            with open(self._path(source), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def store(self, source: str, url: str, body: bytes, headers) -> None:
+        with open(self._path(source), 'wb') as f:
+            f.write(body)
+        self.index[source] = {
+            'url': url,
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+        }
+
+    def save_index(self) -> None:
+        with open(os.path.join(self.cache_dir, self.INDEX_FILE), 'w') as f:
+            json.dump(self.index, f, indent=2, sort_keys=True)
+
+    def _path(self, source: str) -> str:
+        return os.path.join(self.cache_dir, f"{source}.xml")
+
+    def _load_index(self) -> Dict[str, Dict]:
+        path = os.path.join(self.cache_dir, self.INDEX_FILE)
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+
+# =============================================================================
+# PRIVATE HELPER FUNCTIONS
+# =============================================================================
+
+async def _fetch_all(
+    feeds: Dict[str, str],
+    timeout: float,
+    max_connections: int,
+    cache: Optional[FeedCache],
+    timeouts: Dict[str, float]
+) -> Dict[str, Dict[str, Any]]:
+    """Fetch all feeds over one shared session"""
+    connector = aiohttp.TCPConnector(limit=max_connections, ttl_dns_cache=300)
+    async with aiohttp.ClientSession(
+        connector=connector,
+        headers={'User-Agent': USER_AGENT}
+    ) as session:
+        tasks = [
+            _fetch_one(session, source, url, timeouts.get(source, timeout), cache)
+            for source, url in feeds.items()
+        ]
+        results = await asyncio.gather(*tasks)
+    return dict(zip(feeds.keys(), results))
+
+
+async def _fetch_one(
+    session: 'aiohttp.ClientSession',
+    source: str,
+    url: str,
+    timeout: float,
+    cache: Optional[FeedCache]
+) -> Dict[str, Any]:
+    """Fetch a single feed within its deadline"""
+    headers = cache.validators(source, url) if cache else {}
+    started = time.monotonic()
+    result = {'body': None, 'status': None, 'error': None, 'elapsed': None, 'not_modified': False}
+
+    try:
+        async with asyncio.timeout(timeout):
+            async with session.get(url, headers=headers) as response:
+                result['status'] = response.status
+                if response.status == 304 and cache:
+                    result['body'] = cache.load_body(source)
+                    result['not_modified'] = True
+                elif response.status == 200:
+                    body = await response.read()
+                    result['body'] = body
+                    if cache:
+                        cache.store(source, url, body, response.headers)
+                else:
+                    result['error'] = f"HTTP {response.status}"
+    except asyncio.TimeoutError:
+        result['error'] = f"Timeout na {timeout:.0f}s"
+    except Exception as e:
+        result['error'] = str(e) or e.__class__.__name__
+
+    result['elapsed'] = time.monotonic() - started
+    return result
@@ -0,0 +1,107 @@
+"""
+Sentiment Cache
+
+Content-addressed cache voor LLM sentiment resultaten:
+- Sleutel = hash van (model, prompt versie, ticker, genormaliseerde headlines)
+- TTL per entry en begrensde grootte (least recently used eruit)
+- Alleen tickers met nieuwe headlines gaan naar de LLM
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+from typing import Dict, List, Any, Optional
+
+
+def sentiment_cache_key(
+    model: str,
+    prompt_version: int,
+    ticker: str,
+    headlines: List[str]
+) -> str:
+    """
+    Stable key for a ticker's headline set.
+
+    Headlines are lower-cased, whitespace-collapsed, de-duplicated and
+    sorted, so re-ordered or re-spaced headlines hit the same entry.
+    """
+    normalized = sorted({re.sub(r'\s+', ' ', h).strip().lower() for h in headlines if h})
+    payload = json.dumps([model, prompt_version, ticker, normalized], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class SentimentCache:
+    """
+    Persistent {key: sentiment} store with TTL and LRU eviction.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl_hours: float = 72,
+        max_entries: int = 5000
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_hours * 3600
+        self.max_entries = max_entries
+        self.entries: Dict[str, Dict[str, Any]] = self._load()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Cached sentiment for a key, or None if missing/expired"""
+        now = now or time.time()
+        entry = self.entries.get(key)
+        if entry is None or now - entry['created'] > self.ttl_seconds:
+            self.entries.pop(key, None)
+            self.misses += 1
+            return None
+        entry['accessed'] = now
+        self.hits += 1
+        return dict(entry['value'])
+
+    def put(self, key: str, value: Dict[str, Any], now: Optional[float] = None) -> None:
+        """Store a sentiment (score, summary, catalyst)"""
+        now = now or time.time()
+        self.entries[key] = {
+            'value': {k: value[k] for k in ('score', 'summary', 'catalyst') if k in value},
+            'created': now,
+            'accessed': now,
+        }
+        self._evict()
+
+    def save(self) -> None:
+        """Drop expired entries and persist"""
+        if not self.path:
+            return
+        now = time.time()
+        self.entries = {
+            k: e for k, e in self.entries.items()
+            if now - e['created'] <= self.ttl_seconds
+        }
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.entries, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def _evict(self) -> None:
+        overflow = len(self.entries) - self.max_entries
+        if overflow <= 0:
+            return
+        oldest = sorted(self.entries, key=lambda k: self.entries[k]['accessed'])[:overflow]
+        for key in oldest:
+            del self.entries[key]
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
@@ -0,0 +1,70 @@
+"""
+Site Assets
+
+Build stap voor gedeelde CSS/JS:
+- Bronbestanden in static/ worden naar docs/assets/ gekopieerd met een
+  content hash in de naam (ticker.3f2a9c1b.css), zodat browsers ze lang
+  kunnen cachen en een nieuwe versie automatisch een nieuwe URL krijgt
+- Oude fingerprints van hetzelfde asset worden opgeruimd, net als
+  fingerprints van assets die niet meer in ASSET_FILES staan
+"""
+
+import os
+import glob
+import hashlib
+from typing import Dict, Optional
+
+from output_writer import OutputWriter, get_output_writer
+
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+ASSET_FILES = ('market.css', 'ticker.css')
+
+
+def build_assets(
+    output_dir: str,
+    writer: Optional[OutputWriter] = None,
+    static_dir: str = STATIC_DIR
+) -> Dict[str, str]:
+    """
+    Publish fingerprinted assets.
+
+    Args:
+        output_dir: Site output directory (assets go to output_dir/assets)
+        writer: Output writer (unchanged assets are not rewritten)
+        static_dir: Directory with the source assets
+
+    Returns:
+        Dict of {source name: path relative to output_dir},
+        e.g. {'ticker.css': 'assets/ticker.3f2a9c1b.css'}
+    """
+    writer = writer or get_output_writer()
+    asset_dir = os.path.join(output_dir, 'assets')
+
+    paths = {}
+    for name in ASSET_FILES:
+        with open(os.path.join(static_dir, name), 'rb') as f:
+            content = f.read()
+        stem, ext = os.path.splitext(name)
+        fingerprinted = f"{stem}.{hashlib.sha256(content).hexdigest()[:8]}{ext}"
+        target = os.path.join(asset_dir, fingerprinted)
+        writer.write(target, content)
+
+        for stale in glob.glob(os.path.join(asset_dir, f"{stem}.*{ext}")):
+            if os.path.basename(stale) != fingerprinted and _is_fingerprint(stale, stem, ext):
+                os.remove(stale)
+
+        paths[name] = f"assets/{fingerprinted}"
+
+    # Verwijderde assets (bijv. market.js) niet in de gepubliceerde site laten staan
+    for path in glob.glob(os.path.join(asset_dir, '*.*.*')):
+        stem, middle, ext = os.path.basename(path).rsplit('.', 2)
+        if f"{stem}.{ext}" not in ASSET_FILES and _is_fingerprint(path, stem, f".{ext}"):
+            os.remove(path)
+    return paths
+
+
+def _is_fingerprint(path: str, stem: str, ext: str) -> bool:
+    """True for '<stem>.<8 hex chars><ext>'"""
+    middle = os.path.basename(path)[len(stem) + 1:-len(ext)]
+    return len(middle) == 8 and all(c in '0123456789abcdef' for c in middle)
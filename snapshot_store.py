@@ -0,0 +1,292 @@
+"""
+Snapshot Store
+
+Kolomgewijze historie van de dagelijkse snapshots:
+- Eén binair bestand per veld (<veld>.bin), elke dag is een row group
+  die achteraan wordt toegevoegd (tickers × velden per datum)
+- index.json houdt datums, offsets, tickers en labels van categorische
+  velden bij; tickers worden alleen toegevoegd, dus kolom j is altijd
+  dezelfde ticker
+- Lezen gaat via np.memmap: 1, 30 of 365 dagen setup_score/rsi laden
+  raakt alleen de gevraagde row groups
+"""
+
+import os
+import json
+import glob
+from typing import Dict, List, Any, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+
+# Numerieke velden en hun dtype op disk (volume/watchlist passen niet exact in float32)
+NUMERIC_FIELDS = {
+    'price': 'float32',
+    'change_pct': 'float32',
+    'rsi': 'float32',
+    'macd': 'float32',
+    'macd_hist': 'float32',
+    'sma_20': 'float32',
+    'sma_50': 'float32',
+    'atr_pct': 'float32',
+    'vol_rank': 'float32',
+    'setup_score': 'float32',
+    'potential_upside': 'float32',
+    'sentiment_score': 'float32',
+    'high_52w': 'float32',
+    'low_52w': 'float32',
+    'volume': 'float64',
+    'stocktwits_watchlist': 'float64',
+    'is_trending': 'int8',
+}
+# Categorische velden: int16 codes in een labellijst (-1 = ontbreekt)
+CATEGORICAL_FIELDS = ('signal', 'signal_class', 'setup_type', 'sector')
+
+
+class SnapshotStore:
+    """
+    Append-only columnar store of daily snapshots.
+
+    Row group i (dates[i]) covers elements offsets[i]:offsets[i + 1] of
+    every field file, one element per ticker known on that day. Saving
+    the same day again (reruns, continuous mode) replaces the last row
+    group; earlier days are immutable.
+    """
+
+    INDEX_FILE = 'index.json'
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        index = self._load_index()
+        self.dates: List[str] = index['dates']
+        self.offsets: List[int] = index['offsets']
+        self.tickers: List[str] = index['tickers']
+        self.labels: Dict[str, List[str]] = index['labels']
+        self._ticker_ids = {t: j for j, t in enumerate(self.tickers)}
+        self._maps: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def append(self, date_str: str, snapshot_data: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Add one day as a row group.
+
+        Args:
+            date_str: Snapshot date (YYYY-MM-DD), not before the last stored day
+            snapshot_data: Dict of {ticker: result dict}
+        """
+        if self.dates and date_str < self.dates[-1]:
+            raise ValueError(f"snapshot {date_str} ligt voor de laatste dag ({self.dates[-1]})")
+        if self.dates and date_str == self.dates[-1]:
+            self.dates.pop()
+            self.offsets.pop()
+
+        for ticker in snapshot_data:
+            if ticker not in self._ticker_ids:
+                self._ticker_ids[ticker] = len(self.tickers)
+                self.tickers.append(ticker)
+
+        start = self.offsets[-1]
+        count = len(self.tickers)
+        ids = np.fromiter((self._ticker_ids[t] for t in snapshot_data), dtype=np.int64, count=len(snapshot_data))
+        rows = list(snapshot_data.values())
+
+        self._maps.clear()
+        for field, dtype in self._fields().items():
+            column = np.full(count, _missing(dtype), dtype=dtype)
+            if field in CATEGORICAL_FIELDS:
+                column[ids] = [self._code(field, r.get(field)) for r in rows]
+            else:
+                column[ids] = [_number(r.get(field), dtype) for r in rows]
+            self._write_group(field, dtype, start, column)
+
+        self.dates.append(date_str)
+        self.offsets.append(start + count)
+        self._save_index()
+
+    def load(
+        self,
+        fields: Iterable[str],
+        days: Optional[int] = None,
+        start: Optional[str] = None,
+        tickers: Optional[List[str]] = None
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Read fields as dates × tickers frames.
+
+        Args:
+            fields: Field names (numeric or categorical)
+            days: Only the last N stored days
+            start: Only days on or after this date (YYYY-MM-DD)
+            tickers: Column subset (default: every ticker ever stored)
+
+        Returns:
+            Dict of {field: DataFrame}; missing values are NaN (numeric)
+            or None (categorical)
+        """
+        first = 0
+        if start is not None:
+            first = int(np.searchsorted(np.array(self.dates), start))
+        if days is not None:
+            first = max(first, len(self.dates) - days)
+        dates = self.dates[first:]
+
+        columns = list(self.tickers) if tickers is None else list(tickers)
+        ids = np.array([self._ticker_ids.get(t, -1) for t in columns], dtype=np.int64)
+        known = ids >= 0
+        index = pd.DatetimeIndex(pd.to_datetime(dates), name='Date')
+
+        frames = {}
+        for field in fields:
+            dtype = self._fields().get(field)
+            if dtype is None:
+                raise KeyError(f"onbekend snapshot veld: {field}")
+            data = self._map(field, dtype)
+            values = np.full((len(dates), len(columns)), np.nan)
+            for i, day in enumerate(range(first, len(self.dates))):
+                group = data[self.offsets[day]:self.offsets[day + 1]]
+                present = known & (ids < len(group))
+                values[i, present] = group[ids[present]]
+
+            if field in CATEGORICAL_FIELDS:
+                labels = np.array(self.labels.get(field, []) + [None], dtype=object)
+                codes = np.where(np.isnan(values), -1, values).astype(np.int64)
+                frames[field] = pd.DataFrame(labels[codes], index=index, columns=columns)
+            else:
+                if dtype == 'int8':
+                    values[values == _missing(dtype)] = np.nan
+                frames[field] = pd.DataFrame(values, index=index, columns=columns)
+        return frames
+
+    def load_day(self, date_str: str) -> Dict[str, Dict[str, Any]]:
+        """One stored day back as {ticker: {field: value}} (columnar fields only)"""
+        if date_str not in self.dates:
+            raise KeyError(f"geen snapshot voor {date_str}")
+        day = self.dates.index(date_str)
+        frames = self.load(self._fields(), start=date_str, days=len(self.dates) - day)
+        day_frames = {field: frame.iloc[0] for field, frame in frames.items()}
+
+        snapshot = {}
+        for ticker in self.tickers:
+            record = {field: values[ticker] for field, values in day_frames.items()}
+            if all(v is None or v != v for v in record.values()):
+                continue
+            snapshot[ticker] = {
+                field: (None if v is None or v != v else v.item() if hasattr(v, 'item') else v)
+                for field, v in record.items()
+            }
+            snapshot[ticker]['is_trending'] = bool(snapshot[ticker]['is_trending'])
+        return snapshot
+
+    def _fields(self) -> Dict[str, str]:
+        fields = dict(NUMERIC_FIELDS)
+        fields.update({field: 'int16' for field in CATEGORICAL_FIELDS})
+        return fields
+
+    def _code(self, field: str, value: Optional[str]) -> int:
+        if value is None:
+            return -1
+        labels = self.labels.setdefault(field, [])
+        if value not in labels:
+            labels.append(value)
+        return labels.index(value)
+
+    def _write_group(self, field: str, dtype: str, start: int, column: np.ndarray) -> None:
+        """Write a row group at element offset ``start``, dropping anything after it"""
+        path = self._path(field)
+        itemsize = np.dtype(dtype).itemsize
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        with open(path, 'r+b' if size else 'wb') as f:
+            if size > start * itemsize:
+                # Oudere row group van dezelfde dag of een afgebroken write
+                f.truncate(start * itemsize)
+            elif size < start * itemsize:
+                # Veld bestond nog niet toen eerdere dagen werden opgeslagen
+                f.seek(size)
+                f.write(np.full(start - size // itemsize, _missing(dtype), dtype=dtype).tobytes())
+            f.seek(start * itemsize)
+            f.write(column.astype(dtype).tobytes())
+
+    def _map(self, field: str, dtype: str) -> np.ndarray:
+        """Read-only memory map of a field file (empty array if not written yet)"""
+        if field not in self._maps:
+            path = self._path(field)
+            count = self.offsets[-1]
+            if count and os.path.exists(path) and os.path.getsize(path) >= count * np.dtype(dtype).itemsize:
+                self._maps[field] = np.memmap(path, dtype=dtype, mode='r', shape=(count,))
+            else:
+                self._maps[field] = np.full(count, _missing(dtype), dtype=dtype)
+        return self._maps[field]
+
+    def _path(self, field: str) -> str:
+        return os.path.join(self.root, f"{field}.bin")
+
+    def _load_index(self) -> Dict[str, Any]:
+        path = os.path.join(self.root, self.INDEX_FILE)
+        index = {'dates': [], 'offsets': [0], 'tickers': [], 'labels': {}}
+        if os.path.exists(path):
+            try:
+                with open(path) as f:
+                    index.update(json.load(f))
+            except (OSError, ValueError):
+                pass
+        return index
+
+    def _save_index(self) -> None:
+        """Index last: a crash mid-append leaves the previous index valid"""
+        index = {
+            'dates': self.dates,
+            'offsets': self.offsets,
+            'tickers': self.tickers,
+            'labels': self.labels,
+        }
+        path = os.path.join(self.root, self.INDEX_FILE)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(index, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+def import_json_snapshots(store: SnapshotStore, data_dir: str) -> int:
+    """
+    Backfill the store from snap_YYYY-MM-DD.json files newer than its last day.
+
+    Returns:
+        Number of days imported
+    """
+    imported = 0
+    for path in sorted(glob.glob(os.path.join(data_dir, 'snap_*.json'))):
+        date_str = os.path.basename(path)[len('snap_'):-len('.json')]
+        if store.dates and date_str <= store.dates[-1]:
+            continue
+        try:
+            with open(path) as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            continue
+        store.append(date_str, snapshot)
+        imported += 1
+    return imported
+
+
+# =============================================================================
+# HELPER FUNCTIONS
+# =============================================================================
+
+def _missing(dtype: str):
+    """Fill value for absent tickers/fields"""
+    return np.nan if np.dtype(dtype).kind == 'f' else -1
+
+
+def _number(value: Any, dtype: str):
+    if value is None:
+        return _missing(dtype)
+    if isinstance(value, bool):
+        return int(value)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return _missing(dtype)
@@ -5,23 +5,33 @@ Beurs Cowboy - Main Application
 ETL Pipeline: Extract → Transform → Load/Analyze
 """
 
+import time
 import logging
+import argparse
 from datetime import datetime, date
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Set
+
+import pandas as pd
 
 from config import (
     SENTIMENT_KEYWORDS, MACRO_KEYWORDS, RSS_FEEDS, REGIONAL_FEEDS,
-    TECHNICAL_PARAMS, SCORING_WEIGHTS, TICKERS, COMPANY_NAMES, SECTORS,
-    SETTINGS
+    TECHNICAL_PARAMS, TICKERS, SETTINGS
 )
 from extractors import (
     fetch_rss_news, fetch_stocktwits_trending, fetch_ticker_data,
-    get_all_tickers
-)
-from transformers import (
-    calculate_technical_indicators, calculate_setup_score,
-    calculate_potential_upside, get_trade_setup_type, get_signal
+    get_all_tickers, get_discovery_candidates, fetch_price_history,
+    build_ticker_headlines, fetch_ticker_news
 )
+from price_cache import merge_bars, normalize_bars
+from transformers import calculate_range_indicators
+from feed_health import FeedHealthTracker
+from sentiment_cache import SentimentCache
+from indicator_cache import IndicatorCache, indicator_cache_key
+from indicator_state import IndicatorState, load_indicator_states, save_indicator_states
+from output_writer import OutputWriter
+from snapshot_store import SnapshotStore, import_json_snapshots
+from ticker_transform import pack_ticker, transform_tickers
+from ticker_result import TickerResult
 from analyzers import (
     analyze_sentiment_batch, analyze_regional_sentiment,
     get_keyword_sentiment
@@ -49,10 +59,45 @@ class MarketAnalyzer:
     def __init__(self):
         self.output_dir = SETTINGS['output_dir']
         self.data_dir = SETTINGS['data_dir']
-        self.results: List[Dict[str, Any]] = []
-        self.snapshot_data: Dict[str, Any] = {}
+        self.results: List[TickerResult] = []
+        self.snapshot_data: Dict[str, TickerResult] = {}
         self.regional_sentiment: Dict[str, Any] = {}
         
+        # In-memory state, hergebruikt tussen cycles in continuous mode
+        self.ticker_data: Dict[str, Any] = {}
+        self.ticker_headlines: Dict[str, List[str]] = {}
+        self.sentiments: Dict[str, Any] = {}
+        self.trending_symbols: Dict[str, int] = {}
+        self.indicator_states: Dict[str, IndicatorState] = self._load_indicator_states()
+        self.feed_health = FeedHealthTracker(SETTINGS['feed_health_path'])
+        self.sentiment_cache = SentimentCache(
+            SETTINGS['llm_cache_path'],
+            ttl_hours=SETTINGS['llm_cache_ttl_hours'],
+            max_entries=SETTINGS['llm_cache_max_entries']
+        )
+        self.indicator_cache = IndicatorCache(
+            SETTINGS['indicator_cache_path'],
+            max_entries=SETTINGS['indicator_cache_max_entries']
+        )
+        self.writer = OutputWriter(SETTINGS['output_manifest'])
+        self.snapshot_store = self._open_snapshot_store()
+        
+    def _load_indicator_states(self) -> Dict[str, IndicatorState]:
+        """Streaming indicator state of the previous run (other params = rebuilt)"""
+        path = SETTINGS['indicator_state_path']
+        return load_indicator_states(path, TECHNICAL_PARAMS) if path else {}
+        
+    def _open_snapshot_store(self) -> Optional[SnapshotStore]:
+        """Open the columnar history, backfilled from JSON snapshots on first use"""
+        if not SETTINGS['snapshot_store_dir']:
+            return None
+        store = SnapshotStore(SETTINGS['snapshot_store_dir'])
+        if not len(store):
+            imported = import_json_snapshots(store, self.data_dir)
+            if imported:
+                logger.info(f"  Snapshot historie: {imported} dagen geïmporteerd uit JSON")
+        return store
+        
     def run(self) -> None:
         """Execute complete ETL pipeline"""
         today = date.today()
@@ -64,8 +109,8 @@ class MarketAnalyzer:
         # EXTRACT: Verzamel ruwe data
         logger.info("\n📥 EXTRACT PHASE")
         market_news, regional_news = self._extract_news()  # Fetch news FIRST
-        ticker_data, ticker_headlines = self._extract_ticker_data(market_news)  # Pass news
-        trending_symbols = self._extract_social_sentiment()
+        self.ticker_data, self.ticker_headlines = self._extract_ticker_data(market_news)  # Pass news
+        self.trending_symbols = self._extract_social_sentiment()
         
         # TRANSFORM: Verwerk en verrijk data
         logger.info("\n🔄 TRANSFORM PHASE")
@@ -73,12 +118,12 @@ class MarketAnalyzer:
         
         # ANALYZE: Sentiment analyse
         logger.info("\n🤖 ANALYZE PHASE")
-        sentiments = self._analyze_sentiments(ticker_headlines)
+        self.sentiments = self._analyze_sentiments(self.ticker_headlines)
         
         # LOAD: Verwerk resultaten en genereer output
         logger.info("\n📊 LOAD PHASE")
         self._load_analysis_results(
-            ticker_data, sentiments, trending_symbols
+            self.ticker_data, self.sentiments, self.trending_symbols
         )
         
         # GENERATE: Creëer output bestanden
@@ -87,24 +132,113 @@ class MarketAnalyzer:
         
         logger.info(f"\n✅ Analysis complete - Output in {self.output_dir}/")
     
+    def run_continuous(self, max_cycles: Optional[int] = None) -> None:
+        """
+        Long-running mode: refresh prices, RSS and StockTwits on their own
+        intervals and recompute/re-render only the tickers that changed.
+        
+        Args:
+            max_cycles: Stop after this many refresh cycles (None = forever)
+        """
+        self.run()
+        
+        intervals = {
+            'prices': SETTINGS['live_price_interval'],
+            'news': SETTINGS['live_news_interval'],
+            'social': SETTINGS['live_social_interval'],
+        }
+        refreshers = {
+            'prices': self._refresh_prices,
+            'news': self._refresh_news,
+            'social': self._refresh_social,
+        }
+        start = time.monotonic()
+        next_due = {name: start + interval for name, interval in intervals.items()}
+        
+        cycles = 0
+        while max_cycles is None or cycles < max_cycles:
+            wait = min(next_due.values()) - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            
+            now = time.monotonic()
+            due = [name for name, t in next_due.items() if t <= now]
+            logger.info(f"\n🔁 LIVE CYCLE {cycles + 1}: {', '.join(due)}")
+            
+            for name in due:
+                next_due[name] = now + intervals[name]
+            try:
+                self._run_live_cycle(due, refreshers)
+            except Exception as e:
+                # Een mislukte cycle mag het proces niet stoppen
+                logger.error(f"  Live cycle {cycles + 1} failed: {e}")
+            
+            cycles += 1
+    
+    def _run_live_cycle(self, due: List[str], refreshers: Dict[str, Any]) -> None:
+        """Live: Draai de refreshers die aan de beurt zijn en render wat wijzigde"""
+        changed = set()
+        index_dirty = False
+        for name in due:
+            try:
+                changed |= refreshers[name]()
+            except Exception as e:
+                logger.error(f"  Refresh {name} failed: {e}")
+            index_dirty = index_dirty or name == 'news'
+        
+        if changed:
+            self._load_analysis_results(
+                {t: self.ticker_data[t] for t in changed if t in self.ticker_data},
+                self.sentiments, self.trending_symbols
+            )
+        if changed or index_dirty:
+            self._generate_live_outputs(changed)
+    
     def _extract_ticker_data(self, market_news: List[Dict] = None) -> Tuple[Dict, Dict]:
         """Extract: Haal ticker data en headlines op"""
         logger.info("  Fetching ticker data...")
         
-        # Get all tickers (base + discovered)
-        tickers = get_all_tickers()
+        # Haal base + discovery kandidaten in één keer op
+        candidates = list(dict.fromkeys(TICKERS)) + get_discovery_candidates()
+        ticker_data, ticker_headlines = fetch_ticker_data(
+            candidates,
+            SETTINGS['max_headlines_per_ticker'],
+            market_news,
+            batch=SETTINGS['batch_download'],
+            batch_size=SETTINGS['price_batch_size'],
+            workers=SETTINGS['parallel_workers'],
+            cache_dir=SETTINGS['price_cache_dir']
+        )
+        
+        # Valideer discovery tickers op de al opgehaalde bars
+        tickers = get_all_tickers(
+            histories={t: d['hist'] for t, d in ticker_data.items()},
+            workers=SETTINGS['parallel_workers'],
+            cache_path=SETTINGS['validation_cache']
+        )
         logger.info(f"  Analyzing {len(tickers)} tickers (base: {len(TICKERS)}, discovered: {len(tickers) - len(TICKERS)})")
         
-        return fetch_ticker_data(tickers, SETTINGS['max_headlines_per_ticker'], market_news)
+        ticker_data = {t: ticker_data[t] for t in tickers if t in ticker_data}
+        ticker_headlines = {t: ticker_headlines[t] for t in tickers if t in ticker_headlines}
+        return ticker_data, ticker_headlines
     
     def _extract_news(self) -> Tuple[List[Dict], Dict[str, List[Dict]]]:
         """Extract: Haal RSS nieuws op"""
         logger.info("  Fetching RSS news...")
-        return fetch_rss_news(
+        news = fetch_rss_news(
             max_age_hours=SETTINGS['max_age_hours'],
             feed_limit=SETTINGS['rss_feed_limit'],
-            workers=SETTINGS['parallel_workers']
+            workers=SETTINGS['parallel_workers'],
+            timeout=SETTINGS['rss_timeout'],
+            max_connections=SETTINGS['rss_max_connections'],
+            cache_dir=SETTINGS['rss_cache_dir'],
+            health=self.feed_health
         )
+        self.feed_health.save()
+        
+        logger.info("  Feed succesrate per regio:\n" + self.feed_health.format_regional_table(REGIONAL_FEEDS))
+        
+        return news
     
     def _extract_social_sentiment(self) -> Dict[str, Any]:
         """Extract: Haal social media sentiment op"""
@@ -126,7 +260,11 @@ class MarketAnalyzer:
     
     def _analyze_sentiments(self, ticker_headlines: Dict) -> Dict:
         """Analyze: Batch sentiment analyse"""
-        return analyze_sentiment_batch(ticker_headlines, SENTIMENT_KEYWORDS)
+        sentiments = analyze_sentiment_batch(
+            ticker_headlines, SENTIMENT_KEYWORDS, cache=self.sentiment_cache
+        )
+        self.sentiment_cache.save()
+        return sentiments
     
     def _load_analysis_results(
         self,
@@ -135,131 +273,183 @@ class MarketAnalyzer:
         trending_symbols: Dict
     ) -> None:
         """Load: Verwerk alle data naar eindresultaten"""
-        logger.info("  Processing analysis results...")
+        logger.info(f"  Processing analysis results ({len(ticker_data)} tickers)...")
         
+        # Gecachte indicatoren meegeven; de rest wordt per partitie berekend
+        keys = {}
+        items = []
         for ticker, data in ticker_data.items():
             try:
-                result = self._process_single_ticker(
-                    ticker, data, sentiments, trending_symbols
-                )
-                if result:
-                    self.results.append(result)
-                    self.snapshot_data[ticker] = result
-                    
-                    # Log signal
-                    signal = result['signal']
-                    emoji = "🟢" if "Koop" in signal else "🔴" if "Verkoop" in signal else "⚪"
-                    logger.debug(f"  {emoji} {ticker}: {signal}")
-                    
+                keys[ticker] = indicator_cache_key(ticker, data['hist'], TECHNICAL_PARAMS)
+                items.append(pack_ticker(
+                    ticker, data, sentiments, trending_symbols,
+                    self.indicator_cache.get(keys[ticker])
+                ))
             except Exception as e:
                 logger.error(f"  Error processing {ticker}: {e}")
+        cached = sum(item.indicators is not None for item in items)
+        logger.info(f"  Indicators: {cached} uit cache, {len(items) - cached} berekend")
+        
+        for outcome in transform_tickers(items):
+            ticker = outcome.ticker
+            if outcome.indicators is not None:
+                self.indicator_cache.put(keys[ticker], outcome.indicators)
+            if outcome.error is not None:
+                logger.error(f"  Error processing {ticker}: {outcome.error}")
                 continue
+            
+            result = outcome.result
+            self.snapshot_data[ticker] = result
+            
+            # Log signal
+            signal = result['signal']
+            emoji = "🟢" if "Koop" in signal else "🔴" if "Verkoop" in signal else "⚪"
+            logger.debug(f"  {emoji} {ticker}: {signal}")
+        self.indicator_cache.save()
         
         # Sorteer op setup_score
-        self.results.sort(key=lambda x: x['setup_score'], reverse=True)
+        self.results = sorted(
+            self.snapshot_data.values(), key=lambda x: x['setup_score'], reverse=True
+        )
     
-    def _process_single_ticker(
-        self,
-        ticker: str,
-        data: Dict,
-        sentiments: Dict,
-        trending_symbols: Dict
-    ) -> Optional[Dict[str, Any]]:
-        """Proces single ticker naar resultaat"""
-        hist = data['hist']
-        current_price = data['current_price']
-        avg_price = data['avg_price']
-        
-        # Bereken technische indicatoren
-        indicators = calculate_technical_indicators(hist, TECHNICAL_PARAMS)
-        
-        # Haal sentiment op
-        sentiment = sentiments.get(
-            ticker,
-            {"score": 0.0, "summary": "Geen nieuws", "catalyst": "Geen"}
+    def _refresh_prices(self) -> Set[str]:
+        """Live: Haal de laatste bars op en merge ze in de in-memory historie"""
+        logger.info("  Refreshing prices...")
+        latest = fetch_price_history(
+            list(self.ticker_data),
+            period="5d",
+            batch_size=SETTINGS['price_batch_size']
         )
         
-        # Voeg StockTwits bonus toe
-        if ticker in trending_symbols:
-            watchlist_count = trending_symbols[ticker]
-            bonus = min(
-                watchlist_count / 1_000_000 * SCORING_WEIGHTS['stocktwits_max_bonus'],
-                SCORING_WEIGHTS['stocktwits_max_bonus']
+        changed = set()
+        for ticker, bars in latest.items():
+            data = self.ticker_data.get(ticker)
+            if data is None or bars.empty:
+                continue
+            # Beide kanten op een tz-naive daily index, zoals merge_bars
+            hist = normalize_bars(data['hist'])
+            merged = merge_bars(hist, bars).tail(len(hist))
+            if merged[['Close', 'Volume']].iloc[-1].equals(hist[['Close', 'Volume']].iloc[-1]) \
+                    and merged.index[-1] == hist.index[-1]:
+                continue
+            data['hist'] = merged
+            data['current_price'] = merged['Close'].iloc[-1]
+            data['avg_price'] = merged['Close'].mean()
+            changed.add(ticker)
+            # Incrementele indicatoren; _load_analysis_results vindt ze in de cache
+            try:
+                self.indicator_cache.put(
+                    indicator_cache_key(ticker, merged, TECHNICAL_PARAMS),
+                    self._stream_indicators(ticker, merged)
+                )
+            except Exception as e:
+                logger.warning(f"  Streaming indicators {ticker} failed: {e}")
+        
+        if changed and SETTINGS['indicator_state_path']:
+            save_indicator_states(
+                {t: s for t, s in self.indicator_states.items() if t in self.ticker_data},
+                SETTINGS['indicator_state_path']
             )
-            sentiment['score'] += bonus
-            sentiment['stocktwits_watchlist'] = watchlist_count
-            sentiment['is_trending'] = True
+        
+        logger.info(f"  {len(changed)} tickers met nieuwe prijzen")
+        return changed
+    
+    def _stream_indicators(self, ticker: str, hist: pd.DataFrame) -> Dict[str, Any]:
+        """Live: Indicatoren via IndicatorState (O(1) per nieuwe of herziene bar)"""
+        state = self.indicator_states.get(ticker)
+        if state is not None and state.last_date is not None:
+            # Herziene oudere bars (bijv. aangepaste historie): opnieuw opbouwen
+            dates = hist.index.strftime('%Y-%m-%d')
+            position = dates.searchsorted(state.last_date)
+            if position == 0 or position > len(dates) - 1 or dates[position] != state.last_date \
+                    or hist['Close'].iloc[position - 1] != state.prev_close:
+                state = None
+        if state is None:
+            state = IndicatorState.from_history(hist, TECHNICAL_PARAMS)
+            self.indicator_states[ticker] = state
         else:
-            sentiment['stocktwits_watchlist'] = None
-            sentiment['is_trending'] = False
+            state.catch_up(hist)
+        return {**state.indicators(), **calculate_range_indicators(hist, TECHNICAL_PARAMS)}
+    
+    def _refresh_news(self) -> Set[str]:
+        """Live: Ververs RSS en Yahoo nieuws en sentiment voor gewijzigde headlines"""
+        market_news, regional_news = self._extract_news()
+        self.regional_sentiment = self._transform_regional_sentiment(regional_news)
+        
+        ticker_news = fetch_ticker_news(list(self.ticker_data), workers=SETTINGS['parallel_workers'])
+        for ticker, news in ticker_news.items():
+            # Lege lijst = mislukte of lege fetch: vorige nieuws behouden
+            if news:
+                self.ticker_data[ticker]['news'] = news
         
-        # Bereken setup score
-        setup_score, setup_reasons = calculate_setup_score(
-            indicators, current_price, avg_price, SCORING_WEIGHTS
+        headlines = build_ticker_headlines(
+            {t: d['news'] for t, d in self.ticker_data.items()},
+            SETTINGS['max_headlines_per_ticker'],
+            market_news
         )
+        changed = {t for t, h in headlines.items() if h != self.ticker_headlines.get(t)}
+        if changed:
+            self.sentiments.update(self._analyze_sentiments({t: headlines[t] for t in changed}))
+        self.ticker_headlines.update(headlines)
         
-        # Totale score
-        total_score = setup_score + (sentiment['score'] * SCORING_WEIGHTS['sentiment_multiplier'])
-        
-        # Bepaal setup type en signaal
-        setup_type = get_trade_setup_type(indicators, current_price)
-        potential_upside = calculate_potential_upside(indicators, current_price)
-        signal, signal_class = get_signal(total_score, potential_upside)
-        
-        # Prijs verandering
-        prev_close = hist['Close'].iloc[-2] if len(hist) > 1 else current_price
-        price_change = ((current_price - prev_close) / prev_close) * 100
-        
-        return {
-            "ticker": ticker,
-            "name": COMPANY_NAMES.get(ticker, ticker),
-            "sector": SECTORS.get(ticker, 'Overig'),
-            "price": round(current_price, 2),
-            "change": round(price_change, 2),
-            "change_pct": round(price_change, 2),
-            "rsi": round(indicators['rsi'], 1),
-            "macd": round(indicators['macd'], 4),
-            "macd_hist": round(indicators['macd_hist'], 4),
-            "sma_20": round(indicators['sma_20'], 2),
-            "sma_50": round(indicators['sma_50'], 2) if indicators['sma_50'] else None,
-            "atr_pct": round(indicators['atr_pct'], 1),
-            "vol_rank": round(indicators['vol_rank'], 0),
-            "setup_score": round(total_score, 1),
-            "setup_reasons": setup_reasons,
-            "setup_type": setup_type,
-            "potential_upside": round(potential_upside, 1),
-            "sentiment_score": round(sentiment['score'], 2),
-            "sentiment_summary": sentiment['summary'],
-            "catalyst": sentiment['catalyst'],
-            "is_trending": sentiment.get('is_trending', False),
-            "stocktwits_watchlist": sentiment.get('stocktwits_watchlist'),
-            "signal": signal,
-            "signal_class": signal_class,
-            "high_52w": round(indicators['high_52w'], 2),
-            "low_52w": round(indicators['low_52w'], 2),
-            "volume": int(indicators['volume']),
+        logger.info(f"  {len(changed)} tickers met nieuwe headlines")
+        return changed
+    
+    def _refresh_social(self) -> Set[str]:
+        """Live: Ververs StockTwits trending"""
+        trending = self._extract_social_sentiment()
+        changed = {
+            t for t in set(trending) | set(self.trending_symbols)
+            if trending.get(t) != self.trending_symbols.get(t)
         }
+        self.trending_symbols = trending
+        return changed & set(self.ticker_data)
+    
+    def _generate_live_outputs(self, changed: Set[str]) -> None:
+        """Live: Render alleen gewijzigde ticker pagina's plus de index"""
+        today = date.today()
+        today_str = today.strftime("%Y-%m-%d")
+        trending_stocks = [r for r in self.results if r.get('is_trending')]
+        
+        generate_main_site(self.results, today, trending_stocks, self.regional_sentiment, self.writer)
+        changed_results = [self.snapshot_data[t] for t in changed if t in self.snapshot_data]
+        if changed_results:
+            generate_ticker_pages(changed_results, self.output_dir, writer=self.writer)
+        save_snapshot(self.snapshot_data, today_str, self.data_dir, self.writer, self.snapshot_store)
+        generate_search_data(self.results, today_str, self.output_dir, self.writer)
+        self.writer.save()
     
     def _generate_outputs(self, today: date, today_str: str) -> None:
         """Generate: Creëer alle output bestanden"""
         trending_stocks = [r for r in self.results if r.get('is_trending')]
         
-        generate_main_site(self.results, today, trending_stocks, self.regional_sentiment)
+        generate_main_site(self.results, today, trending_stocks, self.regional_sentiment, self.writer)
         generate_article(self.results, today)
         generate_watchlist(self.results, today)
         generate_archive(self.results, today, self.data_dir)
-        generate_ticker_pages(self.results, self.output_dir)
-        save_snapshot(self.snapshot_data, today_str, self.data_dir)
-        generate_search_data(self.results, today_str, self.output_dir)
+        generate_ticker_pages(self.results, self.output_dir, writer=self.writer)
+        save_snapshot(self.snapshot_data, today_str, self.data_dir, self.writer, self.snapshot_store)
+        generate_search_data(self.results, today_str, self.output_dir, self.writer)
+        self.writer.save()
         
-        logger.info(f"  ✓ Generated site in {self.output_dir}/")
+        logger.info(f"  ✓ Generated site in {self.output_dir}/ ({self.writer.summary()})")
         logger.info(f"  ✓ Generated {len(self.results)} ticker pages")
 
 
 def main():
     """Main entry point"""
+    parser = argparse.ArgumentParser(description="Beurs Cowboy market analysis")
+    parser.add_argument(
+        '--continuous', action='store_true',
+        help="Blijf draaien en ververs prijzen, nieuws en social op intervallen"
+    )
+    args = parser.parse_args()
+    
     analyzer = MarketAnalyzer()
-    analyzer.run()
+    if args.continuous:
+        analyzer.run_continuous()
+    else:
+        analyzer.run()
 
 
 if __name__ == "__main__":
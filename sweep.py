@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Parameter Sweep
+
+Grid search over SCORING_WEIGHTS en TECHNICAL_PARAMS op de backtest:
+- Combinaties worden gegroepeerd per set technische parameters; een
+  worker berekent de indicatoren één keer per groep en scoort daarna
+  alle gewichten daarop
+- Het koerspanel staat één keer in shared memory; workers lezen het
+  zonder pickling
+- Indicatoren die niet van een geswepte parameter afhangen worden per
+  worker hergebruikt (cache per indicator familie)
+- Resultaat: ranglijst van parametersets op een backtest metric
+"""
+
+import os
+import time
+import argparse
+import itertools
+import concurrent.futures
+from multiprocessing import shared_memory
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config import TECHNICAL_PARAMS, SCORING_WEIGHTS
+from backtest import (
+    BACKTEST_HORIZONS, load_price_history, build_date_panel, forward_returns,
+    summarize_members, default_cache_dir, daily_returns
+)
+from transformers import (
+    calculate_indicator_history, calculate_panel_setup_score,
+    calculate_panel_upside, get_panel_signal
+)
+
+
+# Standaard grid: alles wat de offline score beïnvloedt, rond de huidige waarden
+SWEEP_GRID = {
+    'rsi_window': [10, 14, 21],
+    'sma_short': [10, 20],
+    'sma_medium': [50, 100],
+    'rsi_oversold': [1.0, 2.0, 3.0],
+    'rsi_bullish': [1.0, 1.5, 2.0],
+    'macd_bullish': [1.0, 2.0, 3.0],
+    'ma_alignment': [1.0, 2.0, 3.0],
+    'high_volatility': [0.0, 1.0],
+}
+# Zonder sentiment historie hebben deze gewichten offline geen effect
+SWEEP_EXCLUDED = ('sentiment_multiplier', 'stocktwits_max_bonus')
+SWEEP_METRIC = 'mean_5d'
+SWEEP_MIN_OBSERVATIONS = 30
+SWEEP_CACHE_ENTRIES = 48  # Indicator arrays per worker (elk dagen × tickers float64)
+SWEEP_CHUNK = 64  # Gewichtcombinaties per taak
+PANEL_FIELDS = ('Close', 'High', 'Low')
+
+# Per worker: panel views op de shared memory, forward returns en indicator cache
+_worker: Dict[str, Any] = {}
+
+
+def expand_grid(grid: Dict[str, Sequence]) -> List[Tuple[Dict[str, int], Dict[str, float]]]:
+    """
+    All (technical params, weights) combinations of a grid, with the
+    config values for every parameter that is not swept.
+
+    Raises:
+        ValueError: for unknown or offline-irrelevant parameters
+    """
+    for name in grid:
+        if name in SWEEP_EXCLUDED:
+            raise ValueError(f"{name} heeft geen effect in de backtest (geen sentiment historie)")
+        if name not in TECHNICAL_PARAMS and name not in SCORING_WEIGHTS:
+            raise ValueError(f"onbekende parameter: {name}")
+
+    names = list(grid)
+    combinations = []
+    for values in itertools.product(*(grid[name] for name in names)):
+        chosen = dict(zip(names, values))
+        params = {k: chosen.get(k, v) for k, v in TECHNICAL_PARAMS.items()}
+        weights = {k: chosen.get(k, v) for k, v in SCORING_WEIGHTS.items()}
+        combinations.append((params, weights))
+    return combinations
+
+
+def run_sweep(
+    panel: Dict[str, pd.DataFrame],
+    grid: Dict[str, Sequence],
+    metric: str = SWEEP_METRIC,
+    horizons: Sequence[int] = BACKTEST_HORIZONS,
+    start: Optional[str] = None,
+    workers: Optional[int] = None,
+    min_observations: int = SWEEP_MIN_OBSERVATIONS
+) -> pd.DataFrame:
+    """
+    Backtest every grid combination and rank them.
+
+    Each combination is scored on the long signals ('buy-strong' and
+    'buy') with the summarize_members stats of the backtest module.
+
+    Args:
+        panel: Output of build_date_panel
+        grid: Dict of {parameter: [values]} (TECHNICAL_PARAMS or SCORING_WEIGHTS keys)
+        metric: Stat to rank on, e.g. 'mean_5d', 'hit_20d', 'total_return'
+        horizons: Forward return horizons in bars
+        start: First signal date (YYYY-MM-DD)
+        workers: Processes (None = CPU count, 1 = in-process)
+        min_observations: Combinations with fewer long signals are not ranked
+
+    Returns:
+        DataFrame with one row per ranked combination: the swept
+        parameters followed by the stats, best first
+
+    Raises:
+        ValueError: for an unknown metric (checked before any backtest runs)
+    """
+    stats = _stat_names(horizons)
+    if metric not in stats:
+        raise ValueError(f"onbekende metric: {metric} (kies uit {', '.join(stats)})")
+    combinations = expand_grid(grid)
+    tasks = _build_tasks(combinations)
+    workers = workers or os.cpu_count() or 1
+    workers = min(workers, len(tasks))
+
+    if workers <= 1:
+        _attach_panel(panel, horizons, start)
+        rows = [row for task in tasks for row in _run_task(task)]
+    else:
+        rows = _run_pool(panel, tasks, horizons, start, workers)
+
+    swept = list(grid)
+    table = pd.DataFrame([
+        {**{name: row['params'].get(name, row['weights'].get(name)) for name in swept}, **row['stats']}
+        for row in rows
+    ])
+    table = table[table['observations'] >= min_observations]
+    return table.sort_values([metric, 'observations'], ascending=False, kind='stable').reset_index(drop=True)
+
+
+def main():
+    """CLI: python sweep.py [--grid name=v1,v2 ...] [--metric mean_5d]"""
+    parser = argparse.ArgumentParser(description="Beurs Cowboy parameter sweep op gecachte koersen")
+    parser.add_argument(
+        '--cache-dir',
+        help="PriceCache directory (standaard: backtest_cache_dir als die gevuld is, anders price_cache_dir)"
+    )
+    parser.add_argument(
+        '--grid', nargs='+', metavar='NAME=V1,V2',
+        help="Te swepen parameters (standaard: SWEEP_GRID)"
+    )
+    parser.add_argument('--metric', default=SWEEP_METRIC, help="Rangschik op deze stat")
+    parser.add_argument('--start', help="Eerste signaaldag (YYYY-MM-DD)")
+    parser.add_argument('--workers', type=int, help="Aantal processen (standaard: aantal CPU's)")
+    parser.add_argument('--top', type=int, default=20, help="Aantal getoonde parametersets")
+    parser.add_argument('--output', help="Schrijf de volledige ranglijst naar CSV")
+    args = parser.parse_args()
+
+    grid = _parse_grid(args.grid) if args.grid else SWEEP_GRID
+    started = time.perf_counter()
+    cache_dir = args.cache_dir or default_cache_dir()
+    histories = load_price_history(cache_dir)
+    if not histories:
+        raise SystemExit(f"Geen gecachte koersen in {cache_dir} (vul eerst: python backtest.py --fetch)")
+    panel = build_date_panel(histories)
+
+    table = run_sweep(panel, grid, metric=args.metric, start=args.start, workers=args.workers)
+    print(f"🔍 Sweep: {len(expand_grid(grid))} combinaties, {len(histories)} tickers, "
+          f"{len(panel['Close'])} dagen in {time.perf_counter() - started:.1f}s")
+    print(table.head(args.top).to_string(float_format=lambda v: f"{v:,.2f}"))
+    if args.output:
+        table.to_csv(args.output, index=False)
+
+
+# =============================================================================
+# HELPER FUNCTIONS
+# =============================================================================
+
+def _build_tasks(
+    combinations: List[Tuple[Dict[str, int], Dict[str, float]]]
+) -> List[Tuple[Dict[str, int], List[Dict[str, float]]]]:
+    """Group weights per technical parameter set, in chunks of SWEEP_CHUNK"""
+    groups: Dict[tuple, Tuple[Dict[str, int], List[Dict[str, float]]]] = {}
+    for params, weights in combinations:
+        key = tuple(sorted(params.items()))
+        groups.setdefault(key, (params, []))[1].append(weights)
+
+    # Gesorteerd, zodat taken met gedeelde indicatoren dicht bij elkaar liggen
+    tasks = []
+    for key in sorted(groups):
+        params, weight_sets = groups[key]
+        for i in range(0, len(weight_sets), SWEEP_CHUNK):
+            tasks.append((params, weight_sets[i:i + SWEEP_CHUNK]))
+    return tasks
+
+
+def _run_pool(
+    panel: Dict[str, pd.DataFrame],
+    tasks: List[Tuple[Dict[str, int], List[Dict[str, float]]]],
+    horizons: Sequence[int],
+    start: Optional[str],
+    workers: int
+) -> List[Dict[str, Any]]:
+    """Run tasks on a process pool with the panel in shared memory"""
+    close = panel['Close']
+    shape = (len(PANEL_FIELDS),) + close.shape
+    shm = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * 8, 1))
+    try:
+        data = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        for i, field in enumerate(PANEL_FIELDS):
+            data[i] = panel[field].to_numpy(dtype=np.float64)
+
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(shm.name, shape, close.index, list(close.columns), tuple(horizons), start)
+        ) as executor:
+            rows = [row for result in executor.map(_run_task, tasks) for row in result]
+        del data
+    finally:
+        shm.close()
+        shm.unlink()
+    return rows
+
+
+def _init_worker(
+    shm_name: str,
+    shape: Tuple[int, ...],
+    index: pd.Index,
+    columns: List[str],
+    horizons: Tuple[int, ...],
+    start: Optional[str]
+) -> None:
+    """Pool initializer: attach to the shared panel"""
+    # Workers delen de resource tracker van het hoofdproces, dat het segment opruimt
+    shm = shared_memory.SharedMemory(name=shm_name)
+    data = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+    panel = {
+        field: pd.DataFrame(data[i], index=index, columns=columns, copy=False)
+        for i, field in enumerate(PANEL_FIELDS)
+    }
+    _attach_panel(panel, horizons, start)
+    _worker['shm'] = shm
+
+
+def _attach_panel(
+    panel: Dict[str, pd.DataFrame],
+    horizons: Sequence[int],
+    start: Optional[str]
+) -> None:
+    """Per-process state shared by all tasks"""
+    close = panel['Close']
+    scored = np.ones(len(close), dtype=bool)
+    if start is not None:
+        scored = close.index >= pd.Timestamp(start)
+    _worker.update(
+        panel=panel,
+        price=close.to_numpy(),
+        bars=close.notna().cumsum().to_numpy(),
+        scored=scored,
+        forward=forward_returns(close, horizons),
+        daily=daily_returns(close),
+        cache={},
+    )
+
+
+def _run_task(task: Tuple[Dict[str, int], List[Dict[str, float]]]) -> List[Dict[str, Any]]:
+    """Indicators once for the task's technical parameters, then every weight set"""
+    params, weight_sets = task
+    cache = _worker['cache']
+    indicators = calculate_indicator_history(_worker['panel'], params, cache=cache)
+    while len(cache) > SWEEP_CACHE_ENTRIES:
+        cache.pop(next(iter(cache)))
+
+    price = _worker['price']
+    upside = calculate_panel_upside(indicators, price)
+    warmup = max(params['sma_medium'], params['macd_slow'], params['rsi_window'], params['atr_period'])
+    eligible = (_worker['bars'] >= warmup) & ~np.isnan(price) & _worker['scored'][:, None]
+
+    rows = []
+    for weights in weight_sets:
+        score = calculate_panel_setup_score(indicators, price, weights)
+        signals = get_panel_signal(score, upside)
+        # Long = 'buy-strong' (0) of 'buy' (1)
+        members = eligible & (signals <= 1)
+        rows.append({'params': params, 'weights': weights, 'stats': summarize_members(members, _worker['forward'], _worker['daily'])})
+    return rows
+
+
+def _stat_names(horizons: Sequence[int]) -> List[str]:
+    """Column names of summarize_members for these horizons"""
+    names = ['observations']
+    for h in horizons:
+        names += [f'mean_{h}d', f'hit_{h}d']
+    return names + ['total_return', 'max_drawdown']
+
+
+def _parse_grid(specs: List[str]) -> Dict[str, List[float]]:
+    """['rsi_window=10,14', 'ma_alignment=1.5,2'] -> {name: [values]}"""
+    grid = {}
+    for spec in specs:
+        name, _, values = spec.partition('=')
+        cast = int if name in TECHNICAL_PARAMS else float
+        grid[name] = [cast(v) for v in values.split(',') if v]
+    return grid
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Template Engine
+
+Kleine, voorgecompileerde template laag voor de HTML generatie:
+- Templates gebruiken str.format syntax ({naam}, {r[price]:.2f}, {{ }}),
+  dus de tekst blijft gelijk aan de oude f-strings en de output is
+  byte-identiek
+- Eén keer compileren bij import: elk template wordt een Python functie
+  met f-strings, even snel als de oude inline f-strings
+- Velden die als stream gedeclareerd zijn (bijv. tabelrijen) worden als
+  iterator van chunks doorgegeven, zonder tussenliggende string
+"""
+
+import _string
+from string import Formatter
+from typing import Any, Callable, Iterable, Iterator, List, Mapping, Optional
+
+
+class Template:
+    """
+    Compiled format-string template.
+
+    Supported fields: names, attribute and index lookups ({r[price]},
+    {assets[market.css]}), a conversion (!r/!s/!a) and a literal format
+    spec. Fields listed in ``streams`` take an iterable of string chunks
+    and may not have a conversion or format spec.
+    """
+
+    def __init__(self, source: str, name: str = '<template>', streams: Iterable[str] = ()):
+        self.name = name
+        self.source = source
+        self.streams = frozenset(streams)
+        self._render = _compile(source, name, self.streams)
+
+    def iter_render(self, context: Mapping[str, Any]) -> Iterator[str]:
+        """Yield the rendered output in chunks (one chunk per stream boundary)"""
+        if self.streams:
+            return self._render(context)
+        return iter((self._render(context),))
+
+    def render(self, context: Optional[Mapping[str, Any]] = None, **fields) -> str:
+        """Render to a single string"""
+        if fields:
+            context = {**context, **fields} if context else fields
+        if self.streams:
+            return ''.join(self._render(context or {}))
+        return self._render(context or {})
+
+    def render_many(self, contexts: Iterable[Mapping[str, Any]]) -> Iterator[str]:
+        """Render the template once per context (e.g. table rows)"""
+        if self.streams:
+            for context in contexts:
+                yield from self._render(context)
+        else:
+            yield from map(self._render, contexts)
+
+
+def _compile(source: str, name: str, streams: frozenset) -> Callable[[Mapping[str, Any]], Any]:
+    """
+    Translate a template into a Python function.
+
+    Every field is bound to a local (v0, v1, ...) in a preamble and the
+    text between stream fields becomes one f-string, so rendering costs
+    the same as a hand-written f-string. Templates without streams
+    compile to a function returning one string, others to a generator.
+    """
+    lookups: List[str] = []
+    statements: List[str] = []
+    pending: List[str] = []
+    constants = {}
+
+    def flush() -> None:
+        if pending and streams:
+            statements.append(f'yield f"{"".join(pending)}"')
+            pending.clear()
+
+    for literal, field_name, spec, conversion in Formatter().parse(source):
+        if literal:
+            pending.append(_escape(literal))
+        if field_name is None:
+            continue
+        if not field_name or field_name.isdigit():
+            raise ValueError(f"{name}: positionele velden worden niet ondersteund")
+        if '{' in (spec or ''):
+            raise ValueError(f"{name}: geneste velden in format spec ({field_name})")
+
+        var = f"v{len(lookups)}"
+        lookups.append(f"{var} = {_lookup_expression(field_name, constants)}")
+        if field_name in streams:
+            if spec or conversion:
+                raise ValueError(f"{name}: stream veld {field_name} met format spec")
+            flush()
+            statements.append(f"yield from {var}")
+        else:
+            pending.append('{' + var + (f'!{conversion}' if conversion else '') + (f':{spec}' if spec else '') + '}')
+    flush()
+
+    if not streams:
+        statements = [f'return f"{"".join(pending)}"' if pending else 'return ""']
+    body = "\n".join(f"    {line}" for line in lookups + statements)
+    code = f"def _render(_c):\n{body}\n"
+    namespace = dict(constants)
+    exec(compile(code, f"<template {name}>", 'exec'), namespace)
+    return namespace['_render']
+
+
+def _lookup_expression(field_name: str, constants: dict) -> str:
+    """'r[price]' -> '_c[_k0][_k1]' with the keys bound as constants"""
+    first, rest = _string.formatter_field_name_split(field_name)
+    expression = f"_c[{_constant(first, constants)}]"
+    for is_attr, key in rest:
+        if is_attr:
+            if not key.isidentifier():
+                raise ValueError(f"ongeldig attribuut in veld {field_name}")
+            expression += f".{key}"
+        else:
+            expression += f"[{_constant(key, constants)}]"
+    return expression
+
+
+def _constant(value: Any, constants: dict) -> str:
+    """Bind a lookup key as a module-level constant of the compiled function"""
+    name = f"_k{len(constants)}"
+    constants[name] = value
+    return name
+
+
+def _escape(literal: str) -> str:
+    """Escape literal text for a double-quoted f-string"""
+    return (
+        literal.replace('\\', '\\\\')
+        .replace('"', '\\"')
+        .replace('\n', '\\n')
+        .replace('\r', '\\r')
+        .replace('{', '{{')
+        .replace('}', '}}')
+    )
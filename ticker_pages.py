@@ -10,498 +10,153 @@ Generates complete individual ticker pages with:
 """
 
 import os
-from typing import Dict, List, Any
+import time
+import functools
+import concurrent.futures
+from typing import Dict, List, Any, Optional, Tuple
 from config import SETTINGS
-
-
-def generate_ticker_pages(results: List[Dict], output_dir: str) -> None:
-    """Generate complete ticker pages for all results"""
+from output_writer import OutputWriter, get_output_writer
+from site_assets import build_assets
+from page_templates import TICKER_PAGE, TRENDING_ROW, REASON_ITEM, SMA_ABOVE, SMA_BELOW
+
+
+def generate_ticker_pages(
+    results: List[Dict],
+    output_dir: str,
+    workers: Optional[int] = None,
+    parallel_min: Optional[int] = None,
+    writer: Optional[OutputWriter] = None
+) -> Dict[str, Any]:
+    """
+    Generate complete ticker pages for all results.
+    
+    HTML is rendered on a process pool (CPU-bound string building) while a
+    thread pool writes finished pages through the OutputWriter (unchanged
+    pages are skipped). Small batches (fewer than
+    parallel_min pages) are rendered in-process to avoid pool start-up cost.
+    
+    Args:
+        results: Ticker result dicts
+        output_dir: Site output directory
+        workers: Render processes (default: SETTINGS['render_workers'] or CPU count)
+        parallel_min: Minimum number of pages for the process pool
+        writer: Shared output writer (default: process-wide writer)
+    
+    Returns:
+        Timing stats: pages, written, skipped, total/render/write seconds,
+        p50/p95 render ms, slowest
+    """
     ticker_dir = os.path.join(output_dir, "ticker")
     os.makedirs(ticker_dir, exist_ok=True)
     
-    for r in results:
-        html = _generate_complete_ticker_page(r)
-        output_path = os.path.join(ticker_dir, f"{r['ticker']}.html")
-        with open(output_path, "w") as f:
-            f.write(html)
+    workers = workers or SETTINGS.get('render_workers') or os.cpu_count() or 1
+    if parallel_min is None:
+        parallel_min = SETTINGS.get('render_parallel_min', 500)
     
-    print(f"  ✓ {len(results)} ticker pagina's gegenereerd")
-
-
-def _generate_complete_ticker_page(r: Dict) -> str:
-    """Generate complete ticker detail page"""
-    ticker = r['ticker']
-    name = r['name']
-    sector = r['sector']
+    writer = writer or get_output_writer()
+    css_href = "../" + build_assets(output_dir, writer)['ticker.css']
+    render = functools.partial(_render_page, css_href=css_href)
     
-    return f"""<!DOCTYPE html>
-<html lang="nl">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{ticker} - {name} | Beurs Cowboy</title>
-    <link rel="stylesheet" href="../assets/styles.css">
-</head>
-<body>
-    <!-- Header -->
-    <header class="site-header">
-        <div class="header-container">
-            <div class="logo">
-                <a href="../index.html" class="logo-link">
-                    <span class="logo-icon">🤠</span>
-                    <span class="logo-text">Beurs<span class="highlight">Cowboy</span></span>
-                </a>
-            </div>
-            <nav class="main-nav">
-                <a href="../index.html">Markten</a>
-                <a href="../analysis.html">Analyse</a>
-                <a href="../watchlist.html">Watchlist</a>
-                <a href="../archive.html">Archief</a>
-            </nav>
-        </div>
-    </header>
-
-    <main class="main-content">
-        <section class="content-section">
-            <!-- Back Link -->
-            <a href="../index.html#complete-markt" class="back-link">
-                ← Terug naar overzicht
-            </a>
-
-            <!-- Ticker Header -->
-            <div class="ticker-header">
-                <div class="ticker-title">
-                    <div>
-                        <h1 class="ticker-symbol">{ticker}</h1>
-                        <p class="ticker-name">{name}</p>
-                        <span class="ticker-sector">{sector}</span>
-                    </div>
-                    <div class="ticker-signal">
-                        <span class="signal-badge {r['signal_class']}">{r['signal']}</span>
-                    </div>
-                </div>
-                <div class="ticker-price-block">
-                    <div class="price-large">€{r['price']:.2f}</div>
-                    <div class="price-change {'positive' if r['change_pct'] >= 0 else 'negative'}">
-                        {'+' if r['change_pct'] >= 0 else ''}{r['change_pct']:.2f}%
-                    </div>
-                </div>
-            </div>
-
-            <!-- Two Column Layout -->
-            <div class="ticker-grid">
-                <!-- Left Column: Chart & News -->
-                <div class="ticker-main">
-                    <!-- TradingView Chart -->
-                    <div class="card">
-                        <h3>📈 TradingView Chart</h3>
-                        <div id="tradingview_chart" style="height: 500px;"></div>
-                    </div>
-
-                    <!-- Recent News -->
-                    <div class="card">
-                        <h3>📰 Recent Nieuws</h3>
-                        <div class="news-list" id="news-container">
-                            <p class="loading">Nieuws laden...</p>
-                        </div>
-                    </div>
-                </div>
-
-                <!-- Right Column: Metrics & Analysis -->
-                <div class="ticker-sidebar">
-                    <!-- Key Metrics -->
-                    <div class="card">
-                        <h3>📊 Key Metrics</h3>
-                        <div class="metrics-grid">
-                            <div class="metric">
-                                <span class="metric-label">RSI (14)</span>
-                                <span class="metric-value {'oversold' if r['rsi'] < 30 else 'overbought' if r['rsi'] > 70 else ''}">{r['rsi']:.1f}</span>
-                            </div>
-                            <div class="metric">
-                                <span class="metric-label">MACD</span>
-                                <span class="metric-value {'positive' if r['macd'] > 0 else 'negative'}">{r['macd']:.4f}</span>
-                            </div>
-                            <div class="metric">
-                                <span class="metric-label">MACD Hist</span>
-                                <span class="metric-value {'positive' if r['macd_hist'] > 0 else 'negative'}">{r['macd_hist']:.4f}</span>
-                            </div>
-                            <div class="metric">
-                                <span class="metric-label">SMA 20</span>
-                                <span class="metric-value">€{r['sma_20']:.2f}</span>
-                            </div>
-                            <div class="metric">
-                                <span class="metric-label">SMA 50</span>
-                                <span class="metric-value">€{r['sma_50']:.2f}</span>
-                            </div>
-                            <div class="metric">
-                                <span class="metric-label">52W Hoog</span>
-                                <span class="metric-value">€{r['high_52w']:.2f}</span>
-                            </div>
-                            <div class="metric">
-                                <span class="metric-label">52W Laag</span>
-                                <span class="metric-value">€{r['low_52w']:.2f}</span>
-                            </div>
-                            <div class="metric">
-                                <span class="metric-label">Volume</span>
-                                <span class="metric-value">{r['volume']:,}</span>
-                            </div>
-                            <div class="metric">
-                                <span class="metric-label">ATR</span>
-                                <span class="metric-value">{r['atr_pct']:.1f}%</span>
-                            </div>
-                            <div class="metric">
-                                <span class="metric-label">Vol Rank</span>
-                                <span class="metric-value">{r['vol_rank']:.0f}</span>
-                            </div>
-                        </div>
-                    </div>
-
-                    <!-- Analysis -->
-                    <div class="card">
-                        <h3>🎯 Analyse</h3>
-                        <div class="analysis-section">
-                            <div class="analysis-row">
-                                <span class="analysis-label">Setup Type:</span>
-                                <span class="analysis-value">{r['setup_type']}</span>
-                            </div>
-                            <div class="analysis-row">
-                                <span class="analysis-label">Setup Score:</span>
-                                <span class="analysis-value score {'positive' if r['setup_score'] > 0 else 'negative'}">{r['setup_score']:.1f}</span>
-                            </div>
-                            <div class="analysis-row">
-                                <span class="analysis-label">Potentieel:</span>
-                                <span class="analysis-value upside">+{r['potential_upside']:.1f}%</span>
-                            </div>
-                            <div class="analysis-row">
-                                <span class="analysis-label">Sentiment:</span>
-                                <span class="analysis-value">{r['sentiment_summary']}</span>
-                            </div>
-                            <div class="analysis-row">
-                                <span class="analysis-label">Sentiment Score:</span>
-                                <span class="analysis-value {'positive' if r['sentiment_score'] > 0 else 'negative'}">{r['sentiment_score']:.2f}</span>
-                            </div>
-                            {f'''
-                            <div class="analysis-row">
-                                <span class="analysis-label">🔥 Trending:</span>
-                                <span class="analysis-value">{r.get('stocktwits_watchlist', 0):,} volgers</span>
-                            </div>
-                            ''' if r.get('is_trending') else ''}
-                        </div>
-                    </div>
-
-                    <!-- Setup Reasons -->
-                    <div class="card">
-                        <h3>✓ Redenen</h3>
-                        <ul class="reasons-list">
-                            {"".join([f"<li>{reason}</li>" for reason in r['setup_reasons']])}
-                        </ul>
-                    </div>
-
-                    <!-- Quick Stats -->
-                    <div class="card">
-                        <h3>📈 Positie t.o.v. SMA's</h3>
-                        <div class="sma-position">
-                            {f'<div class="position-above">Boven SMA20 (+{((r["price"] - r["sma_20"]) / r["sma_20"] * 100):.1f}%)</div>' if r['price'] > r['sma_20'] else f'<div class="position-below">Onder SMA20 ({((r["price"] - r["sma_20"]) / r["sma_20"] * 100):.1f}%)</div>'}
-                            {f'<div class="position-above">Boven SMA50 (+{((r["price"] - r["sma_50"]) / r["sma_50"] * 100):.1f}%)</div>' if r['sma_50'] and r['price'] > r['sma_50'] else f'<div class="position-below">Onder SMA50 ({((r["price"] - r["sma_50"]) / r["sma_50"] * 100):.1f}%)</div>' if r['sma_50'] else ''}
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </section>
-    </main>
-
-    <!-- Footer -->
-    <footer class="site-footer">
-        <div class="footer-container">
-            <div class="footer-content">
-                <div class="footer-section">
-                    <h4>🤠 Beurs Cowboy</h4>
-                    <p>Dagelijkse beursanalyse met een westelijk tintje.</p>
-                </div>
-                <div class="footer-section">
-                    <h4>Disclaimer</h4>
-                    <p>Dit is geen financieel advies.</p>
-                </div>
-            </div>
-        </div>
-    </footer>
-
-    <!-- TradingView Widget -->
-    <script type="text/javascript" src="https://s3.tradingview.com/tv.js"></script>
-    <script type="text/javascript">
-        new TradingView.widget({{
-            "width": "100%",
-            "height": 500,
-            "symbol": "{ticker}",
-            "interval": "D",
-            "timezone": "Europe/Amsterdam",
-            "theme": "dark",
-            "style": "1",
-            "locale": "nl",
-            "toolbar_bg": "#f1f3f6",
-            "enable_publishing": false,
-            "allow_symbol_change": true,
-            "container_id": "tradingview_chart",
-            "hide_side_toolbar": false,
-            "studies": [
-                "RSI@tv-basicstudies",
-                "MACD@tv-basicstudies",
-                "Moving Average@tv-basicstudies"
-            ]
-        }});
-        
-        // Fetch news dynamically
-        fetch(`https://query1.finance.yahoo.com/v1/test/getnews?category=general&template=bullet&lang=en-US&region=US&symbol={ticker}`)
-            .then(response => response.json())
-            .then(data => {{
-                const container = document.getElementById('news-container');
-                if (data && data.items && data.items.length > 0) {{
-                    container.innerHTML = data.items.slice(0, 5).map(item => `
-                        <div class="news-item">
-                            <a href="${{item.link}}" target="_blank" class="news-title">${{item.title}}</a>
-                            <div class="news-meta">
-                                <span class="news-source">${{item.publisher}}</span>
-                                <span class="news-time">${{new Date(item.providerPublishTime * 1000).toLocaleDateString('nl-NL')}}</span>
-                            </div>
-                        </div>
-                    `).join('');
-                }} else {{
-                    container.innerHTML = '<p class="no-news">Geen recent nieuws gevonden</p>';
-                }}
-            }})
-            .catch(err => {{
-                document.getElementById('news-container').innerHTML = '<p class="error">Nieuws niet beschikbaar</p>';
-            }});
-    </script>
-
-    <style>
-        .back-link {{
-            display: inline-flex;
-            align-items: center;
-            gap: 0.5rem;
-            color: var(--accent-primary);
-            text-decoration: none;
-            margin-bottom: 1.5rem;
-            font-weight: 500;
-        }}
-        .back-link:hover {{
-            text-decoration: underline;
-        }}
-        .ticker-header {{
-            background: linear-gradient(135deg, var(--accent-primary), var(--accent-secondary));
-            color: white;
-            padding: 2rem;
-            border-radius: 12px;
-            margin-bottom: 2rem;
-        }}
-        .ticker-title {{
-            display: flex;
-            justify-content: space-between;
-            align-items: flex-start;
-            margin-bottom: 1rem;
-        }}
-        .ticker-symbol {{
-            font-size: 3rem;
-            font-weight: 700;
-            margin: 0;
-            line-height: 1;
-        }}
-        .ticker-name {{
-            font-size: 1.2rem;
-            opacity: 0.9;
-            margin: 0.5rem 0 0.25rem 0;
-        }}
-        .ticker-sector {{
-            font-size: 0.9rem;
-            opacity: 0.7;
-        }}
-        .ticker-signal {{
-            flex-shrink: 0;
-        }}
-        .ticker-price-block {{
-            text-align: right;
-        }}
-        .price-large {{
-            font-size: 2.5rem;
-            font-weight: 700;
-        }}
-        .price-change {{
-            font-size: 1.5rem;
-            padding: 0.5rem 1rem;
-            border-radius: 8px;
-            display: inline-block;
-            margin-top: 0.5rem;
-            font-weight: 600;
-        }}
-        .price-change.positive {{
-            background: rgba(34, 197, 94, 0.2);
-            color: #4ade80;
-        }}
-        .price-change.negative {{
-            background: rgba(239, 68, 68, 0.2);
-            color: #f87171;
-        }}
-        .ticker-grid {{
-            display: grid;
-            grid-template-columns: 1fr 380px;
-            gap: 2rem;
-        }}
-        @media (max-width: 1024px) {{
-            .ticker-grid {{
-                grid-template-columns: 1fr;
-            }}
-        }}
-        .card {{
-            background: var(--bg-secondary);
-            border: 1px solid var(--border-color);
-            border-radius: 12px;
-            padding: 1.5rem;
-            margin-bottom: 2rem;
-        }}
-        .card h3 {{
-            margin: 0 0 1rem 0;
-            color: var(--text-primary);
-            font-size: 1.2rem;
-        }}
-        .metrics-grid {{
-            display: grid;
-            grid-template-columns: repeat(2, 1fr);
-            gap: 1rem;
-        }}
-        .metric {{
-            background: var(--bg-tertiary);
-            padding: 1rem;
-            border-radius: 8px;
-        }}
-        .metric-label {{
-            font-size: 0.85rem;
-            color: var(--text-muted);
-            display: block;
-            margin-bottom: 0.25rem;
-        }}
-        .metric-value {{
-            font-size: 1.2rem;
-            font-weight: 600;
-            color: var(--text-primary);
-        }}
-        .metric-value.positive {{
-            color: #22c55e;
-        }}
-        .metric-value.negative {{
-            color: #ef4444;
-        }}
-        .metric-value.oversold {{
-            color: #f59e0b;
-        }}
-        .metric-value.overbought {{
-            color: #ef4444;
-        }}
-        .analysis-section {{
-            display: flex;
-            flex-direction: column;
-            gap: 0.75rem;
-        }}
-        .analysis-row {{
-            display: flex;
-            justify-content: space-between;
-            padding: 0.5rem 0;
-            border-bottom: 1px solid var(--border-color);
-        }}
-        .analysis-row:last-child {{
-            border-bottom: none;
-        }}
-        .analysis-label {{
-            color: var(--text-secondary);
-            font-size: 0.9rem;
-        }}
-        .analysis-value {{
-            font-weight: 600;
-            color: var(--text-primary);
-        }}
-        .analysis-value.positive {{
-            color: #22c55e;
-        }}
-        .analysis-value.negative {{
-            color: #ef4444;
-        }}
-        .analysis-value.upside {{
-            color: #3b82f6;
-        }}
-        .reasons-list {{
-            list-style: none;
-            padding: 0;
-            margin: 0;
-        }}
-        .reasons-list li {{
-            padding: 0.75rem 0;
-            border-bottom: 1px solid var(--border-color);
-            display: flex;
-            align-items: flex-start;
-            gap: 0.75rem;
-        }}
-        .reasons-list li:before {{
-            content: "✓";
-            color: #22c55e;
-            font-weight: bold;
-        }}
-        .reasons-list li:last-child {{
-            border-bottom: none;
-        }}
-        .news-list {{
-            display: flex;
-            flex-direction: column;
-            gap: 1rem;
-        }}
-        .news-item {{
-            padding: 1rem;
-            background: var(--bg-tertiary);
-            border-radius: 8px;
-            border: 1px solid var(--border-color);
-        }}
-        .news-title {{
-            color: var(--text-primary);
-            text-decoration: none;
-            font-weight: 500;
-            display: block;
-            margin-bottom: 0.5rem;
-        }}
-        .news-title:hover {{
-            color: var(--accent-primary);
-        }}
-        .news-meta {{
-            display: flex;
-            gap: 1rem;
-            font-size: 0.85rem;
-            color: var(--text-muted);
-        }}
-        .sma-position {{
-            display: flex;
-            flex-direction: column;
-            gap: 0.5rem;
-        }}
-        .position-above {{
-            background: rgba(34, 197, 94, 0.1);
-            border-left: 3px solid #22c55e;
-            padding: 0.75rem;
-            border-radius: 4px;
-            color: #22c55e;
-            font-weight: 600;
-        }}
-        .position-below {{
-            background: rgba(239, 68, 68, 0.1);
-            border-left: 3px solid #ef4444;
-            padding: 0.75rem;
-            border-radius: 4px;
-            color: #ef4444;
-            font-weight: 600;
-        }}
-        .loading, .no-news, .error {{
-            text-align: center;
-            padding: 2rem;
-            color: var(--text-muted);
-        }}
-    </style>
-
-    <script src="../assets/main.js"></script>
-</body>
-</html>"""
+    started = time.perf_counter()
+    timings: List[Tuple[str, float]] = []
+    write_seconds = 0.0
+    written = 0
+    
+    def write(ticker: str, html: str) -> Tuple[bool, float]:
+        write_start = time.perf_counter()
+        changed = writer.write(os.path.join(ticker_dir, f"{ticker}.html"), html)
+        return changed, time.perf_counter() - write_start
+    
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as writers:
+        write_futures = []
+        if workers > 1 and len(results) >= parallel_min:
+            chunksize = max(1, len(results) // (workers * 4))
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as renderers:
+                for ticker, html, elapsed in renderers.map(render, results, chunksize=chunksize):
+                    timings.append((ticker, elapsed))
+                    write_futures.append(writers.submit(write, ticker, html))
+        else:
+            for r in results:
+                ticker, html, elapsed = render(r)
+                timings.append((ticker, elapsed))
+                write_futures.append(writers.submit(write, ticker, html))
+        for future in write_futures:
+            changed, elapsed = future.result()
+            written += changed
+            write_seconds += elapsed
+    
+    stats = _timing_stats(timings, write_seconds, time.perf_counter() - started)
+    stats['written'] = written
+    stats['skipped'] = len(results) - written
+    print(
+        f"  ✓ {len(results)} ticker pagina's gegenereerd "
+        f"({stats['written']} geschreven, {stats['skipped']} ongewijzigd)"
+    )
+    if timings:
+        print(
+            f"    render p50 {stats['render_p50_ms']:.2f}ms, p95 {stats['render_p95_ms']:.2f}ms, "
+            f"traagst {stats['slowest'][0]} ({stats['slowest'][1]:.1f}ms); "
+            f"totaal {stats['total_seconds']:.2f}s"
+        )
+    return stats
+
+
+def _render_page(r: Dict, css_href: str) -> Tuple[str, str, float]:
+    """Render one page; returns (ticker, html, seconds)"""
+    render_start = time.perf_counter()
+    html = _generate_complete_ticker_page(r, css_href)
+    return r['ticker'], html, time.perf_counter() - render_start
+
+
+def _timing_stats(timings: List[Tuple[str, float]], write_seconds: float, total_seconds: float) -> Dict[str, Any]:
+    """Summarize per-page render timings"""
+    durations = sorted(elapsed for _, elapsed in timings)
+    slowest = max(timings, key=lambda item: item[1]) if timings else (None, 0.0)
+    
+    def percentile(pct: float) -> float:
+        if not durations:
+            return 0.0
+        return durations[min(len(durations) - 1, int(len(durations) * pct / 100))] * 1000
+    
+    return {
+        'pages': len(timings),
+        'total_seconds': total_seconds,
+        'render_seconds': sum(durations),
+        'write_seconds': write_seconds,
+        'render_p50_ms': percentile(50),
+        'render_p95_ms': percentile(95),
+        'slowest': (slowest[0], slowest[1] * 1000),
+    }
+
+
+def _generate_complete_ticker_page(r: Dict, css_href: str) -> str:
+    """Generate complete ticker detail page (page CSS lives in static/ticker.css)"""
+    trending_row = ""
+    if r.get('is_trending'):
+        trending_row = TRENDING_ROW.render(watchlist=r.get('stocktwits_watchlist', 0))
+    
+    return TICKER_PAGE.render({
+        'r': r,
+        'ticker': r['ticker'],
+        'name': r['name'],
+        'sector': r['sector'],
+        'css_href': css_href,
+        'change_class': 'positive' if r['change_pct'] >= 0 else 'negative',
+        'change_sign': '+' if r['change_pct'] >= 0 else '',
+        'rsi_class': 'oversold' if r['rsi'] < 30 else 'overbought' if r['rsi'] > 70 else '',
+        'macd_class': 'positive' if r['macd'] > 0 else 'negative',
+        'macd_hist_class': 'positive' if r['macd_hist'] > 0 else 'negative',
+        'score_class': 'positive' if r['setup_score'] > 0 else 'negative',
+        'sentiment_class': 'positive' if r['sentiment_score'] > 0 else 'negative',
+        'trending_row': trending_row,
+        'reasons': "".join(REASON_ITEM.render(reason=reason) for reason in r['setup_reasons']),
+        'sma_20_position': _sma_position(r['price'], r['sma_20'], 'SMA20'),
+        'sma_50_position': _sma_position(r['price'], r['sma_50'], 'SMA50') if r['sma_50'] else '',
+    })
+
+
+def _sma_position(price: float, sma: float, label: str) -> str:
+    """'Boven/Onder SMAxx (+x.x%)' block"""
+    pct = (price - sma) / sma * 100
+    template = SMA_ABOVE if price > sma else SMA_BELOW
+    return template.render(label=label, pct=pct)
@@ -0,0 +1,79 @@
+"""
+Ticker Result
+
+Compact resultaat record per ticker:
+- __slots__ in plaats van een dict met 27 keys per ticker (ongeveer een
+  derde van het geheugen, snelle attribuut toegang: r.price)
+- Leest als het oude resultaat dict (r['price'], r.get('is_trending'),
+  dict(r)), zodat loaders, templates en de snapshot store ongewijzigd
+  blijven
+- to_dict() is de export voor de JSON snapshot, in de oude volgorde
+"""
+
+from collections.abc import Mapping
+from operator import attrgetter
+from typing import Any, Dict, Iterator, Tuple
+
+
+# Volgorde = volgorde van de keys in de JSON snapshot
+RESULT_FIELDS: Tuple[str, ...] = (
+    'ticker', 'name', 'sector', 'price', 'change', 'change_pct', 'rsi',
+    'macd', 'macd_hist', 'sma_20', 'sma_50', 'atr_pct', 'vol_rank',
+    'setup_score', 'setup_reasons', 'setup_type', 'potential_upside',
+    'sentiment_score', 'sentiment_summary', 'catalyst', 'is_trending',
+    'stocktwits_watchlist', 'signal', 'signal_class', 'high_52w',
+    'low_52w', 'volume',
+)
+_FIELD_SET = frozenset(RESULT_FIELDS)
+
+
+class TickerResult(Mapping):
+    """
+    Slotted, read-only-by-convention result record with a dict interface.
+
+    Mapping supplies get/keys/items/values/__contains__/__eq__ on top of
+    __getitem__, __iter__ and __len__.
+    """
+
+    __slots__ = RESULT_FIELDS
+
+    def __init__(self, **fields: Any):
+        unknown = fields.keys() - _FIELD_SET
+        if unknown:
+            raise TypeError(f"onbekende result velden: {', '.join(sorted(unknown))}")
+        for name in RESULT_FIELDS:
+            setattr(self, name, fields[name])
+
+    def __getitem__(self, key: str) -> Any:
+        # KeyError voor onbekende keys, net als een dict
+        return _GETTERS[key](self)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(RESULT_FIELDS)
+
+    def __len__(self) -> int:
+        return len(RESULT_FIELDS)
+
+    def __contains__(self, key: object) -> bool:
+        return key in _FIELD_SET
+
+    def __repr__(self) -> str:
+        return f"TickerResult({self.ticker!r}, setup_score={self.setup_score!r}, signal={self.signal!r})"
+
+    def __reduce__(self):
+        # Compact pickle (process pools): alleen de waarden, geen veldnamen per record
+        return _restore, (tuple(getattr(self, name) for name in RESULT_FIELDS),)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict in snapshot key order"""
+        return {name: getattr(self, name) for name in RESULT_FIELDS}
+
+
+_GETTERS = {name: attrgetter(name) for name in RESULT_FIELDS}
+
+
+def _restore(values: Tuple[Any, ...]) -> TickerResult:
+    result = TickerResult.__new__(TickerResult)
+    for name, value in zip(RESULT_FIELDS, values):
+        setattr(result, name, value)
+    return result
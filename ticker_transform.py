@@ -0,0 +1,219 @@
+"""
+Ticker Transform
+
+Per-ticker transform stap (indicatoren → score → signaal → resultaat):
+- Tickers worden in partities verdeeld; elke partitie berekent de
+  ontbrekende indicatoren in één panel en bouwt daarna de resultaten
+- Partities draaien in-process of op een process pool; workers krijgen
+  compacte NumPy arrays (Close/High/Low/Volume) in plaats van DataFrames
+  en het yf.Ticker object
+- Fouten blijven per ticker geïsoleerd en worden teruggemeld
+"""
+
+import os
+import logging
+import concurrent.futures
+from typing import Dict, List, Any, Optional, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from config import TECHNICAL_PARAMS, SCORING_WEIGHTS, COMPANY_NAMES, SECTORS, SETTINGS
+from ticker_result import TickerResult
+from transformers import (
+    calculate_technical_indicators, calculate_setup_score,
+    calculate_potential_upside, get_trade_setup_type, get_signal,
+    build_price_panel, calculate_panel_indicators
+)
+
+logger = logging.getLogger(__name__)
+
+BAR_COLUMNS = ['Close', 'High', 'Low', 'Volume']
+DEFAULT_SENTIMENT = {"score": 0.0, "summary": "Geen nieuws", "catalyst": "Geen"}
+
+
+class TransformItem(NamedTuple):
+    """Everything a worker needs for one ticker"""
+    ticker: str
+    bars: np.ndarray  # (bars, 4) float64 in BAR_COLUMNS order; only the last 2 bars when indicators are known
+    current_price: float
+    avg_price: float
+    sentiment: Dict[str, Any]
+    watchlist_count: Optional[int]
+    indicators: Optional[Dict[str, float]]
+
+
+class TransformOutcome(NamedTuple):
+    ticker: str
+    result: Optional[TickerResult]
+    indicators: Optional[Dict[str, float]]  # Newly computed (for the indicator cache)
+    error: Optional[str]
+
+
+def pack_ticker(
+    ticker: str,
+    data: Dict[str, Any],
+    sentiments: Dict[str, Dict],
+    trending_symbols: Dict[str, int],
+    indicators: Optional[Dict[str, float]] = None
+) -> TransformItem:
+    """Compact, picklable transform input for one ticker"""
+    hist = data['hist']
+    if indicators is not None:
+        hist = hist.tail(2)
+    return TransformItem(
+        ticker=ticker,
+        bars=hist[BAR_COLUMNS].to_numpy(dtype=np.float64),
+        current_price=float(data['current_price']),
+        avg_price=float(data['avg_price']),
+        sentiment=sentiments.get(ticker, DEFAULT_SENTIMENT),
+        watchlist_count=trending_symbols.get(ticker),
+        indicators=indicators,
+    )
+
+
+def transform_tickers(
+    items: List[TransformItem],
+    workers: Optional[int] = None,
+    parallel_min: Optional[int] = None
+) -> List[TransformOutcome]:
+    """
+    Transform all items, in-process or on a process pool.
+
+    Args:
+        items: Output of pack_ticker per ticker
+        workers: Processes (default: SETTINGS['transform_workers'] or CPU count)
+        parallel_min: Minimum number of tickers for the process pool
+
+    Returns:
+        One outcome per item, in input order
+    """
+    workers = workers or SETTINGS.get('transform_workers') or os.cpu_count() or 1
+    if parallel_min is None:
+        parallel_min = SETTINGS.get('transform_parallel_min', 500)
+
+    if workers <= 1 or len(items) < parallel_min:
+        return transform_partition(items)
+
+    # Aaneengesloten partities: elk één panel, en de volgorde blijft behouden
+    size = -(-len(items) // (workers * 2))
+    partitions = [items[i:i + size] for i in range(0, len(items), size)]
+    outcomes: List[TransformOutcome] = []
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(transform_partition, partition) for partition in partitions]
+        for partition, future in zip(partitions, futures):
+            try:
+                outcomes.extend(future.result())
+            except Exception as e:
+                logger.warning(f"  Transform partition failed ({e}), in-process fallback")
+                outcomes.extend(transform_partition(partition))
+    return outcomes
+
+
+def transform_partition(items: List[TransformItem]) -> List[TransformOutcome]:
+    """Indicators for the items without them (one panel), then every result"""
+    missing = {item.ticker: _to_frame(item.bars) for item in items if item.indicators is None}
+    computed: Dict[str, Dict[str, float]] = {}
+    if missing:
+        try:
+            computed = calculate_panel_indicators(build_price_panel(missing), TECHNICAL_PARAMS)
+        except Exception as e:
+            logger.warning(f"  Panel indicators failed, per ticker fallback: {e}")
+
+    outcomes = []
+    for item in items:
+        try:
+            indicators = item.indicators
+            fresh = None
+            if indicators is None:
+                fresh = computed.get(item.ticker)
+                if fresh is None:
+                    fresh = calculate_technical_indicators(missing[item.ticker], TECHNICAL_PARAMS)
+                indicators = fresh
+            result = transform_ticker(item, indicators)
+            # Nieuw berekende indicatoren (panel of per ticker) gaan terug naar de cache
+            outcomes.append(TransformOutcome(item.ticker, result, fresh, None))
+        except Exception as e:
+            outcomes.append(TransformOutcome(item.ticker, None, None, str(e)))
+    return outcomes
+
+
+def transform_ticker(item: TransformItem, indicators: Dict[str, float]) -> TickerResult:
+    """Score, signal and result record for one ticker"""
+    ticker = item.ticker
+    current_price = item.current_price
+    avg_price = item.avg_price
+
+    # Kopie: de bonus mag het gedeelde dict niet wijzigen
+    sentiment = dict(item.sentiment)
+
+    # Voeg StockTwits bonus toe
+    if item.watchlist_count is not None:
+        watchlist_count = item.watchlist_count
+        bonus = min(
+            watchlist_count / 1_000_000 * SCORING_WEIGHTS['stocktwits_max_bonus'],
+            SCORING_WEIGHTS['stocktwits_max_bonus']
+        )
+        sentiment['score'] += bonus
+        sentiment['stocktwits_watchlist'] = watchlist_count
+        sentiment['is_trending'] = True
+    else:
+        sentiment['stocktwits_watchlist'] = None
+        sentiment['is_trending'] = False
+
+    # Bereken setup score
+    setup_score, setup_reasons = calculate_setup_score(
+        indicators, current_price, avg_price, SCORING_WEIGHTS
+    )
+
+    # Totale score
+    total_score = setup_score + (sentiment['score'] * SCORING_WEIGHTS['sentiment_multiplier'])
+
+    # Bepaal setup type en signaal
+    setup_type = get_trade_setup_type(indicators, current_price)
+    potential_upside = calculate_potential_upside(indicators, current_price)
+    signal, signal_class = get_signal(total_score, potential_upside)
+
+    # Prijs verandering
+    closes = item.bars[:, 0]
+    prev_close = closes[-2] if len(closes) > 1 else current_price
+    price_change = ((current_price - prev_close) / prev_close) * 100
+
+    return TickerResult(
+        ticker=ticker,
+        name=COMPANY_NAMES.get(ticker, ticker),
+        sector=SECTORS.get(ticker, 'Overig'),
+        price=round(current_price, 2),
+        change=round(price_change, 2),
+        change_pct=round(price_change, 2),
+        rsi=round(indicators['rsi'], 1),
+        macd=round(indicators['macd'], 4),
+        macd_hist=round(indicators['macd_hist'], 4),
+        sma_20=round(indicators['sma_20'], 2),
+        sma_50=round(indicators['sma_50'], 2) if indicators['sma_50'] else None,
+        atr_pct=round(indicators['atr_pct'], 1),
+        vol_rank=round(indicators['vol_rank'], 0),
+        setup_score=round(total_score, 1),
+        setup_reasons=setup_reasons,
+        setup_type=setup_type,
+        potential_upside=round(potential_upside, 1),
+        sentiment_score=round(sentiment['score'], 2),
+        sentiment_summary=sentiment['summary'],
+        catalyst=sentiment['catalyst'],
+        is_trending=sentiment.get('is_trending', False),
+        stocktwits_watchlist=sentiment.get('stocktwits_watchlist'),
+        signal=signal,
+        signal_class=signal_class,
+        high_52w=round(indicators['high_52w'], 2),
+        low_52w=round(indicators['low_52w'], 2),
+        volume=int(indicators['volume']),
+    )
+
+
+# =============================================================================
+# HELPER FUNCTIONS
+# =============================================================================
+
+def _to_frame(bars: np.ndarray) -> pd.DataFrame:
+    """Rebuild the OHLCV frame the indicator functions expect"""
+    return pd.DataFrame(bars, columns=BAR_COLUMNS)
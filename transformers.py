@@ -47,13 +47,6 @@ def calculate_technical_indicators(
     atr = _calculate_atr(hist, params['atr_period'])
     atr_pct = (atr / prices.iloc[-1]) * 100
     
-    # Volatility rank
-    vol_rank = _get_volatility_rank(hist, params['volatility_period'])
-    
-    # 52-week high/low
-    high_52w = hist['High'].max()
-    low_52w = hist['Low'].min()
-    
     # Volume
     volume = hist['Volume'].iloc[-1]
     
@@ -66,13 +59,32 @@ def calculate_technical_indicators(
         'sma_50': sma_50,
         'atr': atr,
         'atr_pct': atr_pct,
-        'vol_rank': vol_rank,
-        'high_52w': high_52w,
-        'low_52w': low_52w,
+        **calculate_range_indicators(hist, params),
         'volume': volume,
     }
 
 
+def calculate_range_indicators(
+    hist: pd.DataFrame,
+    params: Dict[str, int]
+) -> Dict[str, float]:
+    """
+    Indicators over the whole window (no incremental form).
+    
+    Args:
+        hist: Price history DataFrame
+        params: Technical analysis parameters
+    
+    Returns:
+        Dict with vol_rank, high_52w and low_52w
+    """
+    return {
+        'vol_rank': _get_volatility_rank(hist, params['volatility_period']),
+        'high_52w': hist['High'].max(),
+        'low_52w': hist['Low'].min(),
+    }
+
+
 def calculate_setup_score(
     indicators: Dict[str, float],
     current_price: float,
@@ -215,6 +227,322 @@ def get_signal(score: float, upside: float) -> Tuple[str, str]:
         return "Verkoop", "sell-strong"
 
 
+# =============================================================================
+# PANEL (VECTORIZED) INDICATORS
+# =============================================================================
+
+PANEL_FIELDS = ['Close', 'High', 'Low', 'Volume']
+
+
+def build_price_panel(histories: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    """
+    Build a wide bars × tickers panel per OHLCV field.
+    
+    Every ticker is right-aligned on its own bars (last bar in the last row)
+    instead of on calendar dates, so exchanges with different trading days
+    do not introduce gaps. Shorter histories are padded with leading NaN,
+    which the rolling and EWM operations treat as absent bars.
+    
+    Args:
+        histories: Dict of {ticker: OHLCV DataFrame}
+    
+    Returns:
+        Dict of {field: DataFrame} with one column per ticker
+    """
+    tickers = list(histories.keys())
+    max_len = max((len(h) for h in histories.values()), default=0)
+    
+    panel = {}
+    for field in PANEL_FIELDS:
+        values = np.full((max_len, len(tickers)), np.nan)
+        for j, ticker in enumerate(tickers):
+            column = histories[ticker][field].to_numpy(dtype=float)
+            values[max_len - len(column):, j] = column
+        panel[field] = pd.DataFrame(values, columns=tickers)
+    
+    return panel
+
+
+def calculate_panel_indicators(
+    panel: Dict[str, pd.DataFrame],
+    params: Dict[str, int]
+) -> Dict[str, Dict[str, float]]:
+    """
+    Calculate all technical indicators for every ticker in a panel at once.
+    
+    Produces the same values as calculate_technical_indicators, computed
+    with column-wise pandas operations over the whole universe.
+    
+    Args:
+        panel: Output of build_price_panel
+        params: Technical analysis parameters
+    
+    Returns:
+        Dict of {ticker: indicators dict}
+    """
+    close = panel['Close']
+    high = panel['High']
+    low = panel['Low']
+    volume = panel['Volume']
+    
+    if close.empty:
+        return {}
+    
+    bars = close.notna().sum()
+    last_close = close.iloc[-1]
+    
+    # RSI
+    delta = close.diff()
+    window = params['rsi_window']
+    gain = delta.where(delta > 0, 0).rolling(window=window).mean().iloc[-1]
+    loss = -delta.where(delta < 0, 0).rolling(window=window).mean().iloc[-1]
+    rsi = 100 - (100 / (1 + gain / loss))
+    # Padding telt als 0 in where(); korte histories zijn per ticker NaN
+    rsi = rsi.where(bars >= window)
+    
+    # MACD
+    ema_fast = close.ewm(span=params['macd_fast'], adjust=False).mean()
+    ema_slow = close.ewm(span=params['macd_slow'], adjust=False).mean()
+    macd_line = ema_fast - ema_slow
+    signal_line = macd_line.ewm(span=params['macd_signal'], adjust=False).mean()
+    macd_val = macd_line.iloc[-1]
+    macd_signal = signal_line.iloc[-1]
+    macd_hist = macd_val - signal_line.iloc[-1]
+    
+    # SMAs
+    sma_20 = close.rolling(params['sma_short']).mean().iloc[-1]
+    sma_50 = close.rolling(params['sma_medium']).mean().iloc[-1]
+    
+    # ATR
+    prev_close = close.shift(1)
+    tr = np.fmax(
+        np.fmax((high - low).to_numpy(), (high - prev_close).abs().to_numpy()),
+        (low - prev_close).abs().to_numpy()
+    )
+    atr = pd.DataFrame(tr, columns=close.columns).rolling(params['atr_period']).mean().iloc[-1]
+    atr_pct = (atr / last_close) * 100
+    
+    # Volatility rank
+    period = params['volatility_period']
+    rolling_vol = close.pct_change().rolling(20).std()
+    current_vol = rolling_vol.iloc[-1]
+    vol_rank = (rolling_vol < current_vol).sum() / (period - 20) * 100
+    
+    # 52-week high/low
+    high_52w = high.max()
+    low_52w = low.min()
+    
+    last_volume = volume.iloc[-1]
+    
+    columns = {
+        'rsi': rsi, 'macd': macd_val, 'macd_signal': macd_signal,
+        'macd_hist': macd_hist, 'sma_20': sma_20, 'sma_50': sma_50,
+        'atr': atr, 'atr_pct': atr_pct, 'vol_rank': vol_rank,
+        'high_52w': high_52w, 'low_52w': low_52w, 'volume': last_volume,
+    }
+    values = {name: series.to_numpy() for name, series in columns.items()}
+    has_sma_50 = (bars >= params['sma_medium']).to_numpy()
+    has_vol_rank = (bars >= period).to_numpy()
+    
+    results = {}
+    for j, ticker in enumerate(close.columns):
+        indicators = {name: column[j] for name, column in values.items()}
+        if not has_sma_50[j]:
+            indicators['sma_50'] = None
+        if not has_vol_rank[j]:
+            indicators['vol_rank'] = 50
+        results[ticker] = indicators
+    
+    return results
+
+
+# =============================================================================
+# PANEL HISTORY (BACKTESTING)
+# =============================================================================
+
+SIGNAL_CLASSES = ('buy-strong', 'buy', 'neutral', 'sell', 'sell-strong')
+
+
+def calculate_indicator_history(
+    panel: Dict[str, pd.DataFrame],
+    params: Dict[str, int],
+    lookback: int = 252,
+    cache: Optional[Dict[tuple, Any]] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Calculate the scoring indicators as of every bar of a panel.
+    
+    Row t holds what calculate_technical_indicators returns for the bars
+    up to and including t, with the 52-week range and the average price
+    taken over the last ``lookback`` bars (the live 1y history window).
+    MACD runs over the full history instead of restarting at the window
+    start; after a few dozen bars the difference is negligible.
+    
+    Args:
+        panel: Dict of {field: DataFrame} (bars × tickers), NaN before listing
+        params: Technical analysis parameters
+        lookback: Bars in the live history window
+        cache: Optional dict reused across calls on the same panel; each
+            indicator family is stored under the parameters it depends on,
+            so changing e.g. only rsi_window recomputes only the RSI
+    
+    Returns:
+        Dict of {indicator: ndarray (bars × tickers)}, NaN during warm-up
+    """
+    close = panel['Close']
+    high = panel['High']
+    low = panel['Low']
+    
+    def cached(key: tuple, compute):
+        if cache is None:
+            return compute()
+        if key not in cache:
+            cache[key] = compute()
+        return cache[key]
+    
+    def rsi():
+        # Zelfde where() als _calculate_rsi: ontbrekende delta telt als 0
+        bars = close.notna().cumsum().to_numpy()
+        delta = close.diff()
+        window = params['rsi_window']
+        gain = delta.where(delta > 0, 0).rolling(window=window).mean()
+        loss = -delta.where(delta < 0, 0).rolling(window=window).mean()
+        return np.where(bars >= window, (100 - (100 / (1 + gain / loss))).to_numpy(), np.nan)
+    
+    def macd():
+        ema_fast = close.ewm(span=params['macd_fast'], adjust=False).mean()
+        ema_slow = close.ewm(span=params['macd_slow'], adjust=False).mean()
+        macd_line = ema_fast - ema_slow
+        signal_line = macd_line.ewm(span=params['macd_signal'], adjust=False).mean()
+        return macd_line.to_numpy(), signal_line.to_numpy(), (macd_line - signal_line).to_numpy()
+    
+    def sma(window: int):
+        return lambda: close.rolling(window).mean().to_numpy()
+    
+    def atr():
+        prev_close = close.shift(1)
+        tr = np.fmax(
+            np.fmax((high - low).to_numpy(), (high - prev_close).abs().to_numpy()),
+            (low - prev_close).abs().to_numpy()
+        )
+        return pd.DataFrame(tr, columns=close.columns).rolling(params['atr_period']).mean().to_numpy()
+    
+    def price_range():
+        return (
+            high.rolling(lookback, min_periods=1).max().to_numpy(),
+            low.rolling(lookback, min_periods=1).min().to_numpy(),
+            close.rolling(lookback, min_periods=1).mean().to_numpy(),
+        )
+    
+    macd_line, signal_line, macd_hist = cached(
+        ('macd', params['macd_fast'], params['macd_slow'], params['macd_signal']), macd
+    )
+    atr_values = cached(('atr', params['atr_period']), atr)
+    high_52w, low_52w, avg_price = cached(('range', lookback), price_range)
+    
+    return {
+        'rsi': cached(('rsi', params['rsi_window']), rsi),
+        'macd': macd_line,
+        'macd_signal': signal_line,
+        'macd_hist': macd_hist,
+        'sma_20': cached(('sma', params['sma_short']), sma(params['sma_short'])),
+        'sma_50': cached(('sma', params['sma_medium']), sma(params['sma_medium'])),
+        'atr': atr_values,
+        'atr_pct': cached(('atr_pct', params['atr_period']), lambda: atr_values / close.to_numpy() * 100),
+        'high_52w': high_52w,
+        'low_52w': low_52w,
+        'avg_price': avg_price,
+    }
+
+
+def calculate_panel_setup_score(
+    indicators: Dict[str, np.ndarray],
+    price: np.ndarray,
+    weights: Dict[str, float]
+) -> np.ndarray:
+    """Vectorized calculate_setup_score (score only) over bars × tickers"""
+    rsi = indicators['rsi']
+    macd_hist = indicators['macd_hist']
+    macd_val = indicators['macd']
+    macd_signal = indicators['macd_signal']
+    sma_20 = indicators['sma_20']
+    sma_50 = indicators['sma_50']
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # RSI scoring
+        score = np.select(
+            [(rsi >= 30) & (rsi <= 40), (rsi >= 60) & (rsi <= 70), rsi < 30, rsi > 75],
+            [weights['rsi_oversold'], weights['rsi_bullish'], weights['rsi_oversold'] * 0.5, -weights['rsi_oversold']],
+            0.0
+        )
+        
+        # MACD scoring
+        score += np.select(
+            [(macd_hist > 0) & (macd_val > macd_signal), (macd_hist < 0) & (macd_val < macd_signal)],
+            [weights['macd_bullish'], -weights['macd_bullish']],
+            0.0
+        )
+        
+        # MA alignment
+        has_ma = _has_value(sma_20) & _has_value(sma_50)
+        score += np.select(
+            [
+                has_ma & (price > sma_20) & (sma_20 > sma_50),
+                has_ma & (price < sma_20) & (sma_20 < sma_50),
+                has_ma & (np.abs(price - sma_20) / indicators['avg_price'] < 0.02),
+            ],
+            [weights['ma_alignment'], -weights['ma_alignment'], weights['ma_alignment'] * 0.5],
+            0.0
+        )
+        
+        # Volatility
+        score += np.where(indicators['atr_pct'] > 3, weights['high_volatility'], 0.0)
+    
+    return score
+
+
+def calculate_panel_upside(indicators: Dict[str, np.ndarray], price: np.ndarray) -> np.ndarray:
+    """Vectorized calculate_potential_upside over bars × tickers"""
+    sma_20 = indicators['sma_20']
+    sma_50 = indicators['sma_50']
+    high_52w = indicators['high_52w']
+    atr = indicators['atr']
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        resistance_to_high = np.where(_has_value(high_52w), (high_52w - price) / price * 100, 10.0)
+        expected_move = np.where(_has_value(atr), atr / price * 100, 2.0)
+        
+        return np.select(
+            [
+                ~(_has_value(sma_20) & _has_value(sma_50)),
+                (price > sma_20) & (sma_20 > sma_50),
+                (price < sma_20) & (price > sma_50),
+                price < sma_50,
+            ],
+            [
+                2.0,
+                np.minimum(expected_move * 1.5, resistance_to_high),
+                np.minimum(np.abs((sma_20 - price) / price * 100), expected_move),
+                np.minimum(np.abs((sma_50 - price) / price * 100), expected_move * 1.2),
+            ],
+            expected_move
+        )
+
+
+def get_panel_signal(score: np.ndarray, upside: np.ndarray) -> np.ndarray:
+    """
+    Vectorized get_signal.
+    
+    Returns:
+        int8 array of indexes into SIGNAL_CLASSES
+    """
+    return np.select(
+        [(score >= 4) & (upside >= 5), (score >= 2) & (upside >= 4), score >= 0, score >= -2],
+        [0, 1, 2, 3],
+        4
+    ).astype(np.int8)
+
+
 # =============================================================================
 # HELPER FUNCTIONS
 # =============================================================================
@@ -268,3 +596,8 @@ def _get_volatility_rank(hist: pd.DataFrame, period: int = 252) -> float:
     vol_rank = (daily_returns.rolling(20).std() < current_vol).sum() / (period - 20) * 100
     
     return vol_rank
+
+
+def _has_value(values: np.ndarray) -> np.ndarray:
+    """Vectorized truthiness of an optional indicator (None/NaN/0 -> False)"""
+    return np.nan_to_num(values, nan=0.0) != 0